@@ -0,0 +1,59 @@
+# Compares one MetricsCalculator per strategy-run with BatchMetricsCalculator on the joined frames of a synthetic
+# dataset, and checks that both give the same metrics
+# Run from the repository root:
+#   python -m benchmarks.bench_batch_metrics [--strategies N] [--runs N] [--years N] [--repeat N]
+import argparse
+import tempfile
+import time
+
+import pandas as pd
+from benchmarks.synthetic_data import PHASES, write_synthetic_dataset
+from propfirm_trading_dashboard.batch_metrics import GROUP_COLUMNS, batch_metrics
+from propfirm_trading_dashboard.metrics import MetricsCalculator
+from propfirm_trading_dashboard.multi_strategy_loader import load_joined_phases
+from propfirm_trading_dashboard.phase_frames import normalize_phase_frames
+
+def per_group_metrics(dfs: dict) -> pd.DataFrame:
+    # what comparing strategies takes without the batch api: a calculator per group
+    rows = {}
+    grouped = {phase: dict(list(df.groupby(GROUP_COLUMNS, sort=True))) for phase, df in dfs.items()}
+    for key in sorted(set().union(*grouped.values())):
+        group_dfs = {phase: groups.get(key, dfs[phase].iloc[:0]) for phase, groups in grouped.items()}
+        metrics = MetricsCalculator(group_dfs, cache=None).calculate_metrics()
+        rows[key] = {name: value for phase_metrics in metrics.values() for name, value in phase_metrics.items()}
+    return pd.DataFrame.from_dict(rows, orient="index")
+
+def best_time(fn, repeat: int) -> tuple:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Time batch metrics against one calculator per strategy-run")
+    arg_parser.add_argument("--strategies", type=int, default=20)
+    arg_parser.add_argument("--runs", type=int, default=10)
+    arg_parser.add_argument("--years", type=int, default=5)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        write_synthetic_dataset(tmp, args.strategies, args.runs, args.years, args.seed)
+        dfs = normalize_phase_frames(load_joined_phases(tmp, PHASES))
+
+    rows = sum(len(df) for df in dfs.values())
+    print(f"{args.strategies} strategies x {args.runs} runs x {args.years} years, {rows} rows")
+
+    loop_time, expected = best_time(lambda: per_group_metrics(dfs), args.repeat)
+    batch_time, result = best_time(lambda: batch_metrics(dfs), args.repeat)
+
+    expected.index = result.index
+    same = expected[result.columns].astype(float).equals(result.astype(float))
+    print(f"{'per group':<10} {loop_time:8.3f}s")
+    print(f"{'batch':<10} {batch_time:8.3f}s  {loop_time / batch_time:5.1f}x, {'same' if same else 'DIFFERENT'} metrics for {len(result)} groups")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# Compares the inferred loader with the typed (explicit schema) loader on the sample data scaled up.
+# Run from the repository root: python -m benchmarks.bench_csv_loading [scale]
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+from propfirm_trading_dashboard.csv_parser import load_csv_file
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "data"
+PHASES = ["phase1", "phase2", "phase3", "challenge", "funded"]
+
+def write_scaled_file(source: Path, target: Path, scale: int):
+    header, *rows = source.read_text(encoding="utf-16").splitlines()
+    target.write_text("\n".join([header] + rows * scale) + "\n", encoding="utf-16")
+
+def build_scaled_dataset(target_dir: Path, scale: int) -> list:
+    files = []
+    for folder in sorted(p for p in DATA_DIR.iterdir() if p.is_dir()):
+        (target_dir / folder.name).mkdir()
+        for phase in PHASES:
+            source = folder / f"{phase}.csv"
+            if source.exists():
+                target = target_dir / folder.name / f"{phase}.csv"
+                write_scaled_file(source, target, scale)
+                files.append(target)
+    return files
+
+def time_loader(files: list, **kwargs) -> tuple:
+    start = time.perf_counter()
+    rows = 0
+    for path in files:
+        df = load_csv_file(path, **kwargs)
+        if not kwargs.get("typed"):
+            # what metrics.py does later on the inferred frame
+            df["Duration"] = df["Duration"].astype(float)
+            df["Phase"] = pd.to_numeric(df["Phase"], errors="coerce").fillna(0).astype(int)
+            df["Start Balance"] = pd.to_numeric(df["Start Balance"], errors="coerce").fillna(0)
+            df["Ending Balance"] = pd.to_numeric(df["Ending Balance"], errors="coerce").fillna(0)
+            df["End Phase Date"] = pd.to_datetime(df["End Phase Date"], format="%Y.%m.%d")
+        rows += len(df)
+    return time.perf_counter() - start, rows
+
+def main(scale: int = 100):
+    modes = {
+        "inferred (current)": {},
+        "typed, c engine": {"typed": True, "engine": "c"},
+        "typed, pyarrow engine": {"typed": True, "engine": "pyarrow"},
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = build_scaled_dataset(Path(tmp), scale)
+        print(f"{len(files)} files scaled {scale}x")
+
+        baseline = None
+        for name, kwargs in modes.items():
+            try:
+                elapsed, rows = time_loader(files, **kwargs)
+            except ImportError as e:
+                print(f"{name:<24} skipped ({e})")
+                continue
+
+            baseline = baseline or elapsed
+            print(f"{name:<24} {elapsed:8.3f}s  {rows:>9} rows  {baseline / elapsed:5.2f}x")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
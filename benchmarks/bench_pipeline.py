@@ -0,0 +1,139 @@
+# Times every stage of a joined simulation on a synthetic dataset of strategies x runs x years and saves
+# the timings as JSON, so a later run (or another branch) can be compared against them.
+# Run from the repository root:
+#   python -m benchmarks.bench_pipeline [--strategies N] [--runs N] [--years N] [--save PATH] [--compare PATH]
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from benchmarks.synthetic_data import PHASES, write_synthetic_dataset
+from propfirm_trading_dashboard.csv_parser import load_csv_file, validate_frame
+from propfirm_trading_dashboard.metrics import MetricsCalculator
+from propfirm_trading_dashboard.multi_strategy_loader import merge_frames, scan_strategy_folders
+from propfirm_trading_dashboard.phase_frames import normalize_phase_frames
+from propfirm_trading_dashboard.report import render_report
+from propfirm_trading_dashboard.simulation_run import build_monthly_pnl, build_runs_table
+
+RESULTS_DIR = Path(".cache/benchmarks")
+
+def run_pipeline(data_dir: Path, output_dir: Path, typed: bool = False) -> dict:
+    # one pass over the stages, in the order run_joined_simulation goes through them
+    timings = {}
+
+    def timed(stage, fn, *args, **kwargs):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        timings[stage] = time.perf_counter() - start
+        return result
+
+    manifest = scan_strategy_folders(data_dir)
+    files = [(folder, phase, files[phase]) for folder, files in sorted(manifest.items()) for phase in PHASES if phase in files]
+
+    loaded = timed("load", lambda: [load_csv_file(path, typed=typed) for _, _, path in files])
+    if not typed:
+        # typed loads are validated while they are parsed
+        timed("validate", lambda: [validate_frame(df, path) for (_, _, path), df in zip(files, loaded)])
+
+    def merge():
+        frames = {phase: [] for phase in PHASES}
+        for (folder, phase, _), df in zip(files, loaded):
+            # the columns load_phase_file tags every file with
+            frames[phase].append(df.assign(Strategy_Pair="_".join(folder.split("_")[:2]), Run=folder.rsplit("_", 1)[-1]))
+        return {phase: merge_frames(dfs) for phase, dfs in frames.items()}
+
+    df_dict = timed("merge", merge)
+    df_dict = timed("normalize", normalize_phase_frames, df_dict)
+
+    calculator = MetricsCalculator(df_dict, cache=None)
+    metrics = {}
+    for phase in PHASES:
+        metrics.update(timed(f"metrics.{phase}", calculator.calculate_metrics, [phase]))
+
+    runs_table = timed("build_runs_table", build_runs_table, df_dict)
+    monthly_pnl = timed("build_monthly_pnl", build_monthly_pnl, runs_table["funded"])
+    with contextlib.redirect_stdout(io.StringIO()):
+        timed("render_report", render_report, metrics, "report_html.html", "benchmark", runs_table=runs_table, monthly_pnl_table=monthly_pnl, output_dir=output_dir)
+
+    timings["total"] = sum(timings.values())
+    return timings
+
+def benchmark(strategies: int, runs: int, years: int, repeat: int = 3, typed: bool = False, seed: int = 0) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp) / "data"
+        folders = write_synthetic_dataset(data_dir, strategies, runs, years, seed)
+        rows = {phase: sum(len(load_csv_file(data_dir / folder / f"{phase}.csv")) for folder in folders) for phase in PHASES}
+
+        samples = [run_pipeline(data_dir, Path(tmp), typed) for _ in range(repeat)]
+
+    return {
+        "config": {"strategies": strategies, "runs": runs, "years": years, "repeat": repeat, "typed": typed, "seed": seed, "rows": rows},
+        "environment": {
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "revision": git_revision(),
+        },
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "timings": {
+            stage: {
+                "min": min(sample[stage] for sample in samples),
+                "median": statistics.median(sample[stage] for sample in samples),
+                "samples": [sample[stage] for sample in samples],
+            }
+            for stage in samples[0]
+        },
+    }
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def print_results(results: dict, baseline: dict = None):
+    config = results["config"]
+    print(f"{config['strategies']} strategies x {config['runs']} runs x {config['years']} years, {sum(config['rows'].values())} rows, best of {config['repeat']}")
+
+    header = f"{'Stage':<20} {'min s':>9} {'median s':>9}"
+    print(header + (f" {'baseline s':>11} {'ratio':>7}" if baseline else ""))
+    for stage, timing in results["timings"].items():
+        line = f"{stage:<20} {timing['min']:9.4f} {timing['median']:9.4f}"
+        if baseline and stage in baseline["timings"]:
+            before = baseline["timings"][stage]["min"]
+            # ratio > 1 is a slowdown against the baseline
+            line += f" {before:11.4f} {timing['min'] / before if before else float('nan'):6.2f}x"
+        print(line)
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Time every stage of a joined simulation on synthetic data")
+    arg_parser.add_argument("--strategies", type=int, default=5)
+    arg_parser.add_argument("--runs", type=int, default=2)
+    arg_parser.add_argument("--years", type=int, default=10)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument("--typed", action="store_true", help="load with the explicit csv schema")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--save", help=f"results file (default {RESULTS_DIR}/pipeline_<strategies>x<runs>x<years>.json)")
+    arg_parser.add_argument("--compare", help="earlier results file to print ratios against")
+    args = arg_parser.parse_args(argv)
+
+    baseline = json.loads(Path(args.compare).read_text()) if args.compare else None
+    results = benchmark(args.strategies, args.runs, args.years, args.repeat, args.typed, args.seed)
+    print_results(results, baseline)
+
+    save_path = Path(args.save or RESULTS_DIR / f"pipeline_{args.strategies}x{args.runs}x{args.years}.json")
+    save_path.parent.mkdir(parents=True, exist_ok=True)
+    save_path.write_text(json.dumps(results, indent=2))
+    print(f"Results saved to {save_path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# Measures what validate_values adds to loading large exports: load time vs validation time, summed over the files
+# Run from the repository root:
+#   python -m benchmarks.bench_validation [--strategies N] [--runs N] [--years N] [--repeat N]
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.synthetic_data import PHASES, write_synthetic_dataset
+from propfirm_trading_dashboard.csv_parser import load_csv_file, load_typed_csv_file, validate_values
+
+def time_files(files: list, typed: bool, repeat: int) -> tuple:
+    # best of repeat for both, so a slow first read (page cache) does not inflate the ratio
+    load_times, validate_times = [], []
+    rows = 0
+    for _ in range(repeat):
+        load_time = validate_time = 0.0
+        rows = 0
+        for path in files:
+            start = time.perf_counter()
+            # the typed loader validates by itself unless told not to
+            df = load_typed_csv_file(path, validate=False) if typed else load_csv_file(path)
+            load_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            validate_values(df, path)
+            validate_time += time.perf_counter() - start
+            rows += len(df)
+        load_times.append(load_time)
+        validate_times.append(validate_time)
+    return min(load_times), min(validate_times), rows
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Time value validation against csv loading")
+    arg_parser.add_argument("--strategies", type=int, default=4)
+    arg_parser.add_argument("--runs", type=int, default=1)
+    arg_parser.add_argument("--years", type=int, default=500)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        folders = write_synthetic_dataset(tmp, args.strategies, args.runs, args.years, args.seed)
+        files = [Path(tmp) / folder / f"{phase}.csv" for folder in folders for phase in PHASES]
+        print(f"{len(files)} files, {args.strategies} strategies x {args.runs} runs x {args.years} years")
+
+        print(f"{'Loader':<10} {'rows':>9} {'load s':>9} {'validate s':>11} {'share':>7}")
+        for typed in (False, True):
+            load_time, validate_time, rows = time_files(files, typed, args.repeat)
+            print(f"{'typed' if typed else 'inferred':<10} {rows:>9} {load_time:9.3f} {validate_time:11.3f} {validate_time / load_time:6.1%}")
+
+if __name__ == "__main__":
+    main()
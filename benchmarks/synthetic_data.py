@@ -0,0 +1,126 @@
+# Writes synthetic MT5 strategy folders (UTF-16, tab separated, validate_frame schema) at configurable sizes.
+# Run from the repository root: python -m benchmarks.synthetic_data OUTPUT_DIR [--strategies N] [--runs N] [--years N]
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from propfirm_trading_dashboard.csv_parser import DATE_FORMAT, REQUIRED_COLUMNS
+
+PHASES = ["phase1", "phase2", "phase3", "challenge", "funded"]
+PAIRS = ["EURUSD", "GBPUSD", "USDJPY", "AUDUSD", "USDCAD", "XAUUSD"]
+START_DATE = pd.Timestamp("2013-01-01")
+START_BALANCE = 10000.0
+
+# pass rates and balance moves per phase, roughly those of the sample exports
+PASS_RATES = {1: 0.5, 2: 0.6, 3: 0.85}
+PROFIT_TARGETS = {1: 0.08, 2: 0.05, 3: 0.04}
+MAX_DRAWDOWN = 0.10
+MEAN_DURATION = 15
+
+def attempt_rows(rng, n: int, phase: int) -> pd.DataFrame:
+    # phase1/phase2/phase3 exports: every row is an independent attempt at one phase
+    passed = rng.random(n) < PASS_RATES[phase]
+    return pd.DataFrame({
+        "Challenge Number": np.arange(1, n + 1),
+        "Phase": np.full(n, phase),
+        "Outcome": np.where(passed, "Payout" if phase == 3 else "Passed", "Failed"),
+    })
+
+def challenge_rows(rng, n: int, funded: bool) -> pd.DataFrame:
+    # challenge exports run phase 1 then phase 2; funded exports go on with phase 3 payouts until one fails
+    p1_passed = rng.random(n) < PASS_RATES[1]
+    p2_passed = p1_passed & (rng.random(n) < PASS_RATES[2])
+    rows = 1 + p1_passed.astype(int)
+    if funded:
+        rows += np.where(p2_passed, rng.geometric(1 - PASS_RATES[3], n), 0)
+
+    starts = np.cumsum(rows) - rows
+    position = np.arange(rows.sum()) - np.repeat(starts, rows)
+    last = position == np.repeat(rows, rows) - 1
+
+    outcome = np.where(position >= 2, "Payout", "Passed").astype(object)
+    outcome[(position == 0) & ~np.repeat(p1_passed, rows)] = "Failed"
+    outcome[(position == 1) & ~np.repeat(p2_passed, rows)] = "Failed"
+    outcome[(position >= 2) & last] = "Failed"
+
+    return pd.DataFrame({
+        "Challenge Number": np.repeat(np.arange(1, n + 1), rows),
+        "Phase": np.minimum(position + 1, 3),
+        "Outcome": outcome,
+    })
+
+def add_timeline(rng, rows: pd.DataFrame, years: int) -> pd.DataFrame:
+    # back-to-back phases: each one starts where the previous ended, balances carry over
+    n = len(rows)
+    phase = rows["Phase"].to_numpy()
+    outcome = rows["Outcome"].to_numpy()
+
+    duration = rng.integers(1, 2 * MEAN_DURATION, n)
+    end_offset = np.cumsum(duration)
+    start_offset = end_offset - duration
+
+    # moves are relative to the balance, so long periods of losing strategies stay positive
+    target = np.vectorize(PROFIT_TARGETS.get)(phase)
+    growth = 1 + np.where(outcome == "Failed", -MAX_DRAWDOWN - rng.uniform(0, 0.002, n), target + rng.uniform(0, 0.001, n))
+    ending_balance = (START_BALANCE * np.cumprod(growth)).round(2)
+    start_balance = np.concatenate(([START_BALANCE], ending_balance[:-1]))
+
+    frame = pd.DataFrame({
+        "Challenge Number": rows["Challenge Number"],
+        "Start Phase Date": (START_DATE + pd.to_timedelta(start_offset, unit="D")).strftime(DATE_FORMAT),
+        "End Phase Date": (START_DATE + pd.to_timedelta(end_offset, unit="D")).strftime(DATE_FORMAT),
+        "Phase": phase,
+        "Outcome": outcome,
+        "Reason": np.select([outcome == "Passed", outcome == "Payout"], ["Profit Target", "Payout"], "Max Drawdown"),
+        "Duration": duration,
+        "Start Balance": start_balance,
+        "Ending Balance": ending_balance,
+        "Max Drawdown": (start_balance * (1 - MAX_DRAWDOWN)).round(2),
+        "Profit Target": (start_balance * (1 + target)).round(2),
+        "Daily Drawdown": rng.uniform(0, 250, n).round(2),
+    })
+    return frame[start_offset < years * 365][REQUIRED_COLUMNS]
+
+def synthetic_phase_frame(rng, phase: str, years: int) -> pd.DataFrame:
+    # enough attempts to cover the years even on short durations, trimmed to the period afterwards
+    n = years * 365 // (MEAN_DURATION // 2) + 1
+    if phase in ("challenge", "funded"):
+        rows = challenge_rows(rng, n, funded=phase == "funded")
+    else:
+        rows = attempt_rows(rng, n, int(phase[-1]))
+    return add_timeline(rng, rows, years)
+
+def write_mt5_csv(df: pd.DataFrame, path: Path):
+    df.to_csv(path, sep="\t", index=False, encoding="utf-16", lineterminator="\r\n", float_format="%.2f")
+
+def write_synthetic_dataset(target_dir, strategies: int = 3, runs: int = 1, years: int = 10, seed: int = 0) -> list:
+    # strategies x runs folders named <Strategy>_<PAIR>_<run>, the layout multi_strategy_loader expects
+    target_dir = Path(target_dir)
+    rng = np.random.default_rng(seed)
+    folders = []
+
+    for strategy in range(strategies):
+        for run in range(1, runs + 1):
+            folder = f"Synthetic{strategy}_{PAIRS[strategy % len(PAIRS)]}_{run}"
+            (target_dir / folder).mkdir(parents=True, exist_ok=True)
+            for phase in PHASES:
+                write_mt5_csv(synthetic_phase_frame(rng, phase, years), target_dir / folder / f"{phase}.csv")
+            folders.append(folder)
+
+    return folders
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Write synthetic MT5 strategy folders")
+    arg_parser.add_argument("output_dir")
+    arg_parser.add_argument("--strategies", type=int, default=3)
+    arg_parser.add_argument("--runs", type=int, default=1)
+    arg_parser.add_argument("--years", type=int, default=10)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args(argv)
+
+    folders = write_synthetic_dataset(args.output_dir, args.strategies, args.runs, args.years, args.seed)
+    print(f"{len(folders)} strategy folders written to {args.output_dir}")
+
+if __name__ == "__main__":
+    main()
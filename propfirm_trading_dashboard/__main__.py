@@ -0,0 +1,4 @@
+import sys
+from propfirm_trading_dashboard.cli import main
+
+sys.exit(main())
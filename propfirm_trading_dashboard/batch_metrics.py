@@ -0,0 +1,329 @@
+import numpy as np
+import pandas as pd
+from propfirm_trading_dashboard.metrics import PHASES, MetricsCalculator, _with_strategy_pair, run_length_encode
+from propfirm_trading_dashboard.phase_frames import FAILED_CHALLENGE_COST
+
+# one row per strategy-run, the columns merge_group_phase adds to every folder's rows
+GROUP_COLUMNS = ["Strategy_Pair", "Run"]
+
+def group_order(codes: np.ndarray, n_groups: int) -> tuple:
+    # rows stably sorted by group (rows of no group, code -1, left out) and every group's row range in that order
+    order = np.argsort(codes, kind="stable")
+    order = order[codes[order] >= 0]
+    return order, np.searchsorted(codes[order], np.arange(n_groups + 1))
+
+def group_counts(mask, codes: np.ndarray, n_groups: int) -> np.ndarray:
+    return np.bincount(codes[np.asarray(mask) & (codes >= 0)], minlength=n_groups)
+
+def group_sums(values, codes: np.ndarray, n_groups: int) -> np.ndarray:
+    # np.sum of every group's values in row order: numpy's pairwise summation, which Series.sum and .mean use
+    # as well, so float sums equal the per-group calculator's to the last bit (bincount and reduceat add up
+    # one value after the other and do not)
+    order, bounds = group_order(codes, n_groups)
+    values = np.asarray(values, dtype=float)[order]
+    return np.array([values[start:end].sum() for start, end in zip(bounds[:-1], bounds[1:])])
+
+def group_python_sums(values, codes: np.ndarray, n_groups: int) -> np.ndarray:
+    # builtin sum of every group's values in the given order, one value after the other
+    order, bounds = group_order(codes, n_groups)
+    values = np.asarray(values, dtype=float)[order].tolist()
+    return np.array([float(sum(values[start:end])) for start, end in zip(bounds[:-1], bounds[1:])])
+
+def group_streaks(values, codes: np.ndarray, n_groups: int, outcomes) -> dict:
+    # streak_stats per group: max, mean and count of the runs of every outcome in each group's row order
+    order, _ = group_order(codes, n_groups)
+    run_values, run_lengths, run_groups = run_length_encode(np.asarray(values)[order], codes[order])
+
+    streaks = {}
+    for outcome in outcomes:
+        selected = run_values == outcome
+        count = np.bincount(run_groups[selected], minlength=n_groups)
+        total = np.bincount(run_groups[selected], weights=run_lengths[selected], minlength=n_groups)
+        longest = np.zeros(n_groups, dtype=np.int64)
+        np.maximum.at(longest, run_groups[selected], run_lengths[selected])
+        streaks[outcome] = {"max": longest, "mean": _mean(total, count, 0.0), "count": count}
+    return streaks
+
+def sorted_positions(dates: np.ndarray) -> np.ndarray:
+    # the order sort_values gives a date column: quicksort of the dates that are set, missing ones last
+    missing = np.isnat(dates)
+    present = np.flatnonzero(~missing)
+    return np.concatenate([present[dates[present].argsort(kind="quicksort")], np.flatnonzero(missing)])
+
+def _mean(total, count, empty=np.nan):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(count > 0, total / np.maximum(count, 1), empty)
+
+def _round(values):
+    # round() of the calculator's numpy scalars
+    return np.round(values, 2)
+
+def _round_float(values):
+    # round() of the calculator's python floats (ratios of python ints): correctly rounded, unlike numpy's
+    values = np.asarray(values, dtype=float)
+    return np.array([round(value, 2) for value in values.ravel().tolist()]).reshape(values.shape)
+
+class BatchMetricsCalculator(MetricsCalculator):
+    # every p1/p2/p3/c/f/m metric of every group in the concatenated frames from one grouped pass per phase,
+    # equal to one MetricsCalculator per group on that group's rows (calculate_metrics still covers all rows)
+    def __init__(self, dfs, group_columns=GROUP_COLUMNS):
+        super().__init__(dfs, cache=None)
+        self.group_columns = list(group_columns)
+        for phase, df in self.dfs.items():
+            missing = [col for col in self.group_columns if col not in df.columns]
+            if missing:
+                raise ValueError(f"{phase} frame has no {missing} columns to group by")
+
+        keys = pd.concat([df[self.group_columns] for df in self.dfs.values()]) if self.dfs else pd.DataFrame(columns=self.group_columns)
+        self.groups = pd.MultiIndex.from_frame(keys.dropna().drop_duplicates()).sort_values()
+        # group of every row, -1 where a group column is empty (left out, like groupby's dropna)
+        self.group_codes = {
+            phase: self.groups.get_indexer(pd.MultiIndex.from_frame(df[self.group_columns])) if len(df) else np.zeros(0, dtype=np.int64)
+            for phase, df in self.dfs.items()
+        }
+
+    def calculate_group_metrics(self, phases=None) -> pd.DataFrame:
+        # one row per group, the columns of calculate_metrics for each phase; groups without rows in a phase
+        # get the calculator's values for an empty phase
+        dispatch_types = {
+            "phase1": lambda: self._group_metrics_phase1_2("phase1"),
+            "phase2": lambda: self._group_metrics_phase1_2("phase2"),
+            "phase3": self._group_metrics_phase3,
+            "challenge": self._group_metrics_challenge,
+            "funded": self._group_metrics_funded,
+        }
+
+        phases = [phase for phase in PHASES if phase in self.dfs] if phases is None else phases
+        unknown = [phase for phase in phases if phase not in dispatch_types]
+        if unknown:
+            raise ValueError(f"Unknown phases: {unknown}")
+
+        columns = {}
+        for phase in phases:
+            empty = MetricsCalculator({phase: self.dfs[phase].iloc[:0]}, cache=None).calculate_metrics([phase])[phase]
+            rows = np.bincount(self.group_codes[phase][self.group_codes[phase] >= 0], minlength=len(self.groups))
+            metrics = dispatch_types[phase]() if rows.any() else empty
+            for name, values in metrics.items():
+                columns[name] = np.where(rows > 0, values, empty[name])
+
+        return pd.DataFrame(columns, index=self.groups)
+
+    def _group_metrics_phase1_2(self, phasename: str) -> dict:
+        prefix = "p1" if phasename == "phase1" else "p2"
+        df = self.dfs[phasename]
+        codes, n = self.group_codes[phasename], len(self.groups)
+        outcome = df["Outcome"].to_numpy()
+        duration = df["Duration"].to_numpy(dtype=float)
+        passed_mask, failed_mask = outcome == "Passed", outcome == "Failed"
+
+        passed = group_counts(passed_mask, codes, n)
+        failed = group_counts(failed_mask, codes, n)
+        number = passed + failed
+        winrate = np.where(number > 0, _round(_mean(passed, number) * 100), 0)
+        average_duration = np.where(number > 0, _round(_mean(group_sums(duration, codes, n), group_counts(True, codes, n))), 0)
+        streaks = group_streaks(outcome, codes, n, ["Passed", "Failed"])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            efficiency = np.where(average_duration != 0, _round(winrate / average_duration), 0)
+
+        return {
+            prefix + "_number_passed_challenges": passed,
+            prefix + "_number_failed_challenges": failed,
+            prefix + "_number_challenges": number,
+            prefix + "_challenge_winrate": winrate,
+            prefix + "_average_challenge_duration": average_duration,
+            prefix + "_average_challenge_passed_duration": _round(_mean(group_sums(duration[passed_mask], codes[passed_mask], n), passed)),
+            prefix + "_average_challenge_failed_duration": _round(_mean(group_sums(duration[failed_mask], codes[failed_mask], n), failed)),
+            prefix + "_max_cons_challenge_passed": streaks["Passed"]["max"],
+            prefix + "_max_cons_challenge_failed": streaks["Failed"]["max"],
+            prefix + "_average_cons_challenge_passed": _round(streaks["Passed"]["mean"]),
+            prefix + "_average_cons_challenge_failed": _round(streaks["Failed"]["mean"]),
+            prefix + "_efficiency_ratio": efficiency,
+        }
+
+    def _group_metrics_phase3(self) -> dict:
+        df = self.dfs["phase3"]
+        codes, n = self.group_codes["phase3"], len(self.groups)
+        outcome = df["Outcome"].to_numpy()
+        duration = df["Duration"].to_numpy(dtype=float)
+        payout_mask, failed_mask = outcome == "Payout", outcome == "Failed"
+
+        payouts = group_counts(payout_mask, codes, n)
+        failed = group_counts(failed_mask, codes, n)
+        number = payouts + failed
+        winrate = np.where(number > 0, _round(_mean(payouts, number) * 100), 0)
+        streaks = group_streaks(outcome, codes, n, ["Payout", "Failed"])
+
+        amounts = (df["Ending Balance"] - df["Start Balance"]).to_numpy()[payout_mask]
+        amount_sum = group_sums(amounts, codes[payout_mask], n)
+        average_profit = np.where(payouts > 0, _round(_mean(amount_sum, payouts)), 0)
+        total_profit = np.where(payouts > 0, _round(amount_sum), 0)
+        total_loss = failed * FAILED_CHALLENGE_COST
+        with np.errstate(divide="ignore", invalid="ignore"):
+            profit_factor = np.where(total_loss != 0, _round(total_profit / total_loss), np.inf)
+
+        return {
+            "p3_number_payouts": payouts,
+            "p3_number_failed_challenges": failed,
+            "p3_number_challenges": number,
+            "p3_payout_winrate": winrate,
+            "p3_average_challenge_duration": np.where(number > 0, _round(_mean(group_sums(duration, codes, n), group_counts(True, codes, n))), 0),
+            "p3_average_challenge_passed_duration": np.where(payouts > 0, _round(_mean(group_sums(duration[payout_mask], codes[payout_mask], n), payouts)), 0),
+            "p3_average_challenge_failed_duration": np.where(failed > 0, _round(_mean(group_sums(duration[failed_mask], codes[failed_mask], n), failed)), 0),
+            "p3_max_cons_payouts": streaks["Payout"]["max"],
+            "p3_max_cons_failed": streaks["Failed"]["max"],
+            "p3_average_max_cons_payouts": _round(streaks["Payout"]["mean"]),
+            "p3_average_max_cons_failed": _round(streaks["Failed"]["mean"]),
+            "p3_average_profit_payout": average_profit,
+            "p3_total_profit_payouts": total_profit,
+            "p3_total_loss_payouts": total_loss,
+            "p3_profit_factor": profit_factor,
+            "p3_profitability_ratio": _round(((winrate / 100 * average_profit) / FAILED_CHALLENGE_COST) * 10),
+        }
+
+    def _group_metrics_challenge(self) -> dict:
+        n = len(self.groups)
+        df, pair_count = self._grouped_challenge_frame("challenge")
+        df = self._challenge_rows(df)
+        # in completion order, so every group's challenges come in the order they have on the group alone
+        challenge_df = self._build_challenge_frame(df)
+        codes = (challenge_df["Strategy_Pair"].to_numpy() // pair_count).astype(np.int64)
+        outcome = challenge_df["Outcome"].to_numpy()
+        duration = challenge_df["Duration"].to_numpy(dtype=float)
+        passed_mask, failed_mask = outcome == "Passed", outcome == "Failed"
+
+        number = group_counts(True, codes, n)
+        passed = group_counts(passed_mask, codes, n)
+        failed = group_counts(failed_mask, codes, n)
+        winrate = np.where(number > 0, _round(_mean(passed, number) * 100), 0)
+        average_duration = np.where(number > 0, _round(_mean(group_sums(duration, codes, n), number)), 0)
+        streaks = group_streaks(outcome, codes, n, ["Passed", "Failed"])
+
+        # distinct challenge numbers failed in phase 1 / phase 2, per group
+        failed_rows = (df["Outcome"] == "Failed").to_numpy() & (self.group_codes["challenge"] >= 0)
+        numbers = pd.DataFrame({
+            "group": self.group_codes["challenge"][failed_rows],
+            "phase": df["Phase"].to_numpy()[failed_rows],
+            "number": df["Challenge Number"].to_numpy()[failed_rows],
+        }).dropna().drop_duplicates()
+        failed_in_phase = {phase: np.bincount(numbers.loc[numbers["phase"] == phase, "group"], minlength=n) for phase in [1, 2]}
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            efficiency = _round(winrate / average_duration)
+
+        return {
+            "c_number_challenges": number,
+            "c_number_passed_challenges": passed,
+            "c_number_failed_challenges": failed,
+            "c_challenge_winrate": winrate,
+            "c_average_challenge_duration": average_duration,
+            "c_average_challenge_passed_duration": np.where(passed > 0, _round(_mean(group_sums(duration[passed_mask], codes[passed_mask], n), passed)), 0),
+            "c_average_challenge_failed_duration": np.where(failed > 0, _round(_mean(group_sums(duration[failed_mask], codes[failed_mask], n), failed)), 0),
+            "c_max_cons_challenge_passed": streaks["Passed"]["max"],
+            "c_max_cons_challenge_failed": streaks["Failed"]["max"],
+            "c_average_cons_challenge_passed": _round(streaks["Passed"]["mean"]),
+            "c_average_cons_challenge_failed": _round(streaks["Failed"]["mean"]),
+            "c_failed_p1_percentage": np.where(failed > 0, _round(_mean(failed_in_phase[1], failed) * 100), 0),
+            "c_failed_p2_percentage": np.where(failed > 0, _round(_mean(failed_in_phase[2], failed) * 100), 0),
+            "c_efficiency_ratio": efficiency,
+        }
+
+    def _group_metrics_funded(self) -> dict:
+        n = len(self.groups)
+        df, pair_count = self._grouped_challenge_frame("funded")
+        row_codes = self.group_codes["funded"]
+        outcome_rows = df["Outcome"].to_numpy()
+
+        # challenges come in key order, which keeps every group's challenges together; each group is then
+        # sorted by resolution date on its own, as sort_values' quicksort orders equal dates by the whole column
+        challenge_df = self._build_funded_challenge_frame(df)
+        codes = (challenge_df["Strategy_Pair"].to_numpy() // pair_count).astype(np.int64)
+        dates = challenge_df["Resolution_Date"].to_numpy()
+        starts = np.searchsorted(codes, np.arange(n + 1))
+        order = np.concatenate([start + sorted_positions(dates[start:end]) for start, end in zip(starts[:-1], starts[1:])])
+        challenge_df, codes = challenge_df.iloc[order], codes[order]
+
+        outcome = challenge_df["Outcome"].to_numpy()
+        duration = challenge_df["Duration"].to_numpy(dtype=float)
+        passed_mask, failed_mask = outcome == "Passed", outcome == "Failed"
+        number = group_counts(True, codes, n)
+        passed = group_counts(passed_mask, codes, n)
+        failed = number - passed
+        total_payouts = np.bincount(codes, weights=challenge_df["Payouts"].to_numpy(), minlength=n).astype(np.int64)
+        streaks = group_streaks(outcome, codes, n, ["Passed", "Failed"])
+
+        winrate = np.where(number > 0, _round_float(_mean(passed, number, 0) * 100), 0)
+        payout_winrate = np.where(total_payouts + failed > 0, _round_float(_mean(total_payouts, total_payouts + failed, 0) * 100), 0)
+
+        # payout streaks over the rows in challenge index order: strategy, challenge, phase, rows without keys last
+        challenge_codes = pd.factorize(df["Challenge Number"], sort=True)[0]
+        pair_codes = pd.factorize(df["Strategy_Pair"], sort=True)[0]
+        row_order = np.lexsort((df["Phase"].to_numpy(), challenge_codes, pair_codes, (challenge_codes < 0) | (pair_codes < 0), row_codes))
+        payout_streaks = group_streaks(outcome_rows[row_order], row_codes[row_order], n, ["Payout"])["Payout"]
+        average_payouts_challenge = _round_float(payout_streaks["mean"])
+
+        # payout profits of the rows with keys, added up in the same order as the calculator's python sum
+        payout_mask = (outcome_rows == "Payout") & (challenge_codes >= 0) & (pair_codes >= 0) & (row_codes >= 0)
+        payout_rows = row_order[payout_mask[row_order]]
+        payout_profit_sum = group_python_sums((df["Ending Balance"] - df["Start Balance"]).to_numpy()[payout_rows], row_codes[payout_rows], n)
+        payout_profit_count = np.bincount(row_codes[payout_rows], minlength=n)
+        average_profit_payout = np.where(payout_profit_count > 0, _round_float(_mean(payout_profit_sum, payout_profit_count)), 0)
+        average_profit_challenge = np.where(number > 0, _round(_mean(group_sums(challenge_df["Profit"], codes, n), number)), 0)
+
+        monthly = self._group_monthly_pnl(df, row_codes)
+        month_codes, month_pnl = monthly.index.get_level_values(0).to_numpy(), monthly.to_numpy()
+        winning_mask, losing_mask = month_pnl > 0, month_pnl < 0
+        winning = group_counts(winning_mask, month_codes, n)
+        losing = group_counts(losing_mask, month_codes, n)
+        monthly_winrate = np.where(winning + losing > 0, _round_float(_mean(winning, winning + losing, 0) * 100), 0)
+        average_monthly_profit = np.where(winning > 0, _round(_mean(group_sums(month_pnl[winning_mask], month_codes[winning_mask], n), winning)), 0)
+        average_monthly_loss = np.where(losing > 0, _round(_mean(group_sums(month_pnl[losing_mask], month_codes[losing_mask], n), losing)), 0)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            stability = np.where(average_monthly_loss != 0, _round(((monthly_winrate / 100) * average_monthly_profit) / np.abs(average_monthly_loss)), 0)
+            efficiency = np.where(failed != 0, _round(average_profit_challenge / failed), 0)
+
+        return {
+            "f_number_challenges": number,
+            "f_number_passed_challenges": passed,
+            "f_number_failed_challenges": failed,
+            "f_challenge_winrate": winrate,
+            "f_payout_winrate": payout_winrate,
+            "f_average_challenge_duration": np.where(number > 0, _round(_mean(group_sums(duration, codes, n), number)), 0),
+            "f_average_challenge_passed_duration": np.where(passed > 0, _round(_mean(group_sums(duration[passed_mask], codes[passed_mask], n), passed)), 0),
+            "f_average_challenge_failed_duration": np.where(failed > 0, _round(_mean(group_sums(duration[failed_mask], codes[failed_mask], n), failed)), 0),
+            "f_max_cons_challenge_passed": streaks["Passed"]["max"],
+            "f_max_cons_challenge_failed": streaks["Failed"]["max"],
+            "f_average_cons_challenge_passed": _round(streaks["Passed"]["mean"]),
+            "f_average_cons_challenge_failed": _round(streaks["Failed"]["mean"]),
+            "f_average_payouts_challenge": average_payouts_challenge,
+            "f_average_profit_payout": average_profit_payout,
+            "f_average_profit_challenge": average_profit_challenge,
+            "m_winning_months": winning,
+            "m_losing_months": losing,
+            "m_monthly_winrate": monthly_winrate,
+            "m_average_monthly_profit": average_monthly_profit,
+            "m_average_monthly_loss": average_monthly_loss,
+            "m_monthly_wl_ratio": np.where(losing > 0, _round_float(_mean(winning, losing, 0)), np.inf),
+            "f_challenge_efficiency_ratio": efficiency,
+            "m_overall_risk_adjusted_returns": _round(efficiency * stability),
+            "f_profitability_ratio": _round_float(((payout_winrate / 100) * average_payouts_challenge * average_profit_payout) / FAILED_CHALLENGE_COST),
+            "m_monthly_stability_return_ratio": stability,
+        }
+
+    def _grouped_challenge_frame(self, phase: str) -> tuple:
+        # Strategy_Pair replaced by one code per (group, pair), numbered group by group and pair by pair, so the
+        # challenge builders keep the groups apart and order each group's challenges as on the group alone
+        df = _with_strategy_pair(self.dfs[phase])
+        pair_codes, pairs = pd.factorize(df["Strategy_Pair"], sort=True)
+        codes = self.group_codes[phase]
+        keys = np.where((codes < 0) | (pair_codes < 0), np.nan, codes * len(pairs) + pair_codes)
+        return df.assign(Strategy_Pair=keys), len(pairs)
+
+    def _group_monthly_pnl(self, df: pd.DataFrame, codes: np.ndarray) -> pd.Series:
+        # metrics.monthly_pnl per group; groupby adds every (group, month) cell up in row order, as on the group alone
+        month = df["End Phase Date"].dt.to_period("M").astype(str)
+        monthly = df["PnL"].groupby([codes, month.to_numpy()]).sum()
+        return monthly[monthly.index.get_level_values(0) >= 0]
+
+def batch_metrics(dfs, group_columns=GROUP_COLUMNS, phases=None) -> pd.DataFrame:
+    return BatchMetricsCalculator(dfs, group_columns).calculate_group_metrics(phases)
@@ -1,35 +1,248 @@
-from simulation_run import run_single_simulation, run_joined_simulation
+from propfirm_trading_dashboard.simulation_run import run_single_simulation, run_joined_simulation
+from propfirm_trading_dashboard.csv_cache import ParsedCsvCache
+from propfirm_trading_dashboard.streaming_metrics import CHUNKSIZE
+from propfirm_trading_dashboard.report import REPORTS_DIR
+from propfirm_trading_dashboard.metrics_store import MetricsStore, STORE_PATH
+from propfirm_trading_dashboard.instrumentation import NO_PROFILER, PipelineProfiler
+from propfirm_trading_dashboard.metrics import MetricsCalculator
+from propfirm_trading_dashboard.multi_strategy_loader import merge_group_phases
+from propfirm_trading_dashboard.resampling import resample_metrics, streak_probability
+from propfirm_trading_dashboard.portfolio import SEARCH_METHODS, PortfolioSearch
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
+import argparse
+import sys
+import time
 
 phase_list = ["phase1", "phase2", "phase3", "challenge", "funded"]
 BASE_DIR = Path(__file__).resolve().parent.parent
 STRATEGY_DIR = BASE_DIR / "data"
 
-while True:
-    print("Select mode:")
-    print("1 - Single Simulation")
-    print("2 - Joined Simulation")
-    print("q - Quit")
-
-    choice = input("Enter your choice: ").strip().lower()
-
-    if choice == "q":
-        break
-
-    elif choice == "1":
-        while True:
-            folder_name = input("Enter strategy folder name: ").strip()
-            folder_path = STRATEGY_DIR / folder_name
-            
-            if folder_path.is_dir():
-                break;
-            else:
-                print("Folder does not exist. Please enter a valid run name.")
-                
-        run_single_simulation(folder_name, phase_list)
-
-    elif choice == "2":
-        run_joined_simulation("data", phase_list)
-
-    else:
-        print("Invalid choice")
\ No newline at end of file
+def build_arg_parser() -> argparse.ArgumentParser:
+    arg_parser = argparse.ArgumentParser(
+        description="Prop-firm simulation reports",
+        epilog="Without folder patterns the interactive menu is shown.",
+    )
+    arg_parser.add_argument("folders", nargs="*", help="glob patterns of strategy folders (relative to --data-dir) to report on in batch mode")
+    arg_parser.add_argument("--data-dir", default=STRATEGY_DIR, help="directory holding the strategy folders")
+    arg_parser.add_argument("--output-dir", default=REPORTS_DIR, help="directory the batch reports are written to")
+    arg_parser.add_argument("--jobs", type=int, default=1, help="number of folders reported on in parallel (process pool)")
+    arg_parser.add_argument("--no-cache", action="store_true", help="always re-parse the csv files")
+    arg_parser.add_argument("--clear-cache", action="store_true", help="delete the parsed csv cache before running")
+    arg_parser.add_argument("--workers", type=int, default=1, help="number of parallel csv loaders for joined simulations")
+    arg_parser.add_argument("--processes", action="store_true", help="load csv files in a process pool instead of threads")
+    arg_parser.add_argument("--incremental", action="store_true", help="reuse stored per-folder partials for unchanged folders in joined simulations")
+    arg_parser.add_argument("--stream", action="store_true", help="read single simulations in chunks instead of loading whole files")
+    arg_parser.add_argument("--chunksize", type=int, default=CHUNKSIZE, help="rows per chunk in streaming mode")
+    arg_parser.add_argument("--trends", action="store_true", help="add the Trends section (rolling 6-month, 12-month and expanding metrics) to the reports")
+    arg_parser.add_argument("--paginate-runs", action="store_true", help="write the runs tables to a sidecar script and page through them in the browser")
+    arg_parser.add_argument("--store", nargs="?", const=STORE_PATH, help=f"also save the batch folders' metrics to a sqlite store (default {STORE_PATH}); unchanged folders are not recomputed")
+    arg_parser.add_argument("--rank", metavar="METRIC", help="print the strategy folders in the metrics store ranked by METRIC and exit")
+    arg_parser.add_argument("--top", type=int, default=10, help="number of folders printed by --rank (combinations by --portfolio)")
+    arg_parser.add_argument("--profile", action="store_true", help="print wall time, CPU time, peak RSS and rows of every pipeline stage")
+    arg_parser.add_argument("--profile-json", metavar="PATH", help="also write the stage timings as JSON (implies --profile)")
+    arg_parser.add_argument("--chrome-trace", metavar="PATH", help="also write the stages as a Chrome trace-event file (implies --profile)")
+    arg_parser.add_argument("--resample", type=int, metavar="PATHS", help="print confidence intervals of the batch folders' challenge, funded and monthly metrics from PATHS bootstrapped sequences instead of writing reports (--jobs sets the process pool)")
+    arg_parser.add_argument("--block-size", type=int, nargs="?", const=0, help="resample blocks of consecutive challenges/months instead of single ones (default block size: cube root of the sequence length)")
+    arg_parser.add_argument("--seed", type=int, help="random seed of --resample")
+    arg_parser.add_argument("--portfolio", metavar="METRIC", help="print the combinations of the batch folders whose joined funded metrics maximize METRIC (e.g. m_monthly_winrate) instead of writing reports (--jobs sets the process pool)")
+    arg_parser.add_argument("--search", choices=SEARCH_METHODS, default="auto", help="how --portfolio explores the combinations (auto: exhaustive up to 12 folders, beam above)")
+    arg_parser.add_argument("--beam-width", type=int, default=8, help="combinations kept per size by the beam search")
+    arg_parser.add_argument("--min-size", type=int, default=1, help="fewest folders in a --portfolio combination")
+    arg_parser.add_argument("--max-size", type=int, help="most folders in a --portfolio combination")
+    return arg_parser
+
+def main(argv=None) -> int:
+    args = build_arg_parser().parse_args(argv)
+
+    cache = ParsedCsvCache()
+    if args.clear_cache:
+        cache.clear()
+        print("Parsed csv cache cleared")
+    if args.no_cache:
+        cache = None
+
+    profiler = PipelineProfiler() if args.profile or args.profile_json or args.chrome_trace else NO_PROFILER
+
+    if args.rank and not args.folders:
+        return print_ranking(args.store or STORE_PATH, args.rank, args.top)
+
+    if not args.folders:
+        run_interactive(args, cache, profiler)
+        return 0
+
+    folders = find_strategy_folders(args.folders, args.data_dir)
+    if not folders:
+        print(f"No strategy folders in {args.data_dir} match {' '.join(args.folders)}")
+        return 1
+
+    if args.resample:
+        return print_resampling(folders, args, cache)
+    if args.portfolio:
+        return print_portfolio(folders, args, cache)
+
+    Path(args.output_dir).mkdir(parents=True, exist_ok=True)
+    options = {
+        "cache": cache,
+        "stream": args.stream,
+        "chunksize": args.chunksize,
+        "paginate_runs": args.paginate_runs,
+        "trends": args.trends,
+        "base_path": str(args.data_dir),
+        "output_dir": str(args.output_dir),
+    }
+    if profiler.enabled:
+        if args.jobs <= 1:
+            options["profiler"] = profiler
+        else:
+            print("Stage profiling needs --jobs 1, the batch runs without it")
+
+    start = time.perf_counter()
+    results = run_batch(folders, options, args.jobs, collect=bool(args.store))
+    exit_code = print_batch_summary(results, time.perf_counter() - start)
+    report_profile(profiler, args)
+
+    if args.store:
+        computed = {folder: record for folder, _, error, record in results if error is None}
+        with MetricsStore(args.store) as store:
+            updated = store.sync(args.data_dir, phase_list, list(computed), cache=cache, computed=computed)
+        print(f"Metrics store {args.store}: {len(updated)} of {len(computed)} folders updated")
+
+    if args.rank:
+        print_ranking(args.store or STORE_PATH, args.rank, args.top)
+    return exit_code
+
+def print_ranking(store_path: str, metric: str, top: int) -> int:
+    with MetricsStore(store_path) as store:
+        ranking = store.rank(metric, limit=top)
+
+    if ranking.empty:
+        print(f"No folders with metric {metric} in {store_path}")
+        return 1
+
+    print(ranking.to_string(index=False))
+    return 0
+
+def print_resampling(folders: list, args, cache) -> int:
+    method = "bootstrap" if args.block_size is None else "block"
+    for folder in folders:
+        dfs = merge_group_phases(args.data_dir, [folder], ["challenge", "funded"], cache=cache)
+        result = resample_metrics(MetricsCalculator(dfs), args.resample, method, args.block_size or None, seed=args.seed, workers=args.jobs)
+
+        print(f"\n{folder}: {args.resample} {method} paths, 90% intervals")
+        if result["intervals"].empty:
+            print("No challenge or funded rows")
+            continue
+        print(result["intervals"].to_string(float_format=lambda value: f"{value:.2f}"))
+        if "f_max_cons_challenge_failed" in result["samples"]:
+            print(f"P(10+ failed funded challenges in a row) = {streak_probability(result['samples'], 10):.2%}")
+    return 0
+
+def print_portfolio(folders: list, args, cache) -> int:
+    search = PortfolioSearch.from_folders(args.data_dir, folders, cache=cache)
+    try:
+        ranking = search.search(args.portfolio, args.search, args.min_size, args.max_size, args.beam_width, args.top, args.jobs)
+    except ValueError as e:
+        print(e)
+        return 1
+
+    print(f"\nBest of {len(folders)} folders by {args.portfolio} ({args.search} search)")
+    columns = ["size", args.portfolio, "f_number_challenges", "m_monthly_winrate", "m_overall_risk_adjusted_returns"]
+    table = ranking[list(dict.fromkeys(columns))].assign(folders=ranking["folders"].map(" + ".join))
+    print(table.to_string())
+    return 0
+
+def find_strategy_folders(patterns: list, data_dir) -> list:
+    folders = []
+    for pattern in patterns:
+        for match in sorted(Path(data_dir).glob(pattern)):
+            if match.is_dir() and match.name not in folders:
+                folders.append(match.name)
+    return folders
+
+def run_folder(folder: str, options: dict, collect: bool = False) -> tuple:
+    # never raises, so one bad folder cannot take the rest of the batch down; with collect, the folder's
+    # metrics record comes back too, so --store does not calculate them again
+    start = time.perf_counter()
+    try:
+        record = run_single_simulation(folder, phase_list, **options)
+    except Exception as e:
+        return folder, time.perf_counter() - start, f"{type(e).__name__}: {e}", None
+    return folder, time.perf_counter() - start, None, record if collect else None
+
+def run_batch(folders: list, options: dict, jobs: int = 1, collect: bool = False) -> list:
+    if jobs <= 1:
+        return [run_folder(folder, options, collect) for folder in folders]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(run_folder, folder, options, collect): folder for folder in folders}
+        for future in as_completed(futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                # the worker process itself died
+                results.append((futures[future], 0.0, f"{type(e).__name__}: {e}", None))
+    return results
+
+def print_batch_summary(results: list, elapsed: float) -> int:
+    failures = [result for result in results if result[2] is not None]
+
+    print(f"\n{'Folder':<40} {'Seconds':>8}  Status")
+    for folder, seconds, error, _ in sorted(results, key=lambda result: result[1], reverse=True):
+        print(f"{folder:<40} {seconds:8.2f}  {'FAILED' if error else 'ok'}")
+
+    print(f"\n{len(results) - len(failures)} reports written, {len(failures)} failed in {elapsed:.2f}s")
+    for folder, _, error, _ in failures:
+        print(f"  {folder}: {error}")
+
+    return 1 if failures else 0
+
+def report_profile(profiler: PipelineProfiler, args):
+    if not profiler.stages:
+        return
+
+    print()
+    profiler.print_summary()
+    if args.profile_json:
+        print(f"Stage timings written to {profiler.write_json(args.profile_json)}")
+    if args.chrome_trace:
+        print(f"Chrome trace written to {profiler.write_chrome_trace(args.chrome_trace)}")
+
+def run_interactive(args, cache, profiler: PipelineProfiler = NO_PROFILER):
+    while True:
+        print("Select mode:")
+        print("1 - Single Simulation")
+        print("2 - Joined Simulation")
+        print("q - Quit")
+
+        choice = input("Enter your choice: ").strip().lower()
+
+        if choice == "q":
+            break
+
+        elif choice == "1":
+            while True:
+                folder_name = input("Enter strategy folder name: ").strip()
+                folder_path = Path(args.data_dir) / folder_name
+
+                if folder_path.is_dir():
+                    break;
+                else:
+                    print("Folder does not exist. Please enter a valid run name.")
+
+            run_single_simulation(folder_name, phase_list, cache=cache, stream=args.stream, chunksize=args.chunksize, paginate_runs=args.paginate_runs, trends=args.trends, base_path=str(args.data_dir), profiler=profiler)
+
+        elif choice == "2":
+            run_joined_simulation(str(args.data_dir), phase_list, cache=cache, workers=args.workers, use_processes=args.processes, incremental=args.incremental, paginate_runs=args.paginate_runs, trends=args.trends, profiler=profiler)
+
+        else:
+            print("Invalid choice")
+            continue
+
+        # one summary (and trace file) per report
+        report_profile(profiler, args)
+        profiler.stages.clear()
+
+if __name__ == "__main__":
+    sys.exit(main())
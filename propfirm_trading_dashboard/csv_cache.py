@@ -0,0 +1,107 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401 - feather storage needs pyarrow
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# project cache directory next to data/ and reports/, whatever the working directory; PROPFIRM_CACHE_DIR moves it
+CACHE_ROOT = Path(os.environ.get("PROPFIRM_CACHE_DIR", Path(__file__).resolve().parent.parent / ".cache"))
+CACHE_DIR = CACHE_ROOT / "parsed_csv"
+MAX_CACHE_BYTES = 512 * 1024 * 1024
+
+class ParsedCsvCache:
+    # no shared index: every entry and every source file fingerprint is its own file, written with an atomic
+    # replace, and eviction scans the directory. Threads and process pool workers can share one cache directory
+    # without losing updates; an entry's mtime is its last use
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes: int = MAX_CACHE_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.files_dir = self.cache_dir / "files"
+
+    def load(self, path, loader, variant: str = "raw") -> pd.DataFrame:
+        if not HAS_PYARROW:
+            return loader(path)
+
+        source = Path(path).resolve()
+        file_record = self._fingerprint(source)
+        entry_path = self.cache_dir / f"{file_record['hash']}_{variant}.feather"
+
+        df = None
+        if entry_path.exists():
+            try:
+                df = pd.read_feather(entry_path)
+                os.utime(entry_path)
+            except (OSError, ValueError):
+                df = None
+
+        if df is None:
+            df = loader(path)
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._write_atomic(entry_path, lambda tmp_path: df.reset_index(drop=True).to_feather(tmp_path))
+            self._evict(keep=entry_path)
+        return df
+
+    def clear(self):
+        if not self.cache_dir.exists():
+            return
+
+        for entry in self.cache_dir.glob("*.feather"):
+            entry.unlink(missing_ok=True)
+        for record in self.files_dir.glob("*.json"):
+            record.unlink(missing_ok=True)
+
+    def _fingerprint(self, source: Path) -> dict:
+        # unchanged path/size/mtime reuse the stored hash, so a cache hit never reads the csv
+        stat = source.stat()
+        record_path = self.files_dir / (hashlib.sha256(str(source).encode()).hexdigest()[:32] + ".json")
+        try:
+            known = json.loads(record_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            known = None
+        if known and known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns:
+            return known
+
+        record = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "hash": hashlib.sha256(source.read_bytes()).hexdigest(),
+        }
+        self.files_dir.mkdir(parents=True, exist_ok=True)
+        self._write_atomic(record_path, lambda tmp_path: tmp_path.write_text(json.dumps(record), encoding="utf-8"))
+        return record
+
+    def _evict(self, keep: Path):
+        # least recently used first, from what is on disk now (other processes may have added or removed entries)
+        entries = []
+        for entry in self.cache_dir.glob("*.feather"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, entry, stat.st_size))
+
+        total = sum(size for _, _, size in entries)
+        for _, entry, size in sorted(entries, key=lambda item: item[0]):
+            if total <= self.max_bytes:
+                break
+            if entry == keep:
+                continue
+
+            entry.unlink(missing_ok=True)
+            total -= size
+
+    def _write_atomic(self, path: Path, write):
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.{time.monotonic_ns()}.tmp")
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
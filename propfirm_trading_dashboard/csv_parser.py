@@ -1,12 +1,160 @@
+import numpy as np
 import pandas as pd
 
-def load_csv_file(path: str):
+REQUIRED_COLUMNS = ["Challenge Number", "Start Phase Date", "End Phase Date", "Phase", "Outcome", "Reason", "Duration", "Start Balance", "Ending Balance", "Max Drawdown", "Profit Target", "Daily Drawdown"]
+
+DATE_COLUMNS = ["Start Phase Date", "End Phase Date"]
+DATE_FORMAT = "%Y.%m.%d"
+# valid DATE_FORMAT dates except February 29th, which depends on the year
+DATE_PATTERN = r"\d{4}\.(?:(?:0[1-9]|1[0-2])\.(?:0[1-9]|1\d|2[0-8])|(?:0[13-9]|1[0-2])\.(?:29|30)|(?:0[13578]|1[02])\.31)"
+
+COLUMN_DTYPES = {
+    "Challenge Number": "int64",
+    "Start Phase Date": "category",
+    "End Phase Date": "category",
+    "Phase": "int64",
+    "Outcome": "category",
+    "Reason": "category",
+    "Duration": "float64",
+    "Start Balance": "float64",
+    "Ending Balance": "float64",
+    "Max Drawdown": "float64",
+    "Profit Target": "float64",
+    "Daily Drawdown": "float64",
+}
+
+NUMERIC_VALUE_COLUMNS = [col for col, dtype in COLUMN_DTYPES.items() if dtype in ("int64", "float64")]
+REQUIRED_VALUE_COLUMNS = ["Challenge Number", "Phase", "Outcome", "Start Balance", "Ending Balance"]
+NON_NEGATIVE_COLUMNS = ["Start Balance", "Ending Balance"]
+OUTCOMES = ["Passed", "Failed", "Payout"]
+PHASE_NUMBERS = [1, 2, 3]
+MAX_REPORTED_ROWS = 10
+
+def load_csv_file(path: str, typed: bool = False, engine: str = "c", cache=None):
+    if cache is not None:
+        variant = "typed" if typed else "raw"
+        return cache.load(path, lambda p: load_csv_file(p, typed=typed, engine=engine), variant=variant)
+
+    if typed:
+        return load_typed_csv_file(path, engine)
+
     df = pd.read_csv(path, encoding='utf-16', sep='\t')
     return df
 
-def validate_columns(df: pd.DataFrame):
-    required_columns = ["Challenge Number", "Start Phase Date", "End Phase Date", "Phase", "Outcome", "Reason", "Duration", "Start Balance", "Ending Balance", "Max Drawdown", "Profit Target", "Daily Drawdown"]
+def load_typed_csv_file(path: str, engine: str = "c", validate: bool = True):
+    # explicit schema: no dtype inference, Outcome/Reason as categoricals
+    try:
+        df = pd.read_csv(
+            path,
+            encoding='utf-16',
+            sep='\t',
+            dtype=COLUMN_DTYPES,
+            engine=engine,
+        )
+    except ValueError:
+        # a cell the schema cannot convert: validating the untyped file names its line and column
+        validate_frame(pd.read_csv(path, encoding='utf-16', sep='\t', engine=engine), path)
+        raise
+    if validate:
+        validate_frame(df, path)
+    return parse_date_columns(df)
+
+def iter_csv_chunks(path: str, chunksize: int = 100_000, typed: bool = False):
+    # bounded-memory reader for exports too large to load at once; every chunk is validated like a full file
+    reader = pd.read_csv(
+        path,
+        encoding='utf-16',
+        sep='\t',
+        dtype=COLUMN_DTYPES if typed else None,
+        chunksize=chunksize,
+    )
+    with reader:
+        for chunk in _typed_chunks(reader, path, chunksize) if typed else reader:
+            validate_frame(chunk, path)
+            yield parse_date_columns(chunk) if typed else chunk
+
+def _typed_chunks(reader, path: str, chunksize: int):
+    # as in load_typed_csv_file: a cell the schema cannot convert is reported by validating the untyped chunks
+    try:
+        yield from reader
+    except ValueError:
+        for _ in iter_csv_chunks(path, chunksize):
+            pass
+        raise
+
+def parse_date_columns(df: pd.DataFrame):
+    # dates are read as categoricals so each distinct date string is parsed only once
+    for col in DATE_COLUMNS:
+        dates = df[col].cat
+        parsed = pd.to_datetime(dates.categories, format=DATE_FORMAT)
+        df[col] = parsed.take(dates.codes, allow_fill=True, fill_value=pd.NaT)
+
+    return df
+
+def validate_frame(df: pd.DataFrame, source=None):
+    validate_columns(df, source)
+    validate_values(df, source)
 
-    missing_columns = [col for col in required_columns if col not in df.columns]
+def validate_columns(df: pd.DataFrame, source=None):
+    missing_columns = [col for col in REQUIRED_COLUMNS if col not in df.columns]
     if missing_columns:
-        raise ValueError(f"File is missing required columns: {missing_columns}")
\ No newline at end of file
+        raise ValueError(f"{source or 'File'} is missing required columns: {missing_columns}")
+
+def validate_values(df: pd.DataFrame, source=None):
+    # one vectorized pass over every column, so malformed exports fail here with their row numbers
+    # instead of being coerced to 0/NaT in the metrics stage; masks are plain numpy arrays to keep
+    # the per-file overhead low on folders with many small exports
+    problems = {}
+    numeric = {}
+    for col in NUMERIC_VALUE_COLUMNS:
+        values = df[col]
+        if pd.api.types.is_numeric_dtype(values):
+            numeric[col] = values.to_numpy(dtype=float, na_value=np.nan)
+        else:
+            numeric[col] = pd.to_numeric(values, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+            problems[f"non-numeric {col}"] = np.isnan(numeric[col]) & values.notna().to_numpy()
+
+    for col in REQUIRED_VALUE_COLUMNS:
+        problems[f"missing {col}"] = df[col].isna().to_numpy()
+
+    for col in DATE_COLUMNS:
+        # dates may be empty (e.g. a phase still running), but not in another format
+        if not pd.api.types.is_datetime64_any_dtype(df[col]):
+            problems[f"unparseable {col} (expected {DATE_FORMAT})"] = _invalid_dates(df[col])
+
+    outcomes = df["Outcome"]
+    invalid = outcomes.notna().to_numpy() & ~outcomes.isin(OUTCOMES).to_numpy()
+    if invalid.any():
+        # values padded with whitespace are accepted, like the strip in normalize_phase_frame
+        invalid[invalid] = ~outcomes[invalid].astype(str).str.strip().isin(OUTCOMES).to_numpy()
+    problems[f"Outcome not in {OUTCOMES}"] = invalid
+    problems[f"Phase not in {PHASE_NUMBERS}"] = ~np.isnan(numeric["Phase"]) & ~np.isin(numeric["Phase"], PHASE_NUMBERS)
+    for col in NON_NEGATIVE_COLUMNS:
+        problems[f"negative {col}"] = numeric[col] < 0
+
+    errors = [_describe_rows(df.index, name, np.flatnonzero(mask)) for name, mask in problems.items() if mask.any()]
+    if errors:
+        raise ValueError(f"{source or 'File'} has invalid values: " + "; ".join(errors))
+
+def _invalid_dates(values: pd.Series) -> np.ndarray:
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # typed loads: every distinct date is checked once; code -1 (missing) picks the appended False
+        invalid = _invalid_dates(pd.Series(values.cat.categories.astype(object)))
+        return np.append(invalid, False)[values.cat.codes.to_numpy()]
+    if not pd.api.types.is_string_dtype(values) and not pd.api.types.is_object_dtype(values):
+        # e.g. a column read as float64 because it holds no dates at all
+        return values.notna().to_numpy()
+
+    # the pattern settles almost every date without parsing; only the rest (leap days, other formats) goes to strptime
+    matched = values.str.fullmatch(DATE_PATTERN).to_numpy(dtype=bool, na_value=False)
+    invalid = values.notna().to_numpy() & ~matched
+    if invalid.any():
+        invalid[invalid] = pd.to_datetime(values[invalid], format=DATE_FORMAT, errors="coerce").isna().to_numpy()
+    return invalid
+
+def _describe_rows(index: pd.Index, name: str, positions: np.ndarray) -> str:
+    # read_csv (and chunk) index labels count data rows from 0, so +2 gives the line in the file, header included
+    rows = index[positions[:MAX_REPORTED_ROWS]]
+    rows = (rows + 2).tolist() if pd.api.types.is_integer_dtype(index) else rows.tolist()
+    more = f" and {len(positions) - MAX_REPORTED_ROWS} more" if len(positions) > MAX_REPORTED_ROWS else ""
+    return f"{name} at lines {rows}{more}"
@@ -0,0 +1,218 @@
+import hashlib
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, List
+import numpy as np
+import pandas as pd
+from propfirm_trading_dashboard.multi_strategy_loader import scan_strategy_folders, discover_strategy_groups, load_phase_file, merge_frames
+from propfirm_trading_dashboard.phase_frames import PROFIT_SPLIT, normalize_phase_frame
+from propfirm_trading_dashboard.metrics import ChallengeIndex, MetricsCalculator, _with_strategy_pair, monthly_pnl, run_length_encode, run_stats
+from propfirm_trading_dashboard.csv_cache import CACHE_ROOT
+from propfirm_trading_dashboard.instrumentation import NO_PROFILER, PipelineProfiler
+
+PARTIALS_DIR = CACHE_ROOT / "partials"
+
+# everything MetricsCalculator and the runs tables read; Reason and the drawdown/target levels are dropped
+PARTIAL_COLUMNS = [
+    "Strategy_Pair", "Run", "Challenge Number", "Start Phase Date", "End Phase Date",
+    "Phase", "Outcome", "Duration", "Start Balance", "Ending Balance",
+]
+
+def folder_fingerprint(phase_files: Dict[str, str]) -> str:
+    digest = hashlib.sha256()
+    for phase in sorted(phase_files):
+        stat = os.stat(phase_files[phase])
+        digest.update(f"{phase}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()[:16]
+
+def build_folder_partials(folder: str, phase_files: Dict[str, str], phase_list: List[str], typed: bool = False, cache=None) -> dict:
+    frames = {}
+    for phase in phase_list:
+        if phase in phase_files:
+            df = load_phase_file(phase_files[phase], folder, typed=typed, cache=cache)
+            frames[phase] = df[[col for col in PARTIAL_COLUMNS if col in df.columns]]
+
+    return {
+        "frames": frames,
+        "monthly_pnl": folder_monthly_pnl(frames.get("funded")),
+        "records": folder_records(frames),
+    }
+
+def folder_records(frames: Dict[str, pd.DataFrame]) -> dict:
+    # per-challenge records of one folder, built from its rows in the order they take in the joined frames
+    # (merge_frames sorts stably, so a folder's rows keep their relative order there)
+    calculator = MetricsCalculator({phase: merge_frames([df]) for phase, df in frames.items() if phase in ["challenge", "funded"]})
+    records = {}
+
+    if "challenge" in calculator.dfs:
+        df = calculator.dfs["challenge"]
+        records["challenge"] = {"rows": len(df), "pair": _folder_pair(df)}
+        if not df.empty:
+            df = calculator._challenge_rows(df)
+            records["challenge"]["challenge_df"] = calculator._build_challenge_frame(df)
+            records["challenge"]["failed_numbers"] = calculator._failed_challenge_numbers(df)
+
+    if "funded" in calculator.dfs:
+        df = calculator.dfs["funded"]
+        records["funded"] = {"rows": len(df), "pair": _folder_pair(df)}
+        if not df.empty:
+            df = _with_strategy_pair(df)
+            index = ChallengeIndex(df)
+            run_values, run_lengths = run_length_encode(df["Outcome"].to_numpy()[index.order])
+            rows = index.rows[(df["Outcome"] == "Payout").to_numpy()[index.rows]]
+            records["funded"].update({
+                # challenges in key order, sorted by resolution only once all folders are merged
+                "challenge_df": calculator._build_funded_challenge_frame(df, index),
+                "run_values": run_values,
+                "run_lengths": run_lengths,
+                "payout_profits": (df["Ending Balance"].to_numpy() - df["Start Balance"].to_numpy())[rows].tolist(),
+                "monthly_pnl": monthly_pnl(df),
+            })
+    return records
+
+def _folder_pair(df: pd.DataFrame):
+    pairs = _with_strategy_pair(df)["Strategy_Pair"].unique()
+    return pairs[0] if len(pairs) == 1 else None
+
+def folder_monthly_pnl(funded: pd.DataFrame) -> pd.DataFrame:
+    # same PnL rule and profit split as the funded metrics and build_monthly_pnl
+    if funded is None or funded.empty:
+        return pd.DataFrame(columns=["Year", "Month", "PnL"])
+
+    funded = normalize_phase_frame(funded, "funded")
+    pnl = np.where(funded["PnL"] > 0, funded["PnL"] * PROFIT_SPLIT, funded["PnL"])
+    end_date = funded["End Phase Date"]
+
+    monthly = pd.DataFrame({"Year": end_date.dt.year, "Month": end_date.dt.month, "PnL": pnl})
+    return monthly.groupby(["Year", "Month"])["PnL"].sum().reset_index()
+
+def load_folder_partials(folder: str, phase_files: Dict[str, str], phase_list: List[str], partials_dir: Path, typed: bool = False, cache=None):
+    folder_dir = partials_dir / folder
+    variant = "typed" if typed else "raw"
+    partials_path = folder_dir / f"{folder_fingerprint(phase_files)}_{variant}.pkl"
+
+    if partials_path.exists():
+        partials = pd.read_pickle(partials_path)
+        if "records" in partials and all(phase in partials["frames"] for phase in phase_list if phase in phase_files):
+            return partials, False
+
+    partials = build_folder_partials(folder, phase_files, phase_list, typed, cache)
+
+    folder_dir.mkdir(parents=True, exist_ok=True)
+    for stale in folder_dir.glob(f"*_{variant}.pkl"):
+        stale.unlink()
+    pd.to_pickle(partials, partials_path)
+    return partials, True
+
+def load_incremental_phases(base_path: str, phase_list: List[str], partials_dir=PARTIALS_DIR, typed: bool = False, cache=None, manifest: Dict[str, Dict[str, str]] = None, profiler: PipelineProfiler = NO_PROFILER):
+    if manifest is None:
+        manifest = scan_strategy_folders(base_path)
+
+    groups = discover_strategy_groups(base_path, manifest)
+    folders = [folder for folder_list in groups.values() for folder in folder_list]
+
+    phase_frames = {phase: [] for phase in phase_list}
+    monthly_partials = []
+    records = []
+    rebuilt = []
+
+    # rebuilt partials are validated while they are loaded, so there is no separate validate stage here
+    with profiler.stage("load partials", files=len(folders)) as stage:
+        for folder in folders:
+            partials, was_rebuilt = load_folder_partials(folder, manifest[folder], phase_list, Path(partials_dir), typed, cache)
+            if was_rebuilt:
+                rebuilt.append(folder)
+
+            for phase in phase_list:
+                if phase in partials["frames"]:
+                    phase_frames[phase].append(partials["frames"][phase])
+            monthly_partials.append(partials["monthly_pnl"])
+            records.append(partials["records"])
+        stage["rows"] = sum(len(df) for frames in phase_frames.values() for df in frames)
+        stage["rebuilt"] = len(rebuilt)
+        prune_partials(Path(partials_dir), folders)
+
+    with profiler.stage("merge", rows=stage["rows"]):
+        df_dict = {phase: merge_frames(frames) for phase, frames in phase_frames.items()}
+        monthly_pnl = merge_monthly_pnl(monthly_partials)
+    return df_dict, monthly_pnl, rebuilt, records
+
+def prune_partials(partials_dir: Path, folders: List[str]):
+    # partials of folders that were removed or renamed would otherwise stay on disk forever
+    if not partials_dir.exists():
+        return
+
+    for folder_dir in partials_dir.iterdir():
+        if folder_dir.is_dir() and folder_dir.name not in folders:
+            shutil.rmtree(folder_dir, ignore_errors=True)
+
+def merge_monthly_pnl(monthly_partials: List[pd.DataFrame]) -> pd.DataFrame:
+    monthly_partials = [monthly for monthly in monthly_partials if not monthly.empty]
+    if not monthly_partials:
+        return pd.DataFrame(columns=["Year", "Month", "PnL"])
+
+    return pd.concat(monthly_partials).groupby(["Year", "Month"])["PnL"].sum().reset_index()
+
+class IncrementalMetricsCalculator(MetricsCalculator):
+    # challenge and funded metrics merged from the folders' per-challenge records instead of re-indexing
+    # every joined row; the phase 1-3 metrics still read the joined rows, their streaks follow the date order
+    def __init__(self, dfs, records: List[dict], cache=None):
+        super().__init__(dfs, cache)
+        self.records = records
+
+    def _phase_records(self, phase: str):
+        # records merge exactly only while no two folders share a strategy pair (their challenges would join)
+        records = [record[phase] for record in self.records if phase in record]
+        pairs = [record["pair"] for record in records if record["rows"]]
+        if None in pairs or len(set(pairs)) != len(pairs):
+            return None
+        return records
+
+    def _summarize_challenge(self):
+        records = self._phase_records("challenge")
+        if records is None:
+            return super()._summarize_challenge()
+        if self.dfs["challenge"].empty:
+            return {"rows": 0}
+
+        # completion rows are row labels of the joined frame, which stacks the folders in record order
+        offsets = np.cumsum([0] + [record["rows"] for record in records])
+        challenge_df = pd.concat([
+            record["challenge_df"].assign(completion_row=record["challenge_df"]["completion_row"] + offset)
+            for record, offset in zip(records, offsets) if record["rows"]
+        ], ignore_index=True)
+
+        return {
+            "rows": int(offsets[-1]),
+            "challenge_df": challenge_df.sort_values("completion_row").reset_index(drop=True),
+            "failed_p1_count": len(set().union(*(record["failed_numbers"][1] for record in records if record["rows"]))),
+            "failed_p2_count": len(set().union(*(record["failed_numbers"][2] for record in records if record["rows"]))),
+        }
+
+    def _summarize_funded(self):
+        records = self._phase_records("funded")
+        if records is None:
+            return super()._summarize_funded()
+        if self.dfs["funded"].empty:
+            return {"rows": 0}
+
+        # in strategy pair order, the order ChallengeIndex puts the joined challenges in
+        records = sorted((record for record in records if record["rows"]), key=lambda record: record["pair"])
+        challenge_df = pd.concat([record["challenge_df"] for record in records], ignore_index=True)
+        challenge_df = challenge_df.sort_values("Resolution_Date").reset_index(drop=True)
+
+        # a run at the end of one folder continues into the next folder's first run
+        run_values = np.concatenate([record["run_values"] for record in records])
+        run_lengths = np.concatenate([record["run_lengths"] for record in records])
+        starts = np.flatnonzero(np.concatenate(([True], run_values[1:] != run_values[:-1])))
+        payout_profits = [profit for record in records for profit in record["payout_profits"]]
+
+        return {
+            "rows": sum(record["rows"] for record in records),
+            "challenge_df": challenge_df,
+            "payout_streaks": run_stats(run_values[starts], np.add.reduceat(run_lengths, starts), ["Payout"]),
+            "payout_profit_sum": sum(payout_profits),
+            "payout_profit_count": len(payout_profits),
+            "monthly_pnl": pd.concat([record["monthly_pnl"] for record in records]).groupby(level=0).sum(),
+        }
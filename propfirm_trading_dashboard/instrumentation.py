@@ -0,0 +1,112 @@
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import resource
+    HAS_RESOURCE = True
+except ImportError:
+    # Windows: peak RSS is not reported
+    HAS_RESOURCE = False
+
+def peak_rss_mb():
+    if not HAS_RESOURCE:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+class PipelineProfiler:
+    # opt-in per-stage wall time, CPU time, peak RSS and row counts; a disabled profiler records nothing
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.stages = []
+        self.current_section = None
+        self._origin = time.perf_counter()
+
+    @contextmanager
+    def section(self, name: str):
+        # labels the stages recorded inside, e.g. with the report they belong to
+        previous, self.current_section = self.current_section, name
+        try:
+            yield
+        finally:
+            self.current_section = previous
+
+    @contextmanager
+    def stage(self, name: str, rows: int = None, **details):
+        # the yielded record can be updated inside the block, e.g. with rows only known afterwards
+        record = {"name": name, "section": self.current_section, "rows": rows, **details}
+        if not self.enabled:
+            yield record
+            return
+
+        rss_before = peak_rss_mb()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield record
+        finally:
+            record["start"] = wall_start - self._origin
+            record["wall"] = time.perf_counter() - wall_start
+            # CPU of this process only: work done in process pool workers is not counted
+            record["cpu"] = time.process_time() - cpu_start
+            record["peak_rss_mb"] = peak_rss_mb()
+            record["rss_growth_mb"] = record["peak_rss_mb"] - rss_before if rss_before is not None else None
+            self.stages.append(record)
+
+    def summary(self) -> str:
+        width = max([len("Stage")] + [len(_stage_label(record)) for record in self.stages])
+        lines = [f"{'Stage':<{width}} {'Wall s':>8} {'CPU s':>8} {'Rows':>9} {'Peak RSS MB':>12} {'Growth MB':>10}"]
+        for record in self.stages:
+            lines.append(
+                f"{_stage_label(record):<{width}} {record['wall']:8.3f} {record['cpu']:8.3f} "
+                f"{_format(record['rows'], 9, 'd')} {_format(record['peak_rss_mb'], 12, '.1f')} {_format(record['rss_growth_mb'], 10, '.1f')}"
+            )
+        return "\n".join(lines)
+
+    def print_summary(self):
+        if self.stages:
+            print(self.summary())
+
+    def write_json(self, path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"stages": self.stages}, indent=2, default=_json_value), encoding="utf-8")
+        return path
+
+    def write_chrome_trace(self, path) -> Path:
+        # trace-event format, opens in chrome://tracing and Perfetto
+        pid = os.getpid()
+        events = []
+        for record in self.stages:
+            args = {key: value for key, value in record.items() if key not in ("name", "start", "wall")}
+            events.append({
+                "name": _stage_label(record), "cat": "pipeline", "ph": "X", "pid": pid, "tid": 0,
+                "ts": record["start"] * 1e6, "dur": record["wall"] * 1e6, "args": args,
+            })
+            if record["peak_rss_mb"] is not None:
+                events.append({
+                    "name": "peak RSS MB", "ph": "C", "pid": pid, "tid": 0,
+                    "ts": (record["start"] + record["wall"]) * 1e6, "args": {"MB": record["peak_rss_mb"]},
+                })
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}, default=_json_value), encoding="utf-8")
+        return path
+
+NO_PROFILER = PipelineProfiler(enabled=False)
+
+def _stage_label(record: dict) -> str:
+    return f"{record['section']}: {record['name']}" if record.get("section") else record["name"]
+
+def _format(value, width: int, spec: str) -> str:
+    return "-".rjust(width) if value is None else format(value, f"{width}{spec}")
+
+def _json_value(value):
+    # numpy scalars from row counts
+    return value.item() if hasattr(value, "item") else str(value)
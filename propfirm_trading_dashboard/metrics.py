@@ -1,27 +1,276 @@
+import copy
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from pathlib import Path
 import pandas as pd
 import numpy as np
+from propfirm_trading_dashboard.phase_frames import FAILED_CHALLENGE_COST, PROFIT_SPLIT, normalize_phase_frames
+
+PHASES = ["phase1", "phase2", "phase3", "challenge", "funded"]
+# bump when a metric formula changes, so disk-cached phase results from older code are not reused
+METRICS_CACHE_VERSION = 2
+
+def run_length_encode(values, group_ids=None):
+    values = np.asarray(values)
+    if values.size == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return (values, empty) if group_ids is None else (values, empty, np.asarray(group_ids))
+
+    boundaries = values[1:] != values[:-1]
+    if group_ids is not None:
+        group_ids = np.asarray(group_ids)
+        boundaries |= group_ids[1:] != group_ids[:-1]
+
+    starts = np.concatenate(([0], np.flatnonzero(boundaries) + 1))
+    lengths = np.diff(np.append(starts, values.size))
+
+    if group_ids is None:
+        return values[starts], lengths
+    return values[starts], lengths, group_ids[starts]
+
+def run_stats(run_values, run_lengths, outcomes):
+    rows = {}
+    for outcome in outcomes:
+        lengths = run_lengths[run_values == outcome]
+        rows[outcome] = {
+            "max": lengths.max() if lengths.size else 0,
+            "mean": lengths.mean() if lengths.size else 0.0,
+            "count": lengths.size,
+        }
+
+    stats = pd.DataFrame.from_dict(rows, orient="index", columns=["max", "mean", "count"])
+    stats.index.name = "outcome"
+    return stats
+
+def streak_stats(values, outcomes, group_ids=None):
+    # max, mean and count of consecutive runs per outcome (per group when group_ids is given)
+    if group_ids is None:
+        return run_stats(*run_length_encode(values), outcomes)
+
+    run_values, run_lengths, run_groups = run_length_encode(values, group_ids)
+    groups = np.unique(group_ids)
+
+    runs = pd.DataFrame({"group": run_groups, "outcome": run_values, "length": run_lengths})
+    runs = runs[runs["outcome"].isin(outcomes)]
+    stats = runs.groupby(["group", "outcome"])["length"].agg(["max", "mean", "count"])
+    return stats.reindex(pd.MultiIndex.from_product([groups, outcomes], names=["group", "outcome"]), fill_value=0)
+
+def summarize_outcome_rows(outcomes: pd.Series, durations: pd.Series, outcome_names) -> dict:
+    # additive per-outcome counts and duration sums, so summaries of chunks can be added up
+    summary = {
+        "rows": len(outcomes),
+        "duration_sum": durations.sum(),
+        "duration_count": durations.count(),
+        "counts": {},
+        "duration_sums": {},
+        "duration_counts": {},
+    }
+    for name in outcome_names:
+        mask = outcomes == name
+        summary["counts"][name] = mask.sum()
+        summary["duration_sums"][name] = durations[mask].sum()
+        summary["duration_counts"][name] = durations[mask].count()
+    return summary
+
+def _mean(total, count):
+    return total / count if count else np.nan
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    digest = hashlib.sha256()
+    digest.update(repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+CHALLENGE_KEYS = ["Strategy_Pair", "Challenge Number"]
+
+class ChallengeIndex:
+    # built once per frame: rows stably sorted by (strategy, challenge, phase), so every challenge and every
+    # phase inside it is a contiguous row range and per-challenge aggregates are single reduceat calls
+    def __init__(self, df: pd.DataFrame):
+        codes = []
+        uniques = []
+        missing = np.zeros(len(df), dtype=bool)
+        for col in CHALLENGE_KEYS:
+            col_codes, col_uniques = pd.factorize(df[col], sort=True)
+            codes.append(col_codes)
+            uniques.append(col_uniques)
+            missing |= col_codes < 0
+
+        phase = df["Phase"].to_numpy()
+        # rows without strategy or challenge number sort last and belong to no challenge, like groupby's dropna
+        self.order = np.lexsort((phase, codes[1], codes[0], missing))
+        self.rows = self.order[:len(df) - missing.sum()]
+
+        strategy, challenge, phase = codes[0][self.rows], codes[1][self.rows], phase[self.rows]
+        new_group = np.ones(len(self.rows), dtype=bool)
+        new_group[1:] = (strategy[1:] != strategy[:-1]) | (challenge[1:] != challenge[:-1])
+        new_phase = new_group.copy()
+        new_phase[1:] |= phase[1:] != phase[:-1]
+
+        self.group_starts = np.flatnonzero(new_group)
+        self.phase_starts = np.flatnonzero(new_phase)
+        self.phase_group = np.cumsum(new_group)[self.phase_starts] - 1
+        self.phases = phase[self.phase_starts]
+        # offsets of every challenge's first phase range in the per-phase arrays
+        self.group_phase_starts = np.searchsorted(self.phase_starts, self.group_starts)
+
+        group_strategy = uniques[0].take(strategy[self.group_starts])
+        group_challenge = uniques[1].take(challenge[self.group_starts])
+        self.keys = pd.MultiIndex.from_arrays([group_strategy, group_challenge], names=CHALLENGE_KEYS)
+        self.phase_keys = pd.MultiIndex.from_arrays(
+            [group_strategy.take(self.phase_group), group_challenge.take(self.phase_group), self.phases],
+            names=CHALLENGE_KEYS + ["Phase"],
+        )
+
+    def __len__(self):
+        return len(self.group_starts)
+
+    def group_reduce(self, ufunc, values):
+        return ufunc.reduceat(np.asarray(values)[self.rows], self.group_starts) if len(self) else np.asarray(values)[:0]
+
+    def phase_reduce(self, ufunc, values):
+        return ufunc.reduceat(np.asarray(values)[self.rows], self.phase_starts) if len(self) else np.asarray(values)[:0]
+
+    def phase_first(self, values):
+        return np.asarray(values)[self.rows[self.phase_starts]]
+
+    def per_phase(self, phase_values, phase, fill):
+        # one value per challenge from per-phase aggregates, fill where the challenge never reached the phase
+        values = np.full(len(self), fill, dtype=np.result_type(phase_values, np.asarray(fill)))
+        selected = self.phases == phase
+        values[self.phase_group[selected]] = phase_values[selected]
+        return values
+
+    def group_sum_over_phases(self, phase_values, phases):
+        # adds up per-phase aggregates of the given phases into their challenges
+        weights = np.where(np.isin(self.phases, phases), phase_values, 0)
+        return np.bincount(self.phase_group, weights=weights, minlength=len(self))
+
+    def group_max_dates(self, dates):
+        # NaT is the smallest int64, so it only wins when a challenge has no date at all
+        dates = np.asarray(dates)
+        return self.group_reduce(np.maximum, dates.view("i8")).view(dates.dtype)
+
+    def first_rows(self, mask):
+        # row positions of the first row per challenge (in phase, then file order) where mask holds
+        positions = np.flatnonzero(np.asarray(mask)[self.rows])
+        groups = np.searchsorted(self.group_starts, positions, side="right") - 1
+        _, first = np.unique(groups, return_index=True)
+        return self.rows[positions[first]]
+
+class PhaseMetricsCache:
+    # phase results keyed by the content hash of the phase frame: an in-process LRU, optionally backed by pickles on disk.
+    # entries are copied in and out, so callers never share the cached summaries' frames
+    def __init__(self, maxsize: int = 128, disk_dir=None):
+        self.maxsize = maxsize
+        self.disk_dir = Path(disk_dir) if disk_dir is not None else None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return copy.deepcopy(self._entries[key])
+
+        if self.disk_dir is None:
+            return None
+        try:
+            value = pd.read_pickle(self.disk_dir / f"{key}.pkl")
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        self._remember(key, value)
+        return copy.deepcopy(value)
+
+    def put(self, key: str, value):
+        self._remember(key, copy.deepcopy(value))
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.disk_dir / f"{key}.pkl.{os.getpid()}.{threading.get_ident()}.tmp"
+            pd.to_pickle(value, tmp_path)
+            os.replace(tmp_path, self.disk_dir / f"{key}.pkl")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.disk_dir is not None and self.disk_dir.exists():
+            for entry in self.disk_dir.glob("*.pkl"):
+                entry.unlink()
+
+    def _remember(self, key: str, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
 
 class MetricsCalculator:
-    def __init__(self, dfs):
-        self.dfs = dfs
+    # cache: an optional PhaseMetricsCache shared by calculators that may see the same frames again
+    def __init__(self, dfs, cache=None):
+        # the caller's frames are never modified; frames normalized at load time are used as they are
+        self.dfs = normalize_phase_frames(dfs)
+        self.cache = cache
+        # partial aggregates of the last calculate_metrics call, per phase (challenge/funded keep their per-challenge frames)
+        self.summaries = {}
+        self._phase_keys = {}
     
-    def calculate_metrics(self):
+    def calculate_metrics(self, phases=None):
         dispatch_types = {
-            "phase1": self._calculate_metrics_phase1_2("phase1"),
-            "phase2": self._calculate_metrics_phase1_2("phase2"),
-            "phase3": self._calculate_metrics_phase3(),
-            "challenge": self._calculate_metrics_challenge(),
-            "funded": self._calculate_metrics_funded(),
+            "phase1": lambda: self._calculate_metrics_phase1_2("phase1"),
+            "phase2": lambda: self._calculate_metrics_phase1_2("phase2"),
+            "phase3": self._calculate_metrics_phase3,
+            "challenge": self._calculate_metrics_challenge,
+            "funded": self._calculate_metrics_funded,
         }
 
-        return dispatch_types
+        phases = PHASES if phases is None else phases
+        unknown = [phase for phase in phases if phase not in dispatch_types]
+        if unknown:
+            raise ValueError(f"Unknown phases: {unknown}")
+
+        return {phase: self._cached_phase_metrics(phase, dispatch_types[phase]) for phase in phases}
+
+    def _cached_phase_metrics(self, phase: str, calculate):
+        key = self._phase_key(phase)
+        cached = self.cache.get(key) if key is not None and self.cache is not None else None
+
+        if cached is None:
+            metrics = calculate()
+            if key is not None and self.cache is not None:
+                self.cache.put(key, (metrics, self.summaries.get(phase)))
+            return metrics
+
+        metrics, self.summaries[phase] = cached
+        return dict(metrics)
+
+    def _phase_key(self, phase: str):
+        # hashed once per calculator, the frames are read-only from here on
+        if phase not in self.dfs:
+            return None
+        if phase not in self._phase_keys:
+            self._phase_keys[phase] = hashlib.sha256(
+                f"{METRICS_CACHE_VERSION}:{FAILED_CHALLENGE_COST}:{PROFIT_SPLIT}:{phase}:{frame_fingerprint(self.dfs[phase])}".encode()
+            ).hexdigest()
+        return self._phase_keys[phase]
 
     #Private methods for calculating metrics depending on phase
     def _calculate_metrics_phase1_2(self, phasename: str):
-        df = self.dfs[phasename]
         prefix = "p1" if phasename == "phase1" else "p2" if phasename == "phase2" else None
+        summary = self.summaries[phasename] = self._summarize_phase1_2(phasename)
 
-        if df.empty:
+        if summary["rows"] == 0:
             return{
                 prefix + "_number_passed_challenges": 0,
                 prefix + "_number_failed_challenges": 0,
@@ -37,22 +286,22 @@ class MetricsCalculator:
                 prefix + "_efficiency_ratio": 0,
             }
 
-        df["Duration"] = df["Duration"].astype(float)
-        outcome_series = df["Outcome"]
-        passed_group = self._calculate_consecutive_metrics(outcome_series, "Passed")
-        failed_group = self._calculate_consecutive_metrics(outcome_series, "Failed")
+        counts = summary["counts"]
+        duration_sums = summary["duration_sums"]
+        duration_counts = summary["duration_counts"]
+        streaks = summary["streaks"]
 
-        p1_number_passed_challenges = (outcome_series == "Passed").sum()
-        p1_number_failed_challenges = (outcome_series == "Failed").sum()
+        p1_number_passed_challenges = counts["Passed"]
+        p1_number_failed_challenges = counts["Failed"]
         p1_number_challenges = p1_number_failed_challenges + p1_number_passed_challenges
         p1_challenge_winrate = round((p1_number_passed_challenges / p1_number_challenges) * 100, 2) if p1_number_challenges else 0
-        p1_average_challenge_duration = round(df["Duration"].mean(), 2) if p1_number_challenges else 0
-        p1_average_challenge_passed_duration = round(df[outcome_series == "Passed"]["Duration"].mean(), 2)
-        p1_average_challenge_failed_duration = round(df[outcome_series == "Failed"]["Duration"].mean(), 2)
-        p1_max_cons_challenge_passed = passed_group.max() if not passed_group.empty else 0
-        p1_max_cons_challenge_failed = failed_group.max() if not failed_group.empty else 0
-        p1_average_cons_challenge_passed = round(passed_group.mean(), 2) if not passed_group.empty else 0
-        p1_average_cons_challenge_failed = round(failed_group.mean(), 2) if not failed_group.empty else 0
+        p1_average_challenge_duration = round(_mean(summary["duration_sum"], summary["duration_count"]), 2) if p1_number_challenges else 0
+        p1_average_challenge_passed_duration = round(_mean(duration_sums["Passed"], duration_counts["Passed"]), 2)
+        p1_average_challenge_failed_duration = round(_mean(duration_sums["Failed"], duration_counts["Failed"]), 2)
+        p1_max_cons_challenge_passed = streaks.loc["Passed", "max"]
+        p1_max_cons_challenge_failed = streaks.loc["Failed", "max"]
+        p1_average_cons_challenge_passed = round(streaks.loc["Passed", "mean"], 2)
+        p1_average_cons_challenge_failed = round(streaks.loc["Failed", "mean"], 2)
         p1_efficiency_ratio = round(
             (p1_challenge_winrate / p1_average_challenge_duration) if p1_average_challenge_duration else 0,
             2
@@ -74,11 +323,22 @@ class MetricsCalculator:
         }
 
         return metrics_dict
+
+    def _summarize_phase1_2(self, phasename: str):
+        df = self.dfs[phasename]
+
+        if df.empty:
+            return {"rows": 0}
+
+        summary = summarize_outcome_rows(df["Outcome"], df["Duration"], ["Passed", "Failed"])
+        summary["streaks"] = streak_stats(df["Outcome"].to_numpy(), ["Passed", "Failed"])
+        return summary
         
     def _calculate_metrics_phase3(self):
-        df = self.dfs["phase3"]
+        summary = self.summaries["phase3"] = self._summarize_phase3()
+        cost_per_challenge = FAILED_CHALLENGE_COST
         
-        if df.empty:
+        if summary["rows"] == 0:
             return{
                 "p3_number_payouts": 0,
                 "p3_number_failed_challenges": 0,
@@ -98,35 +358,24 @@ class MetricsCalculator:
                 "p3_profitability_ratio": 0,
             }
 
-        df["Duration"] = df["Duration"].astype(float)
-        df["Start Balance"] = df["Start Balance"].astype(float)
-        df["Ending Balance"] = df["Ending Balance"].astype(float)
-        outcome_series = df["Outcome"] 
-        passed_group = self._calculate_consecutive_metrics(outcome_series, "Payout")
-        failed_group = self._calculate_consecutive_metrics(outcome_series, "Failed")
-        payout_rows = df[df["Outcome"] == "Payout"].copy()
-        payout_rows["Payout Amount"] = payout_rows["Ending Balance"] - payout_rows["Start Balance"]
-        cost_per_challenge = 80
-
-        df["PnL"] = np.where(
-            df["Outcome"] == "Payout",
-            df["Ending Balance"] - df["Start Balance"],
-            np.where(df["Outcome"] == "Failed", -cost_per_challenge, 0)
-        )
+        counts = summary["counts"]
+        duration_sums = summary["duration_sums"]
+        duration_counts = summary["duration_counts"]
+        streaks = summary["streaks"]
 
-        p3_number_payouts = (outcome_series == "Payout").sum()
-        p3_number_failed_challenges = (outcome_series == "Failed").sum()
+        p3_number_payouts = counts["Payout"]
+        p3_number_failed_challenges = counts["Failed"]
         p3_number_challenges = p3_number_failed_challenges + p3_number_payouts
         p3_payout_winrate = round((p3_number_payouts / p3_number_challenges) * 100, 2) if p3_number_challenges else 0
-        p3_average_challenge_duration = round(df["Duration"].mean(), 2) if p3_number_challenges else 0
-        p3_average_challenge_passed_duration = round(df[outcome_series == "Payout"]["Duration"].mean(), 2) if p3_number_payouts else 0
-        p3_average_challenge_failed_duration = round(df[outcome_series == "Failed"]["Duration"].mean(), 2) if p3_number_failed_challenges else 0
-        p3_max_cons_payouts = passed_group.max() if not passed_group.empty else 0
-        p3_max_cons_failed = failed_group.max() if not failed_group.empty else 0
-        p3_average_max_cons_payouts = round(passed_group.mean(), 2) if not passed_group.empty else 0
-        p3_average_max_cons_failed = round(failed_group.mean(), 2) if not failed_group.empty else 0
-        p3_average_profit_payout = round(payout_rows["Payout Amount"].mean(), 2) if not payout_rows.empty else 0
-        p3_total_profit_payouts = round(payout_rows["Payout Amount"].sum(), 2) if not payout_rows.empty else 0
+        p3_average_challenge_duration = round(_mean(summary["duration_sum"], summary["duration_count"]), 2) if p3_number_challenges else 0
+        p3_average_challenge_passed_duration = round(_mean(duration_sums["Payout"], duration_counts["Payout"]), 2) if p3_number_payouts else 0
+        p3_average_challenge_failed_duration = round(_mean(duration_sums["Failed"], duration_counts["Failed"]), 2) if p3_number_failed_challenges else 0
+        p3_max_cons_payouts = streaks.loc["Payout", "max"]
+        p3_max_cons_failed = streaks.loc["Failed", "max"]
+        p3_average_max_cons_payouts = round(streaks.loc["Payout", "mean"], 2)
+        p3_average_max_cons_failed = round(streaks.loc["Failed", "mean"], 2)
+        p3_average_profit_payout = round(_mean(summary["payout_amount_sum"], summary["payout_amount_count"]), 2) if p3_number_payouts else 0
+        p3_total_profit_payouts = round(summary["payout_amount_sum"], 2) if p3_number_payouts else 0
         p3_total_loss_payouts = p3_number_failed_challenges * cost_per_challenge
         p3_profit_factor = round(p3_total_profit_payouts / p3_total_loss_payouts, 2) if p3_total_loss_payouts != 0 else float('inf')
         p3_profitability_ratio = round(((p3_payout_winrate / 100 * p3_average_profit_payout) / cost_per_challenge) * 10, 2)
@@ -151,11 +400,28 @@ class MetricsCalculator:
         }
 
         return metrics_dict
+
+    def _summarize_phase3(self):
+        df = self.dfs["phase3"]
+
+        if df.empty:
+            return {"rows": 0}
+
+        summary = self._summarize_phase3_rows(df)
+        summary["streaks"] = streak_stats(df["Outcome"].to_numpy(), ["Payout", "Failed"])
+        return summary
+
+    def _summarize_phase3_rows(self, df):
+        summary = summarize_outcome_rows(df["Outcome"], df["Duration"], ["Payout", "Failed"])
+        payout_amounts = (df["Ending Balance"] - df["Start Balance"])[df["Outcome"] == "Payout"]
+        summary["payout_amount_sum"] = payout_amounts.sum()
+        summary["payout_amount_count"] = payout_amounts.count()
+        return summary
     
     def _calculate_metrics_challenge(self):
-        df = self.dfs["challenge"].reset_index(drop = False).rename(columns={"index": "_row_index"})
+        summary = self.summaries["challenge"] = self._summarize_challenge()
 
-        if df.empty:
+        if summary["rows"] == 0:
             return{
                 "c_number_challenges": 0,
                 "c_number_passed_challenges": 0,
@@ -173,52 +439,12 @@ class MetricsCalculator:
                 "c_efficiency_ratio": 0
             }
 
-        df["Outcome"] = df["Outcome"].astype(str).str.strip()
-        df["Phase"] = pd.to_numeric(df["Phase"], errors = "coerce").fillna(0).astype(int)
-        df["Duration"] = pd.to_numeric(df["Duration"], errors = "coerce").fillna(0)
-
-        #Group all phases by challenge and by strategies
-        if "Strategy_Pair" not in df.columns:
-            df["Strategy_Pair"] = "Single_Run"
-
-        challenge_records = []
-        for strategy, strategy_df in df.groupby("Strategy_Pair"):
-            for challenge_num, group in strategy_df.groupby("Challenge Number"):
-                p1 = group[group["Phase"] == 1]
-                p2 = group[group["Phase"] == 2]
-                total_duration = group["Duration"].sum()
-
-                if not p2.empty:
-                    completion_row = p2["_row_index"].min()
-                else:
-                    completion_row = p1["_row_index"].min() if not p1.empty else group["_row_index"].min()
-
-                if not p1.empty and not p2.empty and p1["Outcome"].iloc[0] == "Passed" and p2["Outcome"].iloc[0] == "Passed":
-                    outcome = "Passed"
-                else:
-                    outcome = "Failed"
-                
-                challenge_records.append({
-                    "Strategy_Pair": strategy,
-                    "Challenge Number": challenge_num,
-                    "Outcome": outcome,
-                    "Duration": total_duration,
-                    "completion_row": completion_row
-                })
-
-        # sort by actual completion order
-        challenge_df = pd.DataFrame(challenge_records).sort_values("completion_row").reset_index(drop=True)
-
-        failed_challenges = df[df["Outcome"] == "Failed"]
-        failed_p1_count = failed_challenges[failed_challenges["Phase"] == 1]["Challenge Number"].nunique()
-        failed_p2_count = failed_challenges[failed_challenges["Phase"] == 2]["Challenge Number"].nunique()
+        challenge_df = summary["challenge_df"]
+        failed_p1_count = summary["failed_p1_count"]
+        failed_p2_count = summary["failed_p2_count"]
         
         # consecutive streaks based on chronological completion
-        series = challenge_df["Outcome"]
-        groups = (series != series.shift()).cumsum()
-        streaks = series.groupby(groups).agg(["first", "size"])
-        win_streaks = streaks[streaks["first"] == "Passed"]["size"]
-        loss_streaks = streaks[streaks["first"] == "Failed"]["size"]
+        streaks = streak_stats(challenge_df["Outcome"].to_numpy(), ["Passed", "Failed"])
 
         # metrics
         c_number_challenges = len(challenge_df)
@@ -228,10 +454,10 @@ class MetricsCalculator:
         c_average_challenge_duration = round(challenge_df["Duration"].mean(), 2) if c_number_challenges else 0
         c_average_challenge_passed_duration = round(challenge_df[challenge_df["Outcome"] == "Passed"]["Duration"].mean(), 2) if c_number_passed_challenges else 0
         c_average_challenge_failed_duration = round(challenge_df[challenge_df["Outcome"] == "Failed"]["Duration"].mean(), 2) if c_number_failed_challenges else 0
-        c_max_cons_challenge_passed = int(win_streaks.max()) if not win_streaks.empty else 0
-        c_max_cons_challenge_failed = int(loss_streaks.max()) if not loss_streaks.empty else 0
-        c_average_cons_challenge_passed = round(win_streaks.mean(), 2) if not win_streaks.empty else 0
-        c_average_cons_challenge_failed = round(loss_streaks.mean(), 2) if not loss_streaks.empty else 0
+        c_max_cons_challenge_passed = int(streaks.loc["Passed", "max"])
+        c_max_cons_challenge_failed = int(streaks.loc["Failed", "max"])
+        c_average_cons_challenge_passed = round(streaks.loc["Passed", "mean"], 2)
+        c_average_cons_challenge_failed = round(streaks.loc["Failed", "mean"], 2)
         c_failed_p1_percentage = round((failed_p1_count / c_number_failed_challenges) * 100, 2) if c_number_failed_challenges else 0
         c_failed_p2_percentage = round((failed_p2_count / c_number_failed_challenges) * 100, 2) if c_number_failed_challenges else 0
         c_efficiency_ratio = round(c_challenge_winrate / c_average_challenge_duration, 2)
@@ -255,16 +481,85 @@ class MetricsCalculator:
 
         return metrics_dict
 
-    def _calculate_metrics_funded(self):
-        import pandas as pd
-        import numpy as np
+    def _summarize_challenge(self):
+        df = self.dfs["challenge"]
 
-        df = self.dfs["funded"]
+        if df.empty:
+            return {"rows": 0}
 
-        if "Strategy_Pair" not in df.columns:
-            df["Strategy_Pair"] = "Single_Run"
+        df = self._challenge_rows(df)
+        failed_numbers = self._failed_challenge_numbers(df)
 
-        if df.empty:
+        return {
+            "rows": len(df),
+            "challenge_df": self._build_challenge_frame(df),
+            "failed_p1_count": len(failed_numbers[1]),
+            "failed_p2_count": len(failed_numbers[2]),
+        }
+
+    def _challenge_rows(self, df):
+        # a view with the row labels as a column, so first rows stay comparable across (streamed) chunks
+        return _with_strategy_pair(df).assign(_row_index=df.index)
+
+    def _failed_challenge_numbers(self, df):
+        failed_challenges = df[df["Outcome"] == "Failed"]
+        return {
+            phase: set(failed_challenges.loc[failed_challenges["Phase"] == phase, "Challenge Number"].dropna())
+            for phase in [1, 2]
+        }
+
+    def _build_challenge_frame(self, df, index=None):
+        index = ChallengeIndex(df) if index is None else index
+        first_outcome = index.phase_first(df["Outcome"])
+        first_row = index.phase_reduce(np.minimum, df["_row_index"])
+        duration = index.phase_reduce(np.add, df["Duration"])
+
+        passed = (index.per_phase(first_outcome, 1, None) == "Passed") & (index.per_phase(first_outcome, 2, None) == "Passed")
+        completion_row = np.minimum.reduceat(first_row, index.group_phase_starts) if len(index) else first_row
+        for phase in [1, 2]:
+            reached = index.per_phase(np.ones(len(first_row), dtype=bool), phase, False)
+            completion_row = np.where(reached, index.per_phase(first_row, phase, 0), completion_row)
+
+        challenge_df = pd.DataFrame({
+            "Outcome": np.where(passed, "Passed", "Failed"),
+            "Duration": np.add.reduceat(duration, index.group_phase_starts) if len(index) else duration,
+            "completion_row": completion_row,
+        }, index=index.keys).reset_index()
+
+        # sort by actual completion order
+        return challenge_df.sort_values("completion_row").reset_index(drop=True)
+
+    def _challenge_phase_table(self, df, index=None):
+        # first outcome, first row and total duration of every (strategy, challenge, phase)
+        index = ChallengeIndex(df) if index is None else index
+        return pd.DataFrame({
+            "first_outcome": index.phase_first(df["Outcome"]),
+            "first_row": index.phase_reduce(np.minimum, df["_row_index"]),
+            "duration": index.phase_reduce(np.add, df["Duration"]),
+        }, index=index.phase_keys)
+
+    def _challenge_frame_from_table(self, phase_table):
+        per_phase = phase_table.unstack("Phase")
+        first_outcome = per_phase["first_outcome"].reindex(columns=[1, 2])
+        first_row = per_phase["first_row"]
+        phase_rows = first_row.reindex(columns=[1, 2])
+
+        passed = (first_outcome[1] == "Passed") & (first_outcome[2] == "Passed")
+        completion_row = phase_rows[2].fillna(phase_rows[1]).fillna(first_row.min(axis=1))
+
+        challenge_df = pd.DataFrame({
+            "Outcome": np.where(passed, "Passed", "Failed"),
+            "Duration": per_phase["duration"].sum(axis=1).astype(phase_table["duration"].dtype),
+            "completion_row": completion_row.astype(phase_table["first_row"].dtype),
+        }, index=per_phase.index).reset_index()
+
+        # sort by actual completion order
+        return challenge_df.sort_values("completion_row").reset_index(drop=True)
+
+    def _calculate_metrics_funded(self):
+        summary = self.summaries["funded"] = self._summarize_funded()
+
+        if summary["rows"] == 0:
             return {
                 "f_number_challenges": 0,
                 "f_number_passed_challenges": 0,
@@ -294,132 +589,39 @@ class MetricsCalculator:
                 "m_monthly_stability_return_ratio": 0
             }
 
-        # Clean data
-        df["Outcome"] = df["Outcome"].astype(str).str.strip()
-        df["Phase"] = pd.to_numeric(df["Phase"], errors="coerce").fillna(0).astype(int)
-        df["Duration"] = pd.to_numeric(df["Duration"], errors="coerce").fillna(0)
-        df["Start Balance"] = pd.to_numeric(df["Start Balance"], errors="coerce").fillna(0)
-        df["Ending Balance"] = pd.to_numeric(df["Ending Balance"], errors="coerce").fillna(0)
-        df["End Phase Date"] = pd.to_datetime(df["End Phase Date"], errors="coerce")
-
-        # Group by strategy and challenge
-        challenge_groups = df.groupby(["Strategy_Pair", "Challenge Number"])
-        f_number_challenges = challenge_groups.ngroups
-        f_number_passed_challenges = total_payouts = f_number_failed_challenges = 0
-        challenge_durations = []
-        passed_durations = []
-        failed_durations = []
-        payout_profits = []
-        challenge_records = []
-
-        # Process each challenge
-        for (strategy, challenge_num), group in challenge_groups:
-            group = group.sort_values("Phase")
-            p1 = group[group["Phase"] == 1]
-            p2 = group[group["Phase"] == 2]
-            payouts = group[group["Outcome"] == "Payout"]
-
-            base_duration = p1["Duration"].sum() + p2["Duration"].sum()
-
-            # Determine resolution date properly
-            if not payouts.empty:
-                first_payout = payouts.iloc[0]
-                total_duration = base_duration + first_payout["Duration"]
-                outcome = "Passed"
-                f_number_passed_challenges += 1
-                total_payouts += len(payouts)
-                passed_durations.append(total_duration)
-                payout_profits.extend((payouts["Ending Balance"] - payouts["Start Balance"]).tolist())
-                resolution_date = first_payout["End Phase Date"]
-            else:
-                total_duration = group["Duration"].sum()
-                outcome = "Failed"
-                f_number_failed_challenges += 1
-                failed_durations.append(total_duration)
-                resolution_date = group["End Phase Date"].max()
-
-            challenge_durations.append(total_duration)
-            challenge_records.append({
-                "Strategy_Pair": strategy,
-                "Challenge Number": challenge_num,
-                "Outcome": outcome,
-                "Duration": total_duration,
-                "Resolution_Date": resolution_date
-            })
-
-        # Create challenge dataframe for chronological streaks
-        challenge_df = pd.DataFrame(challenge_records)
-        challenge_df = challenge_df.sort_values("Resolution_Date").reset_index(drop=True)
+        challenge_df = summary["challenge_df"]
+        f_number_challenges = len(challenge_df)
+        passed_mask = challenge_df["Outcome"] == "Passed"
+        f_number_passed_challenges = int(passed_mask.sum())
+        f_number_failed_challenges = f_number_challenges - f_number_passed_challenges
+        total_payouts = int(challenge_df["Payouts"].sum())
 
         # Win/Loss streaks across all strategies chronologically
-        max_passed = max_failed = 0
-        current_passed = current_failed = 0
-        for outcome in challenge_df["Outcome"]:
-            if outcome == "Passed":
-                current_passed += 1
-                current_failed = 0
-            else:
-                current_failed += 1
-                current_passed = 0
-            max_passed = max(max_passed, current_passed)
-            max_failed = max(max_failed, current_failed)
-
-        f_max_cons_challenge_passed = max_passed
-        f_max_cons_challenge_failed = max_failed
-
-        # Average consecutive passed/failed
-        # Recalculate properly
-        streaks = []
-        current = 0
-        last_outcome = None
-        for outcome in challenge_df["Outcome"]:
-            if outcome == last_outcome:
-                current += 1
-            else:
-                if last_outcome is not None:
-                    streaks.append((last_outcome, current))
-                current = 1
-                last_outcome = outcome
-        if last_outcome is not None:
-            streaks.append((last_outcome, current))
-        win_streaks = [s for o, s in streaks if o == "Passed"]
-        loss_streaks = [s for o, s in streaks if o == "Failed"]
-        f_average_cons_challenge_passed = round(np.mean(win_streaks), 2) if win_streaks else 0
-        f_average_cons_challenge_failed = round(np.mean(loss_streaks), 2) if loss_streaks else 0
+        streaks = streak_stats(challenge_df["Outcome"].to_numpy(), ["Passed", "Failed"])
+        f_max_cons_challenge_passed = int(streaks.loc["Passed", "max"])
+        f_max_cons_challenge_failed = int(streaks.loc["Failed", "max"])
+        f_average_cons_challenge_passed = round(streaks.loc["Passed", "mean"], 2)
+        f_average_cons_challenge_failed = round(streaks.loc["Failed", "mean"], 2)
 
         # Challenge-level metrics
         f_challenge_winrate = round((f_number_passed_challenges / f_number_challenges) * 100, 2) if f_number_challenges else 0
         f_payout_winrate = round((total_payouts / (total_payouts + f_number_failed_challenges)) * 100, 2) if (total_payouts + f_number_failed_challenges) else 0
-        f_average_challenge_duration = round(sum(challenge_durations) / len(challenge_durations), 2) if challenge_durations else 0
-        f_average_challenge_passed_duration = round(sum(passed_durations) / len(passed_durations), 2) if passed_durations else 0
-        f_average_challenge_failed_duration = round(sum(failed_durations) / len(failed_durations), 2) if failed_durations else 0
+        f_average_challenge_duration = round(challenge_df["Duration"].mean(), 2) if f_number_challenges else 0
+        f_average_challenge_passed_duration = round(challenge_df.loc[passed_mask, "Duration"].mean(), 2) if f_number_passed_challenges else 0
+        f_average_challenge_failed_duration = round(challenge_df.loc[~passed_mask, "Duration"].mean(), 2) if f_number_failed_challenges else 0
 
         # Payout streaks
-        df_sorted = df.sort_values(["Strategy_Pair", "Challenge Number", "Phase"])
-        all_payout_series = (df_sorted["Outcome"] == "Payout").astype(int)
-        streak_groups = (all_payout_series != all_payout_series.shift()).cumsum()
-        streaks = all_payout_series.groupby(streak_groups).sum()
-        all_challenge_payout_streaks = streaks[streaks > 0].tolist()
-        f_max_cons_payouts = max(all_challenge_payout_streaks) if all_challenge_payout_streaks else 0
-        f_average_payouts_challenge = round(sum(all_challenge_payout_streaks) / len(all_challenge_payout_streaks), 2) if all_challenge_payout_streaks else 0
+        payout_streaks = summary["payout_streaks"].loc["Payout"]
+        f_max_cons_payouts = int(payout_streaks["max"])
+        # python floats, as in the baseline: builtin round() and numpy rounding differ at near-ties
+        f_average_payouts_challenge = round(float(payout_streaks["mean"]), 2)
 
         # Profit metrics
-        f_average_profit_payout = round(sum(payout_profits) / len(payout_profits), 2) if payout_profits else 0
-        total_challenge_profits = []
-        for _, group in df.groupby(["Strategy_Pair", "Challenge Number"]):
-            payouts = group[group["Outcome"] == "Payout"]
-            total_profit = (payouts["Ending Balance"] - payouts["Start Balance"]).sum() if not payouts.empty else -80
-            total_challenge_profits.append(total_profit)
-        f_average_profit_challenge = round(sum(total_challenge_profits) / len(total_challenge_profits), 2) if total_challenge_profits else 0
+        f_average_profit_payout = round(float(_mean(summary["payout_profit_sum"], summary["payout_profit_count"])), 2) if summary["payout_profit_count"] else 0
+        f_average_profit_challenge = round(challenge_df["Profit"].mean(), 2) if f_number_challenges else 0
 
         # Monthly metrics
-        df["PnL"] = np.where(
-            df["Outcome"] == "Payout",
-            df["Ending Balance"] - df["Start Balance"],
-            np.where(df["Outcome"] == "Failed", -80, 0)
-        )
-        df["Month"] = df["End Phase Date"].dt.to_period("M").astype(str)
-        m_average_monthly_pnl = df.groupby("Month")["PnL"].sum()
+        m_average_monthly_pnl = summary["monthly_pnl"]
         m_winning_months = int((m_average_monthly_pnl > 0).sum())
         m_losing_months = int((m_average_monthly_pnl < 0).sum())
         m_monthly_winrate = round((m_winning_months / (m_winning_months + m_losing_months)) * 100, 2) if (m_winning_months + m_losing_months) else 0
@@ -428,7 +630,7 @@ class MetricsCalculator:
         m_monthly_wl_ratio = round(m_winning_months / m_losing_months, 2) if m_losing_months > 0 else float('inf')
 
         # Ratios
-        f_profitability_ratio = round(((f_payout_winrate / 100) * f_average_payouts_challenge * f_average_profit_payout) / 80, 2)
+        f_profitability_ratio = round(((f_payout_winrate / 100) * f_average_payouts_challenge * f_average_profit_payout) / FAILED_CHALLENGE_COST, 2)
         m_monthly_stability_return_ratio = round(((m_monthly_winrate / 100) * m_average_monthly_profit) / abs(m_average_monthly_loss), 2) if m_average_monthly_loss != 0 else 0
         f_challenge_efficiency_ratio = round(f_average_profit_challenge / f_number_failed_challenges, 2) if f_number_failed_challenges != 0 else 0
         m_overall_risk_adjusted_returns = round(f_challenge_efficiency_ratio * m_monthly_stability_return_ratio, 2)
@@ -463,8 +665,73 @@ class MetricsCalculator:
 
         return metrics_dict
     
-    def _calculate_consecutive_metrics(self, series, outcome):
-        mask = series == outcome
-        streaks = mask.groupby((mask != mask.shift()).cumsum()).sum()
-        streaks = streaks[streaks > 0]
-        return streaks
\ No newline at end of file
+    def _summarize_funded(self):
+        df = self.dfs["funded"]
+
+        if df.empty:
+            return {"rows": 0}
+
+        df = _with_strategy_pair(df)
+
+        # Per-challenge resolution from one index over the frame
+        index = ChallengeIndex(df)
+        challenge_df = self._build_funded_challenge_frame(df, index)
+        challenge_df = challenge_df.sort_values("Resolution_Date").reset_index(drop=True)
+
+        # summed one challenge after the other with python floats, the order the baseline added them up in
+        rows = index.rows[(df["Outcome"] == "Payout").to_numpy()[index.rows]]
+        payout_profits = (df["Ending Balance"].to_numpy() - df["Start Balance"].to_numpy())[rows].tolist()
+
+        return {
+            "rows": len(df),
+            "challenge_df": challenge_df,
+            "payout_streaks": streak_stats(df["Outcome"].to_numpy()[index.order], ["Payout"]),
+            "payout_profit_sum": sum(payout_profits),
+            "payout_profit_count": len(payout_profits),
+            "monthly_pnl": monthly_pnl(df),
+        }
+
+    def _build_funded_challenge_frame(self, df, index=None):
+        return self._funded_frame_from_table(*self._funded_challenge_table(df, index))
+
+    def _funded_challenge_table(self, df, index=None):
+        index = ChallengeIndex(df) if index is None else index
+        is_payout = (df["Outcome"] == "Payout").to_numpy()
+        duration = df["Duration"].to_numpy()
+        profit = np.where(is_payout, df["Ending Balance"].to_numpy() - df["Start Balance"].to_numpy(), 0)
+
+        challenge_table = pd.DataFrame({
+            "Duration": index.group_reduce(np.add, duration),
+            "Base_Duration": index.group_sum_over_phases(index.phase_reduce(np.add, duration), [1, 2]),
+            "Payouts": index.group_reduce(np.add, is_payout.astype(int)),
+            "Profit": index.group_reduce(np.add, profit),
+            "Last_Date": index.group_max_dates(df["End Phase Date"]),
+        }, index=index.keys)
+
+        # the first payout (by phase, then file order) resolves a passed challenge
+        first_payouts = df.iloc[index.first_rows(is_payout)][CHALLENGE_KEYS + ["Phase", "Duration", "End Phase Date"]]
+        return challenge_table, first_payouts
+
+    def _first_payouts(self, payout_rows):
+        # the first payout (by phase, then file order) resolves a passed challenge
+        return payout_rows.sort_values("Phase", kind="stable").drop_duplicates(["Strategy_Pair", "Challenge Number"])
+
+    def _funded_frame_from_table(self, challenge_table, first_payouts):
+        challenge_df = challenge_table.copy()
+        first_payouts = first_payouts.set_index(["Strategy_Pair", "Challenge Number"]).reindex(challenge_df.index)
+
+        passed = challenge_df["Payouts"] > 0
+        challenge_df["Outcome"] = np.where(passed, "Passed", "Failed")
+        challenge_df["Duration"] = challenge_df["Duration"].where(~passed, challenge_df["Base_Duration"] + first_payouts["Duration"])
+        challenge_df["Resolution_Date"] = challenge_df["Last_Date"].where(~passed, first_payouts["End Phase Date"])
+        challenge_df["Profit"] = challenge_df["Profit"].where(passed, -FAILED_CHALLENGE_COST)
+
+        return challenge_df[["Outcome", "Duration", "Resolution_Date", "Payouts", "Profit"]].reset_index()
+
+def _with_strategy_pair(df: pd.DataFrame) -> pd.DataFrame:
+    # single runs group all phases under one strategy
+    return df if "Strategy_Pair" in df.columns else df.assign(Strategy_Pair="Single_Run")
+
+def monthly_pnl(funded: pd.DataFrame) -> pd.Series:
+    month = funded["End Phase Date"].dt.to_period("M").astype(str)
+    return funded["PnL"].groupby(month.rename("Month")).sum()
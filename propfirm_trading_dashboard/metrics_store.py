@@ -0,0 +1,249 @@
+import hashlib
+import math
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, List
+import numpy as np
+import pandas as pd
+from propfirm_trading_dashboard.csv_cache import CACHE_ROOT
+from propfirm_trading_dashboard.csv_parser import load_csv_file, validate_frame
+from propfirm_trading_dashboard.incremental_join import folder_fingerprint, folder_monthly_pnl
+from propfirm_trading_dashboard.metrics import MetricsCalculator
+from propfirm_trading_dashboard.multi_strategy_loader import scan_strategy_folders
+from propfirm_trading_dashboard.phase_frames import normalize_phase_frame
+
+STORE_PATH = CACHE_ROOT / "metrics.sqlite"
+COMPARISONS = {"<", "<=", ">", ">=", "=", "!="}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    folder TEXT NOT NULL UNIQUE,
+    strategy TEXT NOT NULL,
+    pair TEXT NOT NULL,
+    run TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    stat_signature TEXT NOT NULL,
+    computed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_strategy ON runs (strategy, pair, run);
+
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    phase TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value NUMERIC,
+    PRIMARY KEY (run_id, name)
+);
+CREATE INDEX IF NOT EXISTS metrics_name_value ON metrics (name, value);
+
+CREATE TABLE IF NOT EXISTS challenges (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    strategy_pair TEXT,
+    challenge_number INTEGER,
+    outcome TEXT,
+    duration REAL,
+    resolution_date TEXT,
+    payouts INTEGER,
+    profit REAL
+);
+CREATE INDEX IF NOT EXISTS challenges_run ON challenges (run_id, kind);
+
+CREATE TABLE IF NOT EXISTS monthly_pnl (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    pnl REAL NOT NULL,
+    PRIMARY KEY (run_id, year, month)
+);
+"""
+
+def content_fingerprint(phase_files: Dict[str, str]) -> str:
+    digest = hashlib.sha256()
+    for phase in sorted(phase_files):
+        digest.update(phase.encode())
+        digest.update(Path(phase_files[phase]).read_bytes())
+    return digest.hexdigest()
+
+def split_folder_name(folder: str):
+    strategy_pair, run_id = folder.rsplit("_", 1)
+    strategy, pair = strategy_pair.rsplit("_", 1)
+    return strategy, pair, run_id
+
+class MetricsStore:
+    # metrics, per-challenge records and monthly PnL of every strategy folder, recomputed only when its csv content changes
+    def __init__(self, db_path=STORE_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.db_path)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def sync(self, base_path: str, phase_list: List[str], folders: List[str] = None, typed: bool = False, cache=None, computed: dict = None) -> List[str]:
+        # computed: folder -> folder_record of metrics a batch already calculated, written instead of recomputing them
+        manifest = scan_strategy_folders(base_path)
+        recomputed = []
+        for folder in folders if folders is not None else sorted(manifest):
+            if folder not in manifest:
+                raise ValueError(f"No strategy folder {folder!r} in {base_path}")
+            if self.update_folder(folder, manifest[folder], phase_list, typed, cache, (computed or {}).get(folder)):
+                recomputed.append(folder)
+        return recomputed
+
+    def update_folder(self, folder: str, phase_files: Dict[str, str], phase_list: List[str], typed: bool = False, cache=None, computed: dict = None) -> bool:
+        missing = [phase for phase in phase_list if phase not in phase_files]
+        if missing:
+            raise ValueError(f"Strategy folder {folder!r} has no csv file for phases {missing}")
+        phase_files = {phase: path for phase, path in phase_files.items() if phase in phase_list}
+        stat_signature = folder_fingerprint(phase_files)
+        known = self.connection.execute("SELECT id, fingerprint, stat_signature FROM runs WHERE folder = ?", (folder,)).fetchone()
+
+        # unchanged size/mtime skips hashing; a touched but identical folder only refreshes its signature
+        if known and known[2] == stat_signature:
+            return False
+        fingerprint = content_fingerprint(phase_files)
+        if known and known[1] == fingerprint:
+            with self.connection:
+                self.connection.execute("UPDATE runs SET stat_signature = ? WHERE id = ?", (stat_signature, known[0]))
+            return False
+
+        # a record computed from files that have changed since is not used
+        if computed is None or computed["stat_signature"] != stat_signature:
+            dfs = {}
+            for phase, path in phase_files.items():
+                df = load_csv_file(path, typed=typed, cache=cache)
+                if not typed:
+                    validate_frame(df, path)
+                dfs[phase] = normalize_phase_frame(df, phase)
+
+            calculator = MetricsCalculator(dfs)
+            computed = folder_record(calculator.calculate_metrics(phase_list), calculator.summaries, dfs, stat_signature)
+
+        self._write_folder(folder, fingerprint, stat_signature, computed["metrics"], computed["challenges"], computed["monthly_pnl"])
+        return True
+
+    def _write_folder(self, folder, fingerprint, stat_signature, metrics, challenges, monthly_pnl):
+        strategy, pair, run_id = split_folder_name(folder)
+
+        with self.connection:
+            self.connection.execute("DELETE FROM runs WHERE folder = ?", (folder,))
+            row_id = self.connection.execute(
+                "INSERT INTO runs (folder, strategy, pair, run, fingerprint, stat_signature, computed_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (folder, strategy, pair, run_id, fingerprint, stat_signature, time.time()),
+            ).lastrowid
+
+            self.connection.executemany(
+                "INSERT INTO metrics (run_id, phase, name, value) VALUES (?, ?, ?, ?)",
+                [(row_id, phase, name, _to_sql_value(value)) for phase, phase_metrics in metrics.items() for name, value in phase_metrics.items()],
+            )
+
+            for kind in ["challenge", "funded"]:
+                challenge_df = challenges.get(kind)
+                if challenge_df is not None:
+                    self.connection.executemany(
+                        "INSERT INTO challenges (run_id, kind, strategy_pair, challenge_number, outcome, duration, resolution_date, payouts, profit) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        _challenge_rows(row_id, kind, challenge_df),
+                    )
+
+            self.connection.executemany(
+                "INSERT INTO monthly_pnl (run_id, year, month, pnl) VALUES (?, ?, ?, ?)",
+                [(row_id, int(year), int(month), float(pnl)) for year, month, pnl in monthly_pnl[["Year", "Month", "PnL"]].itertuples(index=False)],
+            )
+
+    def metrics(self, folder: str) -> dict:
+        rows = self.connection.execute(
+            "SELECT m.phase, m.name, m.value FROM metrics m JOIN runs r ON r.id = m.run_id WHERE r.folder = ? ORDER BY m.rowid",
+            (folder,),
+        )
+        metrics = {}
+        for phase, name, value in rows:
+            metrics.setdefault(phase, {})[name] = value
+        return metrics
+
+    def challenges(self, folder: str, kind: str = "challenge") -> pd.DataFrame:
+        return pd.read_sql_query(
+            "SELECT c.strategy_pair, c.challenge_number, c.outcome, c.duration, c.resolution_date, c.payouts, c.profit "
+            "FROM challenges c JOIN runs r ON r.id = c.run_id WHERE r.folder = ? AND c.kind = ? ORDER BY c.rowid",
+            self.connection,
+            params=(folder, kind),
+        )
+
+    def monthly_pnl(self, folder: str) -> pd.DataFrame:
+        return pd.read_sql_query(
+            "SELECT p.year AS Year, p.month AS Month, p.pnl AS PnL FROM monthly_pnl p JOIN runs r ON r.id = p.run_id "
+            "WHERE r.folder = ? ORDER BY p.year, p.month",
+            self.connection,
+            params=(folder,),
+        )
+
+    def rank(self, metric: str, limit: int = None, ascending: bool = False, where: list = None, strategy: str = None, pair: str = None) -> pd.DataFrame:
+        # where: (metric, comparison, value) filters that every returned folder must satisfy
+        query = [
+            "SELECT r.folder, r.strategy, r.pair, r.run, m.value AS value FROM runs r",
+            "JOIN metrics m ON m.run_id = r.id AND m.name = ?",
+        ]
+        params = [metric]
+
+        for i, (name, comparison, value) in enumerate(where or []):
+            if comparison not in COMPARISONS:
+                raise ValueError(f"Unsupported comparison {comparison!r}, expected one of {sorted(COMPARISONS)}")
+            query.append(f"JOIN metrics f{i} ON f{i}.run_id = r.id AND f{i}.name = ? AND f{i}.value {comparison} ?")
+            params += [name, value]
+
+        conditions = []
+        if strategy is not None:
+            conditions.append("r.strategy = ?")
+            params.append(strategy)
+        if pair is not None:
+            conditions.append("r.pair = ?")
+            params.append(pair)
+        if conditions:
+            query.append("WHERE " + " AND ".join(conditions))
+
+        query.append(f"ORDER BY m.value IS NULL, m.value {'ASC' if ascending else 'DESC'}, r.folder")
+        if limit is not None:
+            query.append("LIMIT ?")
+            params.append(int(limit))
+
+        return pd.read_sql_query(" ".join(query), self.connection, params=params)
+
+def folder_record(metrics: dict, summaries: dict, dfs: dict, stat_signature: str) -> dict:
+    # what the store keeps of one folder's calculation: small enough to send back from a batch worker process
+    return {
+        "stat_signature": stat_signature,
+        "metrics": metrics,
+        "challenges": {kind: summaries[kind]["challenge_df"] for kind in ["challenge", "funded"] if "challenge_df" in summaries.get(kind, {})},
+        "monthly_pnl": folder_monthly_pnl(dfs.get("funded")),
+    }
+
+def _to_sql_value(value):
+    value = float(value)
+    return None if math.isnan(value) else value
+
+def _challenge_rows(row_id: int, kind: str, challenge_df: pd.DataFrame) -> list:
+    resolution = challenge_df["Resolution_Date"].dt.strftime("%Y-%m-%d") if "Resolution_Date" in challenge_df else None
+    columns = [
+        challenge_df["Strategy_Pair"],
+        challenge_df["Challenge Number"],
+        challenge_df["Outcome"],
+        challenge_df["Duration"],
+        resolution,
+        challenge_df.get("Payouts"),
+        challenge_df.get("Profit"),
+    ]
+    columns = [
+        [None] * len(challenge_df) if column is None else column.astype(object).where(column.notna(), None).tolist()
+        for column in columns
+    ]
+    return [(row_id, kind, *values) for values in zip(*columns)]
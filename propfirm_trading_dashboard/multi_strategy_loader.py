@@ -1,46 +1,117 @@
 import os
 from typing import Dict, List
 
-def discover_strategy_groups(base_path: str) -> Dict[str, List[str]]:
-    groups = {}
+def scan_strategy_folders(base_path: str) -> Dict[str, Dict[str, str]]:
+    # one pass over base_path: strategy folder -> {phase name: csv path}
+    manifest = {}
+
+    with os.scandir(base_path) as entries:
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+
+            try:
+                strategy_pair, run_id = entry.name.rsplit("_", 1)
+                strategy_name, pair = strategy_pair.rsplit("_", 1)
+            except ValueError:
+                continue
 
-    for folder in os.listdir(base_path):
-        full_path = os.path.join(base_path, folder)
+            manifest[entry.name] = scan_folder(entry.path)
 
-        if not os.path.isdir(full_path):
-            continue
+    return manifest
 
-        try:
-            strategy_pair, run_id = folder.rsplit("_", 1)
-            strategy_name, pair = strategy_pair.rsplit("_", 1)
-        except ValueError:
-            continue
+def scan_folder(folder_path: str) -> Dict[str, str]:
+    try:
+        with os.scandir(folder_path) as entries:
+            return {
+                entry.name[:-len(".csv")]: entry.path
+                for entry in entries
+                if entry.name.endswith(".csv") and entry.is_file()
+            }
+    except (FileNotFoundError, NotADirectoryError):
+        return {}
+
+def discover_strategy_groups(base_path: str, manifest: Dict[str, Dict[str, str]] = None) -> Dict[str, List[str]]:
+    if manifest is None:
+        manifest = scan_strategy_folders(base_path)
+
+    groups = {}
 
-        group_key = strategy_name
-        groups.setdefault(group_key, []).append(folder)
+    for folder in manifest:
+        strategy_name = folder.rsplit("_", 1)[0].rsplit("_", 1)[0]
+        groups.setdefault(strategy_name, []).append(folder)
 
     return groups
 
 import pandas as pd
-from csv_parser import load_csv_file, validate_columns
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from propfirm_trading_dashboard.csv_parser import load_csv_file, validate_frame
+from propfirm_trading_dashboard.instrumentation import NO_PROFILER, PipelineProfiler
+
+def load_phase_file(file_path: str, folder: str, typed: bool = False, cache=None, validate: bool = True) -> pd.DataFrame:
+    df = load_csv_file(file_path, typed=typed, cache=cache)
+    # typed loads are validated while they are parsed
+    if validate and not typed:
+        validate_frame(df, file_path)
+
+    df["Strategy_Pair"] = "_".join(folder.split("_")[:2])
+    df["Run"] = folder.rsplit("_", 1)[-1]
+    return df
+
+def load_joined_phases(base_path: str, phase_list: List[str], typed: bool = False, cache=None, workers: int = 1, use_processes: bool = False, manifest: Dict[str, Dict[str, str]] = None, profiler: PipelineProfiler = NO_PROFILER) -> Dict[str, pd.DataFrame]:
+    if manifest is None:
+        manifest = scan_strategy_folders(base_path)
+
+    groups = discover_strategy_groups(base_path, manifest)
+    folders = [folder for folder_list in groups.values() for folder in folder_list]
+    return load_manifest_phases(manifest, folders, phase_list, typed, cache, workers, use_processes, profiler)
+
+def merge_group_phase(base_path: str, folders: List[str], phase_name: str, typed: bool = False, cache=None, workers: int = 1, use_processes: bool = False) -> pd.DataFrame:
+    return merge_group_phases(base_path, folders, [phase_name], typed, cache, workers, use_processes)[phase_name]
 
-def merge_group_phase(base_path: str, folders: List[str], phase_name: str) -> pd.DataFrame:
-    dfs = []
+def merge_group_phases(base_path: str, folders: List[str], phase_list: List[str], typed: bool = False, cache=None, workers: int = 1, use_processes: bool = False) -> Dict[str, pd.DataFrame]:
+    manifest = {folder: scan_folder(os.path.join(base_path, folder)) for folder in folders}
+    return load_manifest_phases(manifest, folders, phase_list, typed, cache, workers, use_processes)
 
-    for folder in folders:
-        file_path = os.path.join(base_path, folder, f"{phase_name}.csv")
+def load_manifest_phases(manifest: Dict[str, Dict[str, str]], folders: List[str], phase_list: List[str], typed: bool = False, cache=None, workers: int = 1, use_processes: bool = False, profiler: PipelineProfiler = NO_PROFILER) -> Dict[str, pd.DataFrame]:
+    tasks = [
+        (phase, folder, manifest[folder][phase])
+        for phase in phase_list
+        for folder in folders
+        if phase in manifest.get(folder, {})
+    ]
+    args = (
+        [file_path for _, _, file_path in tasks],
+        [folder for _, folder, _ in tasks],
+        [typed] * len(tasks),
+        [cache] * len(tasks),
+        # validated below, so loading and validation show up as separate profiler stages
+        [False] * len(tasks),
+    )
 
-        if not os.path.exists(file_path):
-            continue
+    with profiler.stage("load", files=len(tasks)) as stage:
+        if workers > 1:
+            executor = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+            with executor(max_workers=workers) as pool:
+                # map keeps submission order, so the merge matches the serial path
+                frames = list(pool.map(load_phase_file, *args))
+        else:
+            frames = list(map(load_phase_file, *args))
+        stage["rows"] = sum(len(df) for df in frames)
 
-        df = load_csv_file(file_path)
-        validate_columns(df)
+    if not typed:
+        with profiler.stage("validate", rows=stage["rows"]):
+            for (_, _, file_path), df in zip(tasks, frames):
+                validate_frame(df, file_path)
 
-        df["Strategy_Pair"] = "_".join(folder.split("_")[:2])
-        df["Run"] = folder.rsplit("_", 1)[-1]
+    loaded = {phase: [] for phase in phase_list}
+    for (phase, _, _), df in zip(tasks, frames):
+        loaded[phase].append(df)
 
-        dfs.append(df)
+    with profiler.stage("merge", rows=stage["rows"]):
+        return {phase: merge_frames(dfs) for phase, dfs in loaded.items()}
 
+def merge_frames(dfs: List[pd.DataFrame]) -> pd.DataFrame:
     if not dfs:
         return pd.DataFrame(columns=[
             "Challenge Number", "Start Phase Date", "End Phase Date", 
@@ -52,9 +123,9 @@ def merge_group_phase(base_path: str, folders: List[str], phase_name: str) -> pd
     merged = pd.concat(dfs, ignore_index=True)
 
     merged["End Phase Date"] = pd.to_datetime(merged["End Phase Date"], format="%Y.%m.%d")
-    merged.sort_values("End Phase Date", inplace = True)
+    merged.sort_values("End Phase Date", inplace = True, kind="stable")
     cols = merged.columns.tolist()
     if "Strategy_Pair" in cols:
         cols.insert(0, cols.pop(cols.index("Strategy_Pair")))
     merged = merged[cols]
-    return merged
\ No newline at end of file
+    return merged
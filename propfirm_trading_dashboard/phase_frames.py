@@ -0,0 +1,53 @@
+from typing import Dict
+import numpy as np
+import pandas as pd
+from propfirm_trading_dashboard.csv_parser import DATE_COLUMNS, DATE_FORMAT
+
+NUMERIC_COLUMNS = ["Duration", "Start Balance", "Ending Balance"]
+PNL_PHASES = {"phase3", "funded"}
+# per-challenge phases count a blank duration as 0 days; phases 1-3 keep it NaN, so averages leave the row out
+ZERO_DURATION_PHASES = {"challenge", "funded"}
+# prop-firm economics: fee lost with every failed challenge, trader's share of a payout
+FAILED_CHALLENGE_COST = 80
+PROFIT_SPLIT = 0.67
+
+def normalize_phase_frame(df: pd.DataFrame, phase: str = None) -> pd.DataFrame:
+    # typed columns plus derived PnL, built once and then only read by the metrics, runs-table and monthly-PnL builders.
+    # returns a new frame (columns that need no conversion are shared, not copied); the input is never modified
+    if df.attrs.get("normalized"):
+        return df
+
+    columns = {}
+    if "Outcome" in df.columns:
+        columns["Outcome"] = df["Outcome"].astype(str).str.strip()
+    if "Phase" in df.columns:
+        columns["Phase"] = pd.to_numeric(df["Phase"], errors="coerce").fillna(0).astype(int)
+    for col in NUMERIC_COLUMNS:
+        if col in df.columns:
+            values = pd.to_numeric(df[col], errors="coerce").astype(float)
+            columns[col] = values if col == "Duration" and phase not in ZERO_DURATION_PHASES else values.fillna(0)
+    for col in DATE_COLUMNS:
+        if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+            columns[col] = _parse_dates(df[col])
+
+    if phase in PNL_PHASES and {"Outcome", "Start Balance", "Ending Balance"} <= columns.keys():
+        outcome = columns["Outcome"]
+        columns["PnL"] = np.where(
+            outcome == "Payout",
+            columns["Ending Balance"] - columns["Start Balance"],
+            np.where(outcome == "Failed", -FAILED_CHALLENGE_COST, 0)
+        )
+
+    normalized = df.assign(**columns)
+    normalized.attrs["normalized"] = True
+    return normalized
+
+def _parse_dates(values: pd.Series) -> pd.Series:
+    # MT5 exports use DATE_FORMAT; anything else (e.g. ISO dates) falls back to inference
+    parsed = pd.to_datetime(values, format=DATE_FORMAT, errors="coerce")
+    if (parsed.isna() & values.notna()).any():
+        parsed = pd.to_datetime(values, errors="coerce")
+    return parsed
+
+def normalize_phase_frames(df_dict: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    return {phase: normalize_phase_frame(df, phase) for phase, df in df_dict.items()}
@@ -0,0 +1,217 @@
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+import numpy as np
+import pandas as pd
+from propfirm_trading_dashboard.batch_metrics import _round_float
+from propfirm_trading_dashboard.metrics import MetricsCalculator, _with_strategy_pair
+from propfirm_trading_dashboard.multi_strategy_loader import merge_group_phases
+from propfirm_trading_dashboard.phase_frames import FAILED_CHALLENGE_COST, normalize_phase_frame
+from propfirm_trading_dashboard.sweep import monthly_ratio_metrics
+
+SEARCH_METHODS = ["auto", "exhaustive", "greedy", "beam"]
+SCORE_COLUMNS = [
+    "f_number_challenges", "f_number_failed_challenges", "f_challenge_winrate", "f_payout_winrate",
+    "f_average_payouts_challenge", "f_average_profit_payout", "f_average_profit_challenge", "f_profitability_ratio",
+    "f_challenge_efficiency_ratio", "m_winning_months", "m_losing_months", "m_monthly_winrate", "m_average_monthly_profit",
+    "m_average_monthly_loss", "m_monthly_wl_ratio", "m_monthly_stability_return_ratio", "m_overall_risk_adjusted_returns",
+]
+# "auto" tries every combination up to this many folders and beam searches above it
+EXHAUSTIVE_LIMIT = 12
+BATCH_CANDIDATES = 4096
+
+# per-folder funded aggregates that add up across folders
+TOTAL_COLUMNS = ["challenges", "failed", "payouts", "profit", "payout_profit_sum", "payout_profit_count", "payout_streaks", "payout_streak_length"]
+
+def folder_totals(calculator) -> tuple:
+    # additive funded totals and the monthly PnL (as in the m_ metrics) of one folder
+    calculator.calculate_metrics(["funded"])
+    summary = calculator.summaries["funded"]
+    if summary["rows"] == 0:
+        return np.zeros(len(TOTAL_COLUMNS)), pd.Series(dtype=float)
+
+    challenge_df = summary["challenge_df"]
+    streaks = summary["payout_streaks"].loc["Payout"]
+    totals = [
+        len(challenge_df),
+        (challenge_df["Outcome"] == "Failed").sum(),
+        challenge_df["Payouts"].sum(),
+        challenge_df["Profit"].sum(),
+        summary["payout_profit_sum"],
+        summary["payout_profit_count"],
+        streaks["count"],
+        np.rint(streaks["mean"] * streaks["count"]),
+    ]
+    return np.asarray(totals, dtype=float), summary["monthly_pnl"]
+
+def score_members(totals: np.ndarray, monthly: np.ndarray, members: np.ndarray) -> dict:
+    # metrics of the joined funded frame of every row of members (candidates x folders, bool), with the formulas
+    # and rounding of MetricsCalculator._calculate_metrics_funded; two matrix products do all the joining
+    weights = members.astype(float)
+    t = dict(zip(TOTAL_COLUMNS, (weights @ totals).T))
+    month_pnl = weights @ monthly
+
+    challenges, failed, payouts = t["challenges"], t["failed"], t["payouts"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # the calculator rounds these as python floats
+        challenge_winrate = np.where(challenges > 0, _round_float((challenges - failed) / challenges * 100), 0)
+        payout_winrate = np.where(payouts + failed > 0, _round_float(payouts / (payouts + failed) * 100), 0)
+        payouts_per_challenge = np.where(t["payout_streaks"] > 0, _round_float(t["payout_streak_length"] / t["payout_streaks"]), 0)
+        profit_per_payout = np.where(t["payout_profit_count"] > 0, _round_float(t["payout_profit_sum"] / t["payout_profit_count"]), 0)
+        profit_per_challenge = np.where(challenges > 0, np.round(t["profit"] / challenges, 2), 0)
+        efficiency = np.where(failed > 0, np.round(profit_per_challenge / failed, 2), 0)
+
+    return {
+        "f_number_challenges": challenges.astype(int),
+        "f_number_failed_challenges": failed.astype(int),
+        "f_challenge_winrate": challenge_winrate,
+        "f_payout_winrate": payout_winrate,
+        "f_average_payouts_challenge": payouts_per_challenge,
+        "f_average_profit_payout": profit_per_payout,
+        "f_average_profit_challenge": profit_per_challenge,
+        "f_profitability_ratio": _round_float((payout_winrate / 100) * payouts_per_challenge * profit_per_payout / FAILED_CHALLENGE_COST),
+        "f_challenge_efficiency_ratio": efficiency,
+        **monthly_ratio_metrics(month_pnl, efficiency),
+    }
+
+def _best_of_batch(totals, monthly, objective: str, keep: int, members: np.ndarray) -> tuple:
+    # scores one batch and only returns its best rows, the global best are always among them
+    scores = score_members(totals, monthly, members)
+    best = np.argsort(-scores[objective], kind="stable")[:keep]
+    return members[best], {name: values[best] for name, values in scores.items()}
+
+@contextmanager
+def _batch_mapper(workers: int):
+    if workers <= 1:
+        yield map
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map keeps submission order, so ties rank the same as in the serial run
+        yield pool.map
+
+class PortfolioSearch:
+    # per-folder totals and monthly PnL vectors are built once; every candidate combination is then scored
+    # from them, without concatenating frames or recomputing per-challenge records
+    def __init__(self, funded_frames: dict):
+        self.folders = list(funded_frames)
+        # the joined metrics group challenges by (Strategy_Pair, Challenge Number): folders sharing a pair would
+        # merge their challenges there, and adding up their totals would no longer match
+        owners = {}
+        for folder, df in funded_frames.items():
+            for pair in _with_strategy_pair(df)["Strategy_Pair"].dropna().unique():
+                if pair in owners:
+                    raise ValueError(f"Folders {owners[pair]!r} and {folder!r} share Strategy_Pair {pair!r}, every folder needs its own")
+                owners[pair] = folder
+
+        totals, monthly = [], []
+        for df in funded_frames.values():
+            folder_total, folder_monthly = folder_totals(MetricsCalculator({"funded": normalize_phase_frame(df, "funded")}))
+            totals.append(folder_total)
+            monthly.append(folder_monthly)
+
+        self.totals = np.vstack(totals) if totals else np.zeros((0, len(TOTAL_COLUMNS)))
+        months = sorted(set().union(*(series.index for series in monthly)))
+        self.months = pd.Index(months, name="Month")
+        self.monthly = np.vstack([series.reindex(self.months, fill_value=0).to_numpy(dtype=float) for series in monthly]) if monthly else np.zeros((0, 0))
+
+    @classmethod
+    def from_folders(cls, base_path, folders: list, typed: bool = False, cache=None):
+        return cls({folder: merge_group_phases(base_path, [folder], ["funded"], typed, cache)["funded"] for folder in folders})
+
+    def score(self, combinations: list) -> pd.DataFrame:
+        # metrics of the given combinations (lists of folder names), in the given order
+        members = self._members(combinations)
+        return self._ranking_frame(members, score_members(self.totals, self.monthly, members))
+
+    def search(self, objective: str = "m_overall_risk_adjusted_returns", method: str = "auto", min_size: int = 1, max_size: int = None, beam_width: int = 8, top: int = 20, workers: int = 1, batch_size: int = BATCH_CANDIDATES) -> pd.DataFrame:
+        # ranked combinations of min_size..max_size folders, best objective first
+        if method not in SEARCH_METHODS:
+            raise ValueError(f"Unsupported search method {method!r}, expected one of {SEARCH_METHODS}")
+        if objective not in SCORE_COLUMNS:
+            raise ValueError(f"Unknown objective {objective!r}, expected one of {SCORE_COLUMNS}")
+        n = len(self.folders)
+        max_size = n if max_size is None else min(max_size, n)
+        if not 1 <= min_size <= max_size:
+            raise ValueError(f"Combination sizes must satisfy 1 <= min_size <= max_size <= {n}")
+        if method == "auto":
+            method = "exhaustive" if n <= EXHAUSTIVE_LIMIT else "beam"
+        if method == "greedy":
+            beam_width = 1
+
+        with _batch_mapper(workers) as mapper:
+            score_batch = partial(_best_of_batch, self.totals, self.monthly, objective)
+            if method == "exhaustive":
+                members, scores = self._exhaustive(mapper, score_batch, objective, min_size, max_size, top, batch_size, max(workers, 1) * 2)
+            else:
+                members, scores = self._beam(mapper, score_batch, min_size, max_size, max(beam_width, 1), top, batch_size)
+
+        ranking = self._ranked(self._ranking_frame(members, scores), objective).head(top).reset_index(drop=True)
+        ranking.index = pd.RangeIndex(1, len(ranking) + 1, name="rank")
+        return ranking
+
+    def _exhaustive(self, mapper, score_batch, objective: str, min_size: int, max_size: int, top: int, batch_size: int, window: int) -> tuple:
+        # window batches are built and scored at a time (pool.map would build every batch up front) and only the
+        # top best so far are kept, so memory stays bounded however many combinations there are
+        combinations = itertools.chain.from_iterable(itertools.combinations(range(len(self.folders)), size) for size in range(min_size, max_size + 1))
+        batches = (self._index_members(batch) for batch in iter(lambda: list(itertools.islice(combinations, batch_size)), []))
+        best = []
+        for scored in iter(lambda: list(mapper(partial(score_batch, top), itertools.islice(batches, window))), []):
+            members, scores = _merge_batches(best + scored)
+            keep = self._ranked(self._ranking_frame(members, scores), objective).index[:top].to_numpy()
+            best = [(members[keep], {name: values[keep] for name, values in scores.items()})]
+        return _merge_batches(best)
+
+    def _beam(self, mapper, score_batch, min_size: int, max_size: int, beam_width: int, top: int, batch_size: int) -> tuple:
+        # grows the beam_width best combinations by one folder at a time (beam_width 1 is the greedy search)
+        n = len(self.folders)
+        beam = np.zeros((1, n), dtype=bool)
+        kept = []
+        for size in range(1, max_size + 1):
+            expansions = np.repeat(beam, n, axis=0)
+            added = np.tile(np.arange(n), len(beam))
+            fresh = ~expansions[np.arange(len(added)), added]
+            expansions[np.arange(len(added)), added] = True
+            expansions = np.unique(expansions[fresh], axis=0)
+            if not len(expansions):
+                break
+
+            batches = [expansions[start:start + batch_size] for start in range(0, len(expansions), batch_size)]
+            members, scores = _merge_batches(list(mapper(partial(score_batch, max(beam_width, top)), batches)))
+            if size >= min_size:
+                kept.append((members, scores))
+            beam = members[:beam_width]
+
+        return _merge_batches(kept)
+
+    def _members(self, combinations) -> np.ndarray:
+        positions = {folder: i for i, folder in enumerate(self.folders)}
+        unknown = [member for combination in combinations for member in combination if member not in positions]
+        if unknown:
+            raise ValueError(f"Unknown folders {unknown}, expected some of {self.folders}")
+        return self._index_members([[positions[member] for member in combination] for combination in combinations])
+
+    def _index_members(self, combinations) -> np.ndarray:
+        # combinations given as folder positions
+        members = np.zeros((len(combinations), len(self.folders)), dtype=bool)
+        for row, combination in enumerate(combinations):
+            members[row, list(combination)] = True
+        return members
+
+    def _ranked(self, ranking: pd.DataFrame, objective: str) -> pd.DataFrame:
+        # best objective first; ties go to the smaller (then alphabetically first) combination
+        return ranking.sort_values([objective, "size", "folders"], ascending=[False, True, True], kind="stable")
+
+    def _ranking_frame(self, members: np.ndarray, scores: dict) -> pd.DataFrame:
+        folders = np.asarray(self.folders, dtype=object)
+        return pd.DataFrame({
+            "folders": [tuple(folders[row]) for row in members],
+            "size": members.sum(axis=1),
+            **scores,
+        })
+
+def _merge_batches(batches: list) -> tuple:
+    # concatenates (members, scores) pairs, ordered like the objective ranking of _best_of_batch within each batch
+    members = np.concatenate([batch[0] for batch in batches])
+    scores = {name: np.concatenate([batch[1][name] for batch in batches]) for name in batches[0][1]}
+    return members, scores
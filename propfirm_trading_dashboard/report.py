@@ -1,12 +1,111 @@
+import json
+import re
+from functools import cache
 from pathlib import Path
-from jinja2 import Environment, FileSystemLoader
+from typing import Iterable
+import numpy as np
+import pandas as pd
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+from propfirm_trading_dashboard.csv_cache import CACHE_ROOT
+from propfirm_trading_dashboard.csv_parser import DATE_FORMAT
 
-def load_template(template_name: str) -> Environment:
-    env = Environment(loader=FileSystemLoader("templates"))
-    template = env.get_template(template_name)
-    return template
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates"
+BYTECODE_CACHE_DIR = CACHE_ROOT / "jinja"
+REPORTS_DIR = "reports"
 
-def render_report(metrics: dict, template_name: str, filename: str, runs_table=None, monthly_pnl_table=None):
+# one environment per process: compiled templates stay in its memory cache, and the bytecode cache
+# lets a new process skip parsing report_html.html as well
+environment = Environment(
+    loader=FileSystemLoader(TEMPLATE_DIR),
+    bytecode_cache=FileSystemBytecodeCache(str(BYTECODE_CACHE_DIR)),
+)
+
+def load_template(template_name: str) -> Template:
+    create_bytecode_cache_dir()
+    return environment.get_template(template_name)
+
+@cache
+def create_bytecode_cache_dir():
+    # once per process, before the first compiled template is written there
+    BYTECODE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+def render_report(metrics: dict, template_name: str, filename: str, runs_table=None, monthly_pnl_table=None, output_dir: str = REPORTS_DIR, paginate_runs: bool = False, rolling_metrics=None):
+    report = {"metrics": metrics, "filename": filename, "runs_table": runs_table, "monthly_pnl_table": monthly_pnl_table, "rolling_metrics": rolling_metrics}
+    render_reports([report], template_name, output_dir, paginate_runs)
+
+def render_reports(reports: Iterable[dict], template_name: str, output_dir: str = REPORTS_DIR, paginate_runs: bool = False) -> list:
+    # reports: dicts with the render_report arguments metrics, filename and optionally runs_table / monthly_pnl_table / rolling_metrics
+    template = load_template(template_name)
+    output_paths = []
+
+    for report in reports:
+        runs_table = report.get("runs_table")
+        context = build_report_context(
+            report["metrics"],
+            report["filename"],
+            None if paginate_runs else runs_table,
+            report.get("monthly_pnl_table"),
+            report.get("rolling_metrics"),
+        )
+        if paginate_runs:
+            context.update(write_runs_sidecar(runs_table, report["filename"], output_dir))
+        output_paths.append(write_report(template, context, report["filename"], output_dir))
+    return output_paths
+
+def write_runs_sidecar(runs_table, filename: str, output_dir: str = REPORTS_DIR) -> dict:
+    # runs tables as columnar json in a script next to the report; the page renders them one page at a time.
+    # a script (not a .json fetch) so the report still opens from file://
+    tables = {}
+    for phase, df in (runs_table or {}).items():
+        if df is not None and not df.empty:
+            tables[phase] = runs_table_payload(df)
+
+    sidecar_name = filename + "_runs.js"
+    payload = json.dumps(tables, separators=(",", ":"), allow_nan=False)
+    (Path(output_dir) / sidecar_name).write_text(f"window.RUNS_TABLES={payload};\n", encoding="utf-8")
+
+    return {
+        "runs_tables_sidecar": sidecar_name,
+        "runs_tables_rows": {phase: len(table["rows"]) for phase, table in tables.items()},
+    }
+
+def runs_display_frame(df: pd.DataFrame) -> pd.DataFrame:
+    # runs tables show dates and whole-day durations the way the MT5 export writes them ("2013.01.15", "14"),
+    # whatever dtypes the normalized frames carry
+    columns = {}
+    for col in df.columns:
+        values = df[col]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            columns[col] = values.dt.strftime(DATE_FORMAT)
+        elif col == "Duration" and pd.api.types.is_float_dtype(values) and values.notna().all() and (values % 1 == 0).all():
+            columns[col] = values.astype("int64")
+    return df.assign(**columns)
+
+def runs_table_payload(df: pd.DataFrame) -> dict:
+    df = runs_display_frame(df)
+    columns = {}
+    for col in df.columns:
+        values = df[col]
+        columns[col] = values.astype(object).where(values.notna(), None)
+
+    return {
+        "columns": [str(col) for col in df.columns],
+        "rows": pd.DataFrame(columns).to_numpy().tolist(),
+    }
+
+def rolling_chart_payload(rolling: pd.DataFrame) -> str:
+    # "<metric>_<window>" columns grouped into one chart per metric with a line per window, as json for the page
+    charts = {}
+    for col in rolling.columns:
+        metric, window = col.rsplit("_", 1)
+        values = rolling[col].to_numpy(dtype=float)
+        charts.setdefault(metric, {})[window] = np.where(np.isfinite(values), values, None).tolist()
+
+    payload = {"months": rolling.index.astype(str).tolist(), "charts": charts}
+    # inside a <script>, so a "</" in the data must not close it
+    return json.dumps(payload, separators=(",", ":"), allow_nan=False).replace("</", "<\\/")
+
+def build_report_context(metrics: dict, filename: str, runs_table=None, monthly_pnl_table=None, rolling_metrics=None) -> dict:
     flat_metrics = {}
     for phase_name, phase_metrics in metrics.items():
         flat_metrics.update(phase_metrics)
@@ -15,44 +114,106 @@ def render_report(metrics: dict, template_name: str, filename: str, runs_table=N
     if runs_table:
         for phase, df in runs_table.items():
             if df is not None and not df.empty:
-                runs_table_html[phase] = df.to_html(index=False, classes="runs_table", border=0)
+                df = runs_display_frame(df)
+                runs_table_html[phase] = table_html({col: format_cells(df[col]) for col in df.columns}, "runs_table")
     
     monthly_pnl_html = None
 
     if monthly_pnl_table is not None and not monthly_pnl_table.empty:
-        def format_pnl(val):
-            if isinstance(val, (int, float)):
-                formatted = f"{val:,.2f}"
-
-                if val < 0:
-                    return f'<span class="neg">{formatted}</span>'
-                elif val > 0:
-                    return f'<span class="pos">{formatted}</span>'
-                else:
-                    return formatted
-
-            return val
-
-        styled_table = monthly_pnl_table.copy()
-
-        for col in styled_table.columns:
-            if col != "Year":
-                styled_table[col] = styled_table[col].apply(format_pnl)
-
-        monthly_pnl_html = styled_table.to_html(
-            index=False,
-            classes="runs_table",
-            border=0,
-            escape=False
-        )
+        monthly_cells = {
+            col: format_cells(values) if col == "Year" else format_pnl_cells(values.to_numpy(dtype=float))
+            for col, values in monthly_pnl_table.items()
+        }
+        monthly_pnl_html = table_html(monthly_cells, "runs_table")
 
-    template = load_template(template_name)
-    output_path = "reports/" + filename + ".html"
-    html_content = template.render(
+    rolling_json = None
+    if rolling_metrics is not None and not rolling_metrics.empty:
+        rolling_json = rolling_chart_payload(rolling_metrics)
+
+    return {
         **flat_metrics,
-        runs_tables_html=runs_table_html,
-        monthly_pnl_table_html = monthly_pnl_html,
-        FOLDER_NAME=filename
+        "runs_tables_html": runs_table_html,
+        "monthly_pnl_table_html": monthly_pnl_html,
+        "rolling_metrics_json": rolling_json,
+        "FOLDER_NAME": filename,
+    }
+
+def format_pnl_cells(values: np.ndarray) -> np.ndarray:
+    # "1,234.50" with a neg/pos span by sign, built with array string ops instead of a call per cell
+    finite = np.isfinite(values)
+    fixed = np.char.mod("%.2f", np.abs(np.where(finite, values, 0)))
+    whole_text, _, cents = np.char.partition(fixed, ".").T
+    whole = whole_text.astype(np.int64)
+
+    text = np.where(whole >= 1000, np.char.mod("%03d", whole % 1000), np.char.mod("%d", whole % 1000))
+    scale = 1000
+    while (whole >= scale).any():
+        group = whole // scale % 1000
+        piece = np.where(whole >= scale * 1000, np.char.mod("%03d", group), np.char.mod("%d", group))
+        text = np.where(whole >= scale, np.char.add(np.char.add(piece, ","), text), text)
+        scale *= 1000
+
+    text = np.char.add(np.char.add(np.where(np.signbit(values), "-", ""), text), np.char.add(".", cents))
+    text = np.where(finite, text, np.char.mod("%s", values))
+    return np.where(
+        values < 0,
+        np.char.add(np.char.add('<span class="neg">', text), "</span>"),
+        np.where(values > 0, np.char.add(np.char.add('<span class="pos">', text), "</span>"), text),
+    )
+
+def format_cells(values: pd.Series) -> np.ndarray:
+    # same text DataFrame.to_html puts in a cell
+    missing = values.isna().to_numpy()
+
+    if pd.api.types.is_datetime64_any_dtype(values):
+        dates = values.dropna()
+        date_format = "%Y-%m-%d" if (dates == dates.dt.normalize()).all() else "%Y-%m-%d %H:%M:%S"
+        text = values.dt.strftime(date_format).fillna("NaT").to_numpy().astype(str)
+        return np.where(missing, "NaT", text)
+
+    if pd.api.types.is_bool_dtype(values):
+        return values.astype(str).to_numpy().astype(str)
+
+    if pd.api.types.is_integer_dtype(values):
+        return np.char.mod("%d", values.to_numpy())
+
+    if pd.api.types.is_float_dtype(values):
+        numbers = values.to_numpy(dtype=float)
+        finite = np.isfinite(numbers)
+        magnitude = np.abs(numbers[finite])
+        if ((magnitude > 0) & (magnitude < 1e-6)).any() or (magnitude > 1e6).any():
+            # to_html may switch such columns to scientific notation, so they take its own formatting
+            return to_html_cells(values)
+        decimals = np.char.partition(np.char.mod("%.6f", numbers[finite]), ".")[:, 2]
+        precision = max(int(np.char.str_len(np.char.rstrip(decimals, "0")).max(initial=0)), 1)
+        text = np.char.mod(f"%.{precision}f", numbers)
+        return np.where(missing, "NaN", np.where(finite, text, np.char.mod("%s", numbers)))
+
+    # escaped as python strings: np.char.replace keeps the input's width and would cut the entities off
+    text = values.astype(str).str.replace("&", "&amp;", regex=False).str.replace("<", "&lt;", regex=False).str.replace(">", "&gt;", regex=False)
+    return np.where(missing, "NaN", text.to_numpy().astype(str))
+
+def to_html_cells(values: pd.Series) -> np.ndarray:
+    html = values.to_frame().to_html(index=False, header=False, border=0)
+    return np.array(re.findall(r"<td>(.*?)</td>", html), dtype=str)
+
+def table_html(cells: dict, classes: str) -> str:
+    # the markup of DataFrame.to_html(index=False, border=0), assembled one column at a time
+    header = "".join(f"      <th>{name}</th>\n" for name in cells)
+    rows = ""
+    for text in cells.values():
+        rows = np.char.add(rows, np.char.add(np.char.add("      <td>", text), "</td>\n"))
+    body = "".join(np.char.add(np.char.add("    <tr>\n", rows), "    </tr>\n").tolist())
+
+    return (
+        f'<table class="dataframe {classes}">\n'
+        f'  <thead>\n    <tr style="text-align: right;">\n{header}    </tr>\n  </thead>\n'
+        f"  <tbody>\n{body}  </tbody>\n</table>"
     )
-    Path(output_path).write_text(html_content, encoding="utf-8")
-    print(f"Report saved to {output_path}")
\ No newline at end of file
+
+def write_report(template: Template, context: dict, filename: str, output_dir: str = REPORTS_DIR) -> Path:
+    output_path = Path(output_dir) / (filename + ".html")
+    html_content = template.render(**context)
+    output_path.write_text(html_content, encoding="utf-8")
+    print(f"Report saved to {output_path}")
+    return output_path
\ No newline at end of file
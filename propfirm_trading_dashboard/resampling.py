@@ -0,0 +1,161 @@
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from propfirm_trading_dashboard.batch_metrics import _round_float
+from propfirm_trading_dashboard.phase_frames import FAILED_CHALLENGE_COST
+
+METHODS = ["bootstrap", "block"]
+# cells (paths x sequence length) resampled per batch, bounds the memory of one batch
+BATCH_CELLS = 2_000_000
+
+def resampling_records(calculator) -> dict:
+    # the chronological per-challenge sequences of the challenge and funded summaries, and the monthly PnL;
+    # phases the calculator has no rows for are left out
+    missing = [phase for phase in ["challenge", "funded"] if phase in calculator.dfs and phase not in calculator.summaries]
+    if missing:
+        calculator.calculate_metrics(missing)
+
+    records = {}
+    challenge = calculator.summaries.get("challenge", {"rows": 0})
+    if challenge["rows"]:
+        records["challenge"] = {"passed": (challenge["challenge_df"]["Outcome"] == "Passed").to_numpy()}
+
+    funded = calculator.summaries.get("funded", {"rows": 0})
+    if funded["rows"]:
+        challenge_df = funded["challenge_df"]
+        records["funded"] = {
+            "passed": (challenge_df["Outcome"] == "Passed").to_numpy(),
+            "payouts": challenge_df["Payouts"].to_numpy(dtype=float),
+            "profit": challenge_df["Profit"].to_numpy(dtype=float),
+        }
+        if len(funded["monthly_pnl"]):
+            records["monthly"] = {"pnl": funded["monthly_pnl"].to_numpy(dtype=float)}
+
+    return records
+
+def resample_indices(rng, n: int, paths: int, method: str = "bootstrap", block_size: int = None) -> np.ndarray:
+    # paths x n positions into a sequence of length n
+    if method == "bootstrap":
+        return rng.integers(0, n, size=(paths, n))
+
+    # moving blocks keep runs of consecutive outcomes (and of good/bad months) together
+    block = min(block_size or default_block_size(n), n)
+    starts = rng.integers(0, n - block + 1, size=(paths, -(-n // block)))
+    return (starts[:, :, None] + np.arange(block)).reshape(paths, -1)[:, :n]
+
+def default_block_size(n: int) -> int:
+    return max(1, round(n ** (1 / 3)))
+
+def max_streaks(flags: np.ndarray) -> np.ndarray:
+    # longest run of True per row: the running count minus the count at the last False
+    if flags.shape[1] == 0:
+        return np.zeros(flags.shape[0], dtype=np.int64)
+    counts = np.cumsum(flags, axis=1)
+    resets = np.maximum.accumulate(np.where(flags, 0, counts), axis=1)
+    return (counts - resets).max(axis=1)
+
+def path_statistics(records: dict, positions: dict) -> dict:
+    # one value per path and statistic; names follow the metric they estimate
+    stats = {}
+
+    if "challenge" in positions:
+        passed = records["challenge"]["passed"][positions["challenge"]]
+        stats["c_challenge_winrate"] = passed.mean(axis=1) * 100
+        stats["c_max_cons_challenge_failed"] = max_streaks(~passed)
+
+    if "funded" in positions:
+        funded = {name: values[positions["funded"]] for name, values in records["funded"].items()}
+        passed = funded["passed"]
+        payouts = funded["payouts"].sum(axis=1)
+        passed_count = passed.sum(axis=1)
+        failed_count = passed.shape[1] - passed_count
+        payout_profit = np.where(passed, funded["profit"], 0).sum(axis=1)
+
+        # rounded factor by factor like MetricsCalculator._calculate_metrics_funded, so the observed path is the metric
+        with np.errstate(divide="ignore", invalid="ignore"):
+            payout_winrate = np.where(payouts + failed_count > 0, _round_float(payouts / (payouts + failed_count) * 100), 0)
+            payouts_per_challenge = np.where(passed_count > 0, _round_float(payouts / passed_count), 0)
+            profit_per_payout = np.where(payouts > 0, _round_float(payout_profit / payouts), 0)
+
+        stats["f_challenge_winrate"] = passed.mean(axis=1) * 100
+        stats["f_max_cons_challenge_failed"] = max_streaks(~passed)
+        stats["f_profitability_ratio"] = _round_float((payout_winrate / 100) * payouts_per_challenge * profit_per_payout / FAILED_CHALLENGE_COST)
+
+    if "monthly" in positions:
+        pnl = records["monthly"]["pnl"][positions["monthly"]]
+        stats["m_average_monthly_pnl"] = pnl.mean(axis=1)
+        stats["m_monthly_pnl_p5"] = np.percentile(pnl, 5, axis=1)
+
+    return stats
+
+def observed_statistics(records: dict) -> dict:
+    # the statistics of the historical sequences themselves, as one path each
+    positions = {name: np.arange(len(next(iter(columns.values()))))[None, :] for name, columns in records.items()}
+    return {name: values[0] for name, values in path_statistics(records, positions).items()}
+
+def _resample_batch(records: dict, paths: int, method: str, block_size: int, seed_sequence) -> dict:
+    rng = np.random.default_rng(seed_sequence)
+    positions = {
+        name: resample_indices(rng, len(next(iter(columns.values()))), paths, method, block_size)
+        for name, columns in records.items()
+    }
+    return path_statistics(records, positions)
+
+def simulate_paths(records: dict, paths: int = 10_000, method: str = "bootstrap", block_size: int = None, seed=None, workers: int = 1, batch_size: int = None) -> dict:
+    # statistic -> one value per resampled path; batches get their own child seed, so a seed gives the same
+    # paths whatever the number of workers
+    if method not in METHODS:
+        raise ValueError(f"Unsupported resampling method {method!r}, expected one of {METHODS}")
+    if not records:
+        return {}
+
+    longest = max(len(next(iter(columns.values()))) for columns in records.values())
+    batch_size = batch_size or max(1, BATCH_CELLS // max(longest, 1))
+    batch_paths = [min(batch_size, paths - start) for start in range(0, paths, batch_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(batch_paths))
+
+    args = (
+        [records] * len(batch_paths),
+        batch_paths,
+        [method] * len(batch_paths),
+        [block_size] * len(batch_paths),
+        seeds,
+    )
+    if workers > 1 and len(batch_paths) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # map keeps submission order, so the paths match the serial run
+            batches = list(pool.map(_resample_batch, *args))
+    else:
+        batches = list(map(_resample_batch, *args))
+
+    return {name: np.concatenate([batch[name] for batch in batches]) for name in batches[0]}
+
+def confidence_intervals(samples: dict, observed: dict = None, confidence: float = 0.9) -> pd.DataFrame:
+    # percentile intervals around the resampled distribution of every statistic
+    tail = (1 - confidence) / 2 * 100
+    rows = {}
+    for name, values in samples.items():
+        lower, median, upper = np.percentile(values, [tail, 50, 100 - tail])
+        rows[name] = {
+            "observed": observed.get(name, np.nan) if observed else np.nan,
+            "mean": values.mean(),
+            "lower": lower,
+            "median": median,
+            "upper": upper,
+        }
+
+    intervals = pd.DataFrame.from_dict(rows, orient="index", columns=["observed", "mean", "lower", "median", "upper"])
+    intervals.index.name = "statistic"
+    return intervals
+
+def streak_probability(samples: dict, length: int, name: str = "f_max_cons_challenge_failed") -> float:
+    # share of paths with a losing streak of at least length challenges
+    return float((samples[name] >= length).mean())
+
+def resample_metrics(calculator, paths: int = 10_000, method: str = "bootstrap", block_size: int = None, confidence: float = 0.9, seed=None, workers: int = 1) -> dict:
+    records = resampling_records(calculator)
+    samples = simulate_paths(records, paths, method, block_size, seed, workers)
+    return {
+        "intervals": confidence_intervals(samples, observed_statistics(records), confidence),
+        "samples": samples,
+    }
@@ -0,0 +1,169 @@
+import numpy as np
+import pandas as pd
+from propfirm_trading_dashboard.metrics import PHASES
+
+# trailing windows in calendar months; None is the expanding window (everything up to the month)
+ROLLING_WINDOWS = [6, 12, None]
+
+def month_codes(dates: pd.Series) -> np.ndarray:
+    # year * 12 + month - 1 per date, -1 where the date is missing
+    dates = pd.to_datetime(dates)
+    codes = (dates.dt.year * 12 + dates.dt.month - 1).to_numpy(dtype=float, na_value=np.nan)
+    return np.where(np.isnan(codes), -1, codes).astype(np.int64)
+
+def window_label(window) -> str:
+    return "expanding" if window is None else f"{window}m"
+
+def window_sums(monthly: np.ndarray, window) -> np.ndarray:
+    # trailing sums over the last axis from one cumulative sum: the window ending at month t is cs[t] - cs[t - window]
+    cumulative = np.cumsum(monthly, axis=-1)
+    if window is None:
+        return cumulative
+    sums = cumulative.copy()
+    sums[..., window:] -= cumulative[..., :-window]
+    return sums
+
+def phase_events(calculator, phase: str) -> dict:
+    # the additive quantities behind the phase's trend metrics, one value per event, and the month of every event
+    df = calculator.dfs[phase]
+    summary = calculator.summaries[phase]
+    outcome = df["Outcome"].to_numpy()
+
+    if phase in ["phase1", "phase2"]:
+        return {
+            "month": month_codes(df["End Phase Date"]),
+            "passed": outcome == "Passed",
+            "failed": outcome == "Failed",
+            # rows without a duration are left out of the average, like the calculator's mean
+            "duration": df["Duration"].fillna(0).to_numpy(dtype=float),
+            "timed": df["Duration"].notna().to_numpy(),
+        }
+
+    if phase == "phase3":
+        is_payout = outcome == "Payout"
+        return {
+            "month": month_codes(df["End Phase Date"]),
+            "payouts": is_payout,
+            "failed": outcome == "Failed",
+            "payout_amount": np.where(is_payout, (df["Ending Balance"] - df["Start Balance"]).to_numpy(), 0),
+        }
+
+    if phase == "challenge":
+        # a challenge is dated by the row that completed it
+        challenge_df = summary["challenge_df"]
+        return {
+            "month": month_codes(df["End Phase Date"].reindex(challenge_df["completion_row"])),
+            "passed": (challenge_df["Outcome"] == "Passed").to_numpy(),
+            "failed": (challenge_df["Outcome"] == "Failed").to_numpy(),
+            "duration": challenge_df["Duration"].to_numpy(dtype=float),
+        }
+
+    # funded: challenges by resolution date, payouts and PnL by the date of their row
+    challenge_df = summary["challenge_df"]
+    is_payout = outcome == "Payout"
+    return {
+        "challenges": {
+            "month": month_codes(challenge_df["Resolution_Date"]),
+            "passed": (challenge_df["Outcome"] == "Passed").to_numpy(),
+            "failed": (challenge_df["Outcome"] == "Failed").to_numpy(),
+            "profit": challenge_df["Profit"].to_numpy(dtype=float),
+        },
+        "rows": {
+            "month": month_codes(df["End Phase Date"]),
+            "payouts": is_payout,
+            "payout_amount": np.where(is_payout, (df["Ending Balance"] - df["Start Balance"]).to_numpy(), 0),
+            "pnl": df["PnL"].to_numpy(dtype=float),
+        },
+    }
+
+def monthly_totals(events: dict, first: int, months: int) -> dict:
+    # per-month sums of every event quantity on the months first .. first + months - 1 (undated events are left out)
+    dated = events["month"] >= 0
+    positions = events["month"][dated] - first
+    return {
+        name: np.bincount(positions, weights=np.asarray(values, dtype=float)[dated], minlength=months)
+        for name, values in events.items() if name != "month"
+    }
+
+def _ratio(numerator, denominator, scale: float = 1.0) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denominator > 0, np.round(numerator / denominator * scale, 2), 0)
+
+def phase_trend_metrics(phase: str, sums: dict) -> dict:
+    # the whole-history formulas (and rounding) of MetricsCalculator on the sums of one window; windows without
+    # any event of the phase are NaN instead of the calculator's 0, so charts show a gap rather than a drop
+    if phase in ["phase1", "phase2"]:
+        prefix = "p1" if phase == "phase1" else "p2"
+        decided = sums["passed"] + sums["failed"]
+        winrate = _ratio(sums["passed"], decided, 100)
+        average_duration = _ratio(sums["duration"], sums["timed"])
+        metrics = {
+            f"{prefix}_challenge_winrate": winrate,
+            f"{prefix}_efficiency_ratio": _ratio(winrate, average_duration),
+        }
+        active = decided > 0
+
+    elif phase == "phase3":
+        decided = sums["payouts"] + sums["failed"]
+        metrics = {
+            "p3_payout_winrate": _ratio(sums["payouts"], decided, 100),
+            "p3_average_profit_payout": _ratio(sums["payout_amount"], sums["payouts"]),
+        }
+        active = decided > 0
+
+    elif phase == "challenge":
+        decided = sums["passed"] + sums["failed"]
+        winrate = _ratio(sums["passed"], decided, 100)
+        metrics = {
+            "c_challenge_winrate": winrate,
+            "c_efficiency_ratio": _ratio(winrate, _ratio(sums["duration"], decided)),
+        }
+        active = decided > 0
+
+    else:
+        challenges = sums["passed"] + sums["failed"]
+        winrate = _ratio(sums["passed"], challenges, 100)
+        metrics = {
+            "f_challenge_winrate": winrate,
+            "f_challenge_efficiency_ratio": _ratio(_ratio(sums["profit"], challenges), sums["failed"]),
+            "f_average_profit_payout": _ratio(sums["payout_amount"], sums["payouts"]),
+            "m_monthly_winrate": _ratio(sums["winning_months"], sums["winning_months"] + sums["losing_months"], 100),
+        }
+        active = (challenges > 0) | (sums["winning_months"] + sums["losing_months"] > 0)
+
+    return {name: np.where(active, values, np.nan) for name, values in metrics.items()}
+
+def rolling_metrics(calculator, windows=ROLLING_WINDOWS) -> pd.DataFrame:
+    # one row per calendar month from the first to the last dated event, one "<metric>_<window>" column per
+    # metric and window; every window comes from one pass of cumulative sums over the per-month totals
+    phases = [phase for phase in PHASES if phase in calculator.dfs and not calculator.dfs[phase].empty]
+    missing = [phase for phase in phases if phase not in calculator.summaries]
+    if missing:
+        calculator.calculate_metrics(missing)
+
+    events = {phase: phase_events(calculator, phase) for phase in phases}
+    flat_events = [group for phase in phases for group in (events[phase].values() if phase == "funded" else [events[phase]])]
+    dated = np.concatenate([group["month"][group["month"] >= 0] for group in flat_events]) if flat_events else np.zeros(0, dtype=np.int64)
+    if dated.size == 0:
+        return pd.DataFrame(index=pd.PeriodIndex([], freq="M", name="Month"))
+
+    first = int(dated.min())
+    months = int(dated.max()) - first + 1
+    columns = {}
+    for phase in phases:
+        if phase == "funded":
+            totals = {**monthly_totals(events[phase]["challenges"], first, months), **monthly_totals(events[phase]["rows"], first, months)}
+            # a month is won or lost by the sign of its summed PnL, as in the m_ metrics
+            totals["winning_months"] = (totals["pnl"] > 0).astype(float)
+            totals["losing_months"] = (totals["pnl"] < 0).astype(float)
+        else:
+            totals = monthly_totals(events[phase], first, months)
+
+        for window in windows:
+            sums = {name: window_sums(values, window) for name, values in totals.items()}
+            for name, values in phase_trend_metrics(phase, sums).items():
+                columns[f"{name}_{window_label(window)}"] = values
+
+    # period ordinals count months from 1970-01
+    index = pd.PeriodIndex.from_ordinals(np.arange(first, first + months) - 1970 * 12, freq="M").rename("Month")
+    return pd.DataFrame(columns, index=index)
@@ -1,63 +1,140 @@
 import pandas as pd
-from csv_parser import load_csv_file, validate_columns
-from metrics import MetricsCalculator as mc
-from report import render_report
-from multi_strategy_loader import discover_strategy_groups, merge_group_phase
+from propfirm_trading_dashboard.csv_parser import load_csv_file, validate_frame, iter_csv_chunks
+from propfirm_trading_dashboard.metrics import MetricsCalculator as mc, PHASES
+from propfirm_trading_dashboard.instrumentation import NO_PROFILER, PipelineProfiler
+from propfirm_trading_dashboard.phase_frames import PROFIT_SPLIT, normalize_phase_frame, normalize_phase_frames
+from propfirm_trading_dashboard.report import render_report, REPORTS_DIR
+from propfirm_trading_dashboard.multi_strategy_loader import scan_strategy_folders, load_joined_phases
+from propfirm_trading_dashboard.incremental_join import IncrementalMetricsCalculator, load_incremental_phases, folder_fingerprint, folder_monthly_pnl, merge_monthly_pnl
+from propfirm_trading_dashboard.metrics_store import folder_record
+from propfirm_trading_dashboard.streaming_metrics import StreamingMetricsCalculator, CHUNKSIZE
+from propfirm_trading_dashboard.rolling_metrics import rolling_metrics
 from datetime import datetime
 
-def run_joined_simulation(base_path: str, phase_list: list):
-    groups = discover_strategy_groups(base_path)
+def run_joined_simulation(base_path: str, phase_list: list, typed: bool = False, cache=None, workers: int = 1, use_processes: bool = False, incremental: bool = False, paginate_runs: bool = False, trends: bool = False, profiler: PipelineProfiler = NO_PROFILER):
+    manifest = scan_strategy_folders(base_path)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     report_name = f"JoinedSimulation_{timestamp}"
 
-    all_folders = []
-    for folder_list in groups.values():
-        all_folders.extend(folder_list)
-
-    print(f"Processing joined simulation for {len(all_folders)} folders...")
-
-    df_dict = {}
-
-    for phase in phase_list:
-        merged_df = merge_group_phase(base_path, all_folders, phase)
-        df_dict[phase] = merged_df
-
-    calculator = mc(df_dict)
-    all_metrics = calculator.calculate_metrics()
-    runs_table_df = build_runs_table(df_dict)
-
-    render_report(
-        all_metrics,
-        "report_html.html",
-        report_name,
-        runs_table=runs_table_df,
-        monthly_pnl_table = build_monthly_pnl(runs_table_df["funded"])
-    )
-
-
-def run_single_simulation(filename: str, phase_list: list):
-    path = "data/" + filename + "/"
-    df_dict = {}
-
-    for phase in phase_list:
-        full_path = path + phase + ".csv"
-
-        df = load_csv_file(full_path)
-        validate_columns(df)
-        df_dict[phase] = df
-
-    calculator = mc(df_dict)
-    all_metrics = calculator.calculate_metrics()
-
-    runs_table_df = build_runs_table(df_dict)
-
-    render_report(
-        all_metrics,
-        "report_html.html",
-        filename,
-        runs_table=runs_table_df,
-        monthly_pnl_table = build_monthly_pnl(runs_table_df["funded"])
-    )
+    print(f"Processing joined simulation for {len(manifest)} folders...")
+
+    with profiler.section(report_name):
+        if incremental:
+            df_dict, monthly_pnl, rebuilt, records = load_incremental_phases(base_path, phase_list, typed=typed, cache=cache, manifest=manifest, profiler=profiler)
+            print(f"Rebuilt partials for {len(rebuilt)} changed folders")
+        else:
+            df_dict = load_joined_phases(base_path, phase_list, typed=typed, cache=cache, workers=workers, use_processes=use_processes, manifest=manifest, profiler=profiler)
+
+        with profiler.stage("normalize", rows=_row_count(df_dict)):
+            df_dict = normalize_phase_frames(df_dict)
+        calculator = IncrementalMetricsCalculator(df_dict, records) if incremental else mc(df_dict)
+        all_metrics = calculate_metrics_by_stage(calculator, profiler)
+        rolling = None
+        if trends:
+            with profiler.stage("rolling metrics", rows=_row_count(df_dict)):
+                rolling = rolling_metrics(calculator)
+
+        with profiler.stage("runs table", rows=_row_count(df_dict)):
+            runs_table_df = build_runs_table(df_dict)
+        with profiler.stage("monthly pnl", rows=len(df_dict["funded"])):
+            monthly_pnl_table = pivot_monthly_pnl(monthly_pnl) if incremental else build_monthly_pnl(runs_table_df["funded"])
+
+        with profiler.stage("render", rows=_row_count(runs_table_df)):
+            render_report(
+                all_metrics,
+                "report_html.html",
+                report_name,
+                runs_table=runs_table_df,
+                monthly_pnl_table = monthly_pnl_table,
+                paginate_runs=paginate_runs,
+                rolling_metrics=rolling
+            )
+
+
+def run_single_simulation(filename: str, phase_list: list, typed: bool = False, cache=None, stream: bool = False, chunksize: int = CHUNKSIZE, paginate_runs: bool = False, trends: bool = False, base_path: str = "data", output_dir: str = REPORTS_DIR, profiler: PipelineProfiler = NO_PROFILER):
+    path = str(base_path) + "/" + filename + "/"
+
+    if stream:
+        with profiler.section(filename):
+            run_streaming_simulation(filename, path, phase_list, typed, chunksize, output_dir, profiler)
+        return None
+
+    # signature of the files as they were before loading, so the metrics store can tell if they changed since
+    stat_signature = folder_fingerprint({phase: path + phase + ".csv" for phase in phase_list})
+    with profiler.section(filename):
+        with profiler.stage("load", files=len(phase_list)) as stage:
+            df_dict = {phase: load_csv_file(path + phase + ".csv", typed=typed, cache=cache) for phase in phase_list}
+            stage["rows"] = _row_count(df_dict)
+
+        # typed loads are validated while they are parsed
+        if not typed:
+            with profiler.stage("validate", rows=stage["rows"]):
+                for phase, df in df_dict.items():
+                    validate_frame(df, path + phase + ".csv")
+
+        with profiler.stage("normalize", rows=stage["rows"]):
+            df_dict = {phase: normalize_phase_frame(df, phase) for phase, df in df_dict.items()}
+
+        calculator = mc(df_dict)
+        all_metrics = calculate_metrics_by_stage(calculator, profiler)
+        rolling = None
+        if trends:
+            with profiler.stage("rolling metrics", rows=stage["rows"]):
+                rolling = rolling_metrics(calculator)
+
+        with profiler.stage("runs table", rows=stage["rows"]):
+            runs_table_df = build_runs_table(df_dict)
+        with profiler.stage("monthly pnl", rows=len(runs_table_df["funded"])):
+            monthly_pnl_table = build_monthly_pnl(runs_table_df["funded"])
+
+        with profiler.stage("render", rows=_row_count(runs_table_df)):
+            render_report(
+                all_metrics,
+                "report_html.html",
+                filename,
+                runs_table=runs_table_df,
+                monthly_pnl_table = monthly_pnl_table,
+                output_dir=output_dir,
+                paginate_runs=paginate_runs,
+                rolling_metrics=rolling
+            )
+
+    # the metrics store writes this instead of calculating the folder again
+    return folder_record(all_metrics, calculator.summaries, df_dict, stat_signature)
+
+def run_streaming_simulation(filename: str, path: str, phase_list: list, typed: bool = False, chunksize: int = CHUNKSIZE, output_dir: str = REPORTS_DIR, profiler: PipelineProfiler = NO_PROFILER):
+    # the per-run tables need every row, so streaming reports carry the metrics and the monthly table only
+    # (loading, validation and metrics happen chunk by chunk, so they are one stage per phase here)
+    paths = {phase: path + phase + ".csv" for phase in phase_list}
+    calculator = StreamingMetricsCalculator(paths, chunksize=chunksize, typed=typed)
+    all_metrics = calculate_metrics_by_stage(calculator, profiler)
+
+    with profiler.stage("monthly pnl"):
+        monthly_pnl = []
+        if "funded" in paths:
+            monthly_pnl = [folder_monthly_pnl(chunk) for chunk in iter_csv_chunks(paths["funded"], chunksize, typed)]
+        monthly_pnl_table = pivot_monthly_pnl(merge_monthly_pnl(monthly_pnl))
+
+    with profiler.stage("render"):
+        render_report(
+            all_metrics,
+            "report_html.html",
+            filename,
+            monthly_pnl_table = monthly_pnl_table,
+            output_dir=output_dir
+        )
+
+def calculate_metrics_by_stage(calculator: mc, profiler: PipelineProfiler = NO_PROFILER) -> dict:
+    # one phase at a time, so every phase is its own profiler stage
+    all_metrics = {}
+    for phase in PHASES:
+        with profiler.stage(f"metrics {phase}") as stage:
+            all_metrics.update(calculator.calculate_metrics([phase]))
+            stage["rows"] = calculator.summaries.get(phase, {}).get("rows")
+    return all_metrics
+
+def _row_count(df_dict: dict) -> int:
+    return sum(len(df) for df in df_dict.values() if df is not None)
 
 def build_runs_table(df_dict: dict) -> dict:
     tables_per_phase = {}
@@ -75,34 +152,29 @@ def build_runs_table(df_dict: dict) -> dict:
 
     for phase, df in df_dict.items():
         if df is not None and not df.empty:
-            df_copy = df.copy()
-            existing_columns = [col for col in columns_to_keep if col in df_copy]
-            df_copy = df_copy[existing_columns]
-            df_copy = df_copy.rename(columns={
+            df = normalize_phase_frame(df, phase)
+            existing_columns = [col for col in columns_to_keep if col in df]
+            tables_per_phase[phase] = df[existing_columns].rename(columns={
                 "Start Phase Date": "Start Date",
                 "End Phase Date": "End Date",
                 "Challenge Number": "Run #"
             })
-            tables_per_phase[phase] = df_copy
     return tables_per_phase
 
 def build_monthly_pnl(runs_table: pd.DataFrame) -> pd.DataFrame:
     if isinstance(runs_table, dict):
         df_all = pd.concat([df for df in runs_table.values() if df is not None and not df.empty])
     else:
-        df_all = runs_table.copy()
-    
-    if 'PnL' not in df_all.columns:
-        df_all['PnL'] = df_all["Ending Balance"] - df_all["Start Balance"]
+        df_all = runs_table
 
-    df_all.loc[df_all["PnL"] > 0, "PnL"] *= 0.67
-    
-    df_all["End Date"] = pd.to_datetime(df_all["End Date"], format="%Y.%m.%d")
-    df_all["Year"] = df_all["End Date"].dt.year
-    df_all["Month"] = df_all["End Date"].dt.month
+    pnl = df_all["PnL"] if "PnL" in df_all.columns else (df_all["Ending Balance"] - df_all["Start Balance"]).rename("PnL")
+    pnl = pnl.where(~(pnl > 0), pnl * PROFIT_SPLIT)
 
-    monthly = df_all.groupby(["Year", "Month"])["PnL"].sum().reset_index()
+    end_date = pd.to_datetime(df_all["End Date"], format="%Y.%m.%d")
+    monthly = pnl.groupby([end_date.dt.year.rename("Year"), end_date.dt.month.rename("Month")]).sum().reset_index()
+    return pivot_monthly_pnl(monthly)
 
+def pivot_monthly_pnl(monthly: pd.DataFrame) -> pd.DataFrame:
     table = monthly.pivot_table(index="Year", columns="Month", values = "PnL",fill_value=0).fillna(0)
     table.columns.name = None
 
@@ -122,6 +194,6 @@ def build_funded_outcomes(runs_table: pd.DataFrame) -> pd.DataFrame:
     
     if 'PnL' not in df_all.columns:
         df_all['PnL'] = df_all["Ending Balance"] - df_all["Start Balance"]
-    df_all.loc[df_all["PnL"] > 0, "PnL"] *= 0.67
+    df_all.loc[df_all["PnL"] > 0, "PnL"] *= PROFIT_SPLIT
 
     
\ No newline at end of file
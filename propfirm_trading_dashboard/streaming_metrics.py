@@ -0,0 +1,201 @@
+import os
+from typing import Dict
+import numpy as np
+import pandas as pd
+from propfirm_trading_dashboard.csv_parser import iter_csv_chunks
+from propfirm_trading_dashboard.metrics import MetricsCalculator, _with_strategy_pair, monthly_pnl, run_length_encode, run_stats, summarize_outcome_rows
+from propfirm_trading_dashboard.phase_frames import normalize_phase_frame
+
+CHUNKSIZE = 100_000
+
+class StreakAccumulator:
+    # keeps only the run still open at the chunk edge, so streaks match one pass over the whole file
+    def __init__(self, outcomes):
+        self.outcomes = outcomes
+        self.max = dict.fromkeys(outcomes, 0)
+        self.total = dict.fromkeys(outcomes, 0)
+        self.count = dict.fromkeys(outcomes, 0)
+        self.open_value = None
+        self.open_length = 0
+
+    def update(self, values):
+        run_values, run_lengths = run_length_encode(values)
+        if run_values.size == 0:
+            return
+
+        if self.open_length and run_values[0] == self.open_value:
+            run_lengths[0] += self.open_length
+        else:
+            self._add_runs(np.array([self.open_value], dtype=object), np.array([self.open_length]))
+
+        self._add_runs(run_values[:-1], run_lengths[:-1])
+        self.open_value, self.open_length = run_values[-1], run_lengths[-1]
+
+    def stats(self) -> pd.DataFrame:
+        self._add_runs(np.array([self.open_value], dtype=object), np.array([self.open_length]))
+        self.open_value, self.open_length = None, 0
+
+        stats = pd.DataFrame({
+            "max": self.max,
+            "mean": {outcome: self.total[outcome] / self.count[outcome] if self.count[outcome] else 0.0 for outcome in self.outcomes},
+            "count": self.count,
+        }, index=self.outcomes)
+        stats.index.name = "outcome"
+        return stats
+
+    def _add_runs(self, run_values, run_lengths):
+        for outcome in self.outcomes:
+            lengths = run_lengths[(run_values == outcome) & (run_lengths > 0)]
+            if lengths.size:
+                self.max[outcome] = max(self.max[outcome], lengths.max())
+                self.total[outcome] += lengths.sum()
+                self.count[outcome] += lengths.size
+
+class StreamingMetricsCalculator(MetricsCalculator):
+    # same metrics as MetricsCalculator, computed from csv chunks: rows are reduced to per-challenge
+    # records and streak runs as they are read, so the full export is never held in memory
+    def __init__(self, paths: Dict[str, str], chunksize: int = CHUNKSIZE, typed: bool = False):
+        super().__init__({})
+        self.paths = paths
+        self.chunksize = chunksize
+        self.typed = typed
+
+    def _chunks(self, phasename: str):
+        path = self.paths.get(phasename)
+        if path is None or not os.path.exists(path):
+            return iter(())
+        return (normalize_phase_frame(chunk, phasename) for chunk in iter_csv_chunks(path, self.chunksize, self.typed))
+
+    def _summarize_phase1_2(self, phasename: str):
+        summary = None
+        streaks = StreakAccumulator(["Passed", "Failed"])
+
+        for chunk in self._chunks(phasename):
+            summary = _add_summaries(summary, summarize_outcome_rows(chunk["Outcome"], chunk["Duration"], ["Passed", "Failed"]))
+            streaks.update(chunk["Outcome"].to_numpy())
+
+        if summary is None or summary["rows"] == 0:
+            return {"rows": 0}
+
+        summary["streaks"] = streaks.stats()
+        return summary
+
+    def _summarize_phase3(self):
+        summary = None
+        streaks = StreakAccumulator(["Payout", "Failed"])
+
+        for chunk in self._chunks("phase3"):
+            summary = _add_summaries(summary, self._summarize_phase3_rows(chunk))
+            streaks.update(chunk["Outcome"].to_numpy())
+
+        if summary is None or summary["rows"] == 0:
+            return {"rows": 0}
+
+        summary["streaks"] = streaks.stats()
+        return summary
+
+    def _summarize_challenge(self):
+        rows = 0
+        phase_tables = []
+        failed_numbers = {1: set(), 2: set()}
+
+        for chunk in self._chunks("challenge"):
+            df = self._challenge_rows(chunk)
+            rows += len(df)
+            phase_tables.append(self._challenge_phase_table(df))
+            for phase, numbers in self._failed_challenge_numbers(df).items():
+                failed_numbers[phase] |= numbers
+
+        if rows == 0:
+            return {"rows": 0}
+
+        phase_table = pd.concat(phase_tables).groupby(level=[0, 1, 2], sort=False).agg(
+            first_outcome=("first_outcome", "first"),
+            first_row=("first_row", "min"),
+            duration=("duration", "sum"),
+        )
+
+        return {
+            "rows": rows,
+            "challenge_df": self._challenge_frame_from_table(phase_table),
+            "failed_p1_count": len(failed_numbers[1]),
+            "failed_p2_count": len(failed_numbers[2]),
+        }
+
+    def _summarize_funded(self):
+        keys = ["Strategy_Pair", "Challenge Number"]
+        rows = 0
+        challenge_tables = []
+        payout_candidates = []
+        outcome_runs = []
+        payouts = []
+        monthly_pnls = []
+
+        for chunk in self._chunks("funded"):
+            df = _with_strategy_pair(chunk)
+            rows += len(df)
+
+            challenge_table, first_payouts = self._funded_challenge_table(df)
+            challenge_tables.append(challenge_table)
+            payout_candidates.append(first_payouts)
+            outcome_runs.append(_challenge_outcome_runs(df, keys))
+
+            payout_rows = df.loc[df["Outcome"] == "Payout", keys + ["Phase"]].dropna(subset=keys)
+            payouts.append(payout_rows.assign(profit=(df["Ending Balance"] - df["Start Balance"])[payout_rows.index]))
+            monthly_pnls.append(monthly_pnl(df))
+
+        if rows == 0:
+            return {"rows": 0}
+
+        challenge_table = pd.concat(challenge_tables).groupby(level=[0, 1]).agg(
+            Duration=("Duration", "sum"),
+            Base_Duration=("Base_Duration", "sum"),
+            Payouts=("Payouts", "sum"),
+            Profit=("Profit", "sum"),
+            Last_Date=("Last_Date", "max"),
+        )
+        first_payouts = self._first_payouts(pd.concat(payout_candidates))
+        challenge_df = self._funded_frame_from_table(challenge_table, first_payouts)
+        challenge_df = challenge_df.sort_values("Resolution_Date").reset_index(drop=True)
+
+        # runs of neighbouring chunks meet again once put back in (strategy, challenge, phase) order
+        runs = pd.concat(outcome_runs).sort_values(keys + ["Phase"], kind="stable")
+        run_values = runs["Outcome"].to_numpy()
+        starts = np.flatnonzero(np.concatenate(([True], run_values[1:] != run_values[:-1])))
+        payout_streaks = run_stats(run_values[starts], np.add.reduceat(runs["length"].to_numpy(), starts), ["Payout"])
+
+        # summed one challenge after the other with python floats, in the order MetricsCalculator adds them up
+        payout_profits = pd.concat(payouts).sort_values(keys + ["Phase"], kind="stable")["profit"].tolist()
+
+        return {
+            "rows": rows,
+            "challenge_df": challenge_df,
+            "payout_streaks": payout_streaks,
+            "payout_profit_sum": sum(payout_profits),
+            "payout_profit_count": len(payout_profits),
+            "monthly_pnl": pd.concat(monthly_pnls).groupby(level=0).sum(),
+        }
+
+def _challenge_outcome_runs(df: pd.DataFrame, keys) -> pd.DataFrame:
+    # outcome runs of one chunk in (strategy, challenge, phase) order, split at challenge boundaries
+    df_sorted = df.sort_values(keys + ["Phase"])
+    group_ids = df_sorted.groupby(keys, sort=False).ngroup().to_numpy()
+    run_values, run_lengths, _ = run_length_encode(df_sorted["Outcome"].to_numpy(), group_ids)
+    starts = np.cumsum(run_lengths) - run_lengths
+
+    runs = df_sorted.iloc[starts][keys + ["Phase"]].reset_index(drop=True)
+    runs["Outcome"] = run_values
+    runs["length"] = run_lengths
+    return runs
+
+def _add_summaries(total, summary):
+    if total is None:
+        return summary
+
+    for key, value in summary.items():
+        if isinstance(value, dict):
+            for name, item in value.items():
+                total[key][name] += item
+        else:
+            total[key] += value
+    return total
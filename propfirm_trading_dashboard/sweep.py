@@ -0,0 +1,187 @@
+import itertools
+import numpy as np
+import pandas as pd
+from propfirm_trading_dashboard.metrics import MetricsCalculator
+from propfirm_trading_dashboard.phase_frames import FAILED_CHALLENGE_COST, PROFIT_SPLIT, normalize_phase_frames
+
+SCENARIO_COLUMNS = ["cost", "split", "payout_cap"]
+
+def capped_segment_sums(amounts, segments, n_segments: int, caps) -> np.ndarray:
+    # sum of min(amount, cap) per segment for every cap, shape (caps, segments), from one sort and prefix sum:
+    # amounts are laid out segment after segment (ascending inside), so one searchsorted finds every cut
+    amounts = np.asarray(amounts, dtype=float)
+    segments = np.asarray(segments)
+    caps = np.asarray(caps, dtype=float)
+    if amounts.size == 0:
+        return np.zeros((caps.size, n_segments))
+
+    order = np.lexsort((amounts, segments))
+    amounts, segments = amounts[order], segments[order]
+    prefix = np.concatenate(([0.0], np.cumsum(amounts)))
+    starts = np.searchsorted(segments, np.arange(n_segments))
+    ends = np.searchsorted(segments, np.arange(n_segments), side="right")
+
+    # segment s holds keys s * width + [0, high - low]; caps are clipped to [low - 1, high] (cutting all or none
+    # of the amounts, like the caps beyond them), so every cut key stays inside its own segment's key range
+    low, high = amounts.min(), amounts.max()
+    width = high - low + 2
+    keys = (amounts - low) + segments * width
+    cut_keys = (np.clip(caps, low - 1, high) - low)[:, None] + np.arange(n_segments)[None, :] * width
+    cuts = np.clip(np.searchsorted(keys, cut_keys, side="right"), starts, ends)
+
+    # a cap only cuts amounts when it is below the largest one, so min(cap, high) keeps infinite caps out of 0 * inf
+    return prefix[cuts] - prefix[starts] + np.minimum(caps, high)[:, None] * (ends - cuts)
+
+def monthly_ratio_metrics(month_pnl, efficiency) -> dict:
+    # the m_ metrics of MetricsCalculator._calculate_metrics_funded (and their rounding) over the last axis of a
+    # batch of monthly PnL vectors; months with no PnL at all count as neither winning nor losing
+    winning = (month_pnl > 0).sum(axis=-1)
+    losing = (month_pnl < 0).sum(axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        winrate = np.where(winning + losing > 0, np.round(winning / (winning + losing) * 100, 2), 0)
+        average_profit = np.where(winning > 0, np.round(np.where(month_pnl > 0, month_pnl, 0).sum(axis=-1) / winning, 2), 0)
+        average_loss = np.where(losing > 0, np.round(np.where(month_pnl < 0, month_pnl, 0).sum(axis=-1) / losing, 2), 0)
+        wl_ratio = np.where(losing > 0, np.round(winning / losing, 2), np.inf)
+        stability = np.where(average_loss != 0, np.round((winrate / 100) * average_profit / np.abs(average_loss), 2), 0)
+
+    return {
+        "m_winning_months": winning,
+        "m_losing_months": losing,
+        "m_monthly_winrate": winrate,
+        "m_average_monthly_profit": average_profit,
+        "m_average_monthly_loss": average_loss,
+        "m_monthly_wl_ratio": wl_ratio,
+        "m_monthly_stability_return_ratio": stability,
+        "m_overall_risk_adjusted_returns": np.round(efficiency * stability, 2),
+    }
+
+class EconomicsSweep:
+    # loads nothing itself: the frames are normalized once and reduced to what the fee-, split- and
+    # cap-dependent metrics need, so evaluating a grid of scenarios never touches the rows again
+    def __init__(self, dfs):
+        self.dfs = normalize_phase_frames(dfs)
+        phases = [phase for phase in ["phase3", "funded"] if phase in self.dfs and not self.dfs[phase].empty]
+        self.metrics = MetricsCalculator(self.dfs).calculate_metrics(phases)
+
+        if "phase3" in self.metrics:
+            phase3 = self.dfs["phase3"]
+            self.phase3_payouts = _payout_amounts(phase3)
+
+        if "funded" in self.metrics:
+            funded = self.dfs["funded"]
+            is_payout = (funded["Outcome"] == "Payout").to_numpy()
+            is_failed = (funded["Outcome"] == "Failed").to_numpy()
+            amounts = (funded["Ending Balance"] - funded["Start Balance"]).to_numpy()
+            self.funded_payouts = amounts[is_payout]
+
+            # the months of metrics.monthly_pnl (NaT rows form their own month there)
+            months, self.month_names = pd.factorize(funded["End Phase Date"].dt.to_period("M").astype(str))
+            self.month_payouts = (self.funded_payouts, months[is_payout])
+            self.month_failed = np.bincount(months[is_failed], minlength=len(self.month_names))
+
+            # the (Year, Month) rows of build_monthly_pnl, which only splits positive PnL and drops rows without a date
+            dates = funded["End Phase Date"]
+            dated = dates.notna().to_numpy()
+            year_months, self.table_months = pd.factorize(dates.dt.year[dated].astype(int) * 12 + dates.dt.month[dated].astype(int) - 1)
+            table_rows = np.full(len(funded), -1)
+            table_rows[dated] = year_months
+            positive = is_payout & dated & (amounts > 0)
+            flat = is_payout & dated & (amounts <= 0)
+            self.table_payouts = (amounts[positive], table_rows[positive])
+            self.table_flat = np.bincount(table_rows[flat], weights=amounts[flat], minlength=len(self.table_months))
+            self.table_failed = np.bincount(table_rows[is_failed & dated], minlength=len(self.table_months))
+
+    def evaluate(self, costs=(FAILED_CHALLENGE_COST,), splits=(PROFIT_SPLIT,), payout_caps=(np.inf,)) -> dict:
+        # every (cost, split, payout cap) combination: "metrics" has one row per scenario, "monthly" one row per
+        # scenario and month (Year, Month, PnL, so pivot_monthly_pnl turns one scenario into the report table)
+        costs = np.asarray(costs, dtype=float)
+        splits = np.asarray(splits, dtype=float)
+        caps = np.asarray([np.inf if cap is None else cap for cap in payout_caps], dtype=float)
+        if (costs <= 0).any() or (caps <= 0).any():
+            raise ValueError("Challenge costs and payout caps must be positive")
+
+        # metrics vary with (cost, cap) and are repeated for every split
+        columns = {}
+        if "phase3" in self.metrics:
+            columns.update(self._phase3_metrics(costs, caps))
+        if "funded" in self.metrics:
+            columns.update(self._funded_metrics(costs, caps))
+
+        scenarios = pd.DataFrame(list(itertools.product(costs, splits, caps)), columns=SCENARIO_COLUMNS)
+        cost_index, _, cap_index = np.unravel_index(np.arange(len(scenarios)), (costs.size, splits.size, caps.size))
+        metrics = scenarios.assign(**{name: values[cost_index, cap_index] for name, values in columns.items()})
+
+        monthly = self._monthly_table(costs, splits, caps)
+        if monthly is not None:
+            metrics["m_total_net_pnl"] = monthly.sum(axis=1).reshape(-1)
+            months = np.asarray(self.table_months)
+            monthly = scenarios.loc[scenarios.index.repeat(len(months))].reset_index(drop=True).assign(
+                Year=np.tile(months // 12, len(scenarios)),
+                Month=np.tile(months % 12 + 1, len(scenarios)),
+                PnL=monthly.reshape(-1),
+            )
+        else:
+            monthly = pd.DataFrame(columns=SCENARIO_COLUMNS + ["Year", "Month", "PnL"])
+
+        return {"metrics": metrics, "monthly": monthly}
+
+    def _phase3_metrics(self, costs, caps) -> dict:
+        # same formulas (and intermediate rounding) as MetricsCalculator._calculate_metrics_phase3
+        base = self.metrics["phase3"]
+        count = base["p3_number_payouts"]
+        total = capped_segment_sums(self.phase3_payouts, np.zeros(len(self.phase3_payouts), dtype=int), 1, caps)[:, 0]
+
+        average_profit = np.round(total / count, 2) if count else np.zeros_like(total)
+        total_profit = np.round(total, 2) if count else np.zeros_like(total)
+        total_loss = base["p3_number_failed_challenges"] * costs
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            profit_factor = np.where(total_loss[:, None] != 0, np.round(total_profit[None, :] / total_loss[:, None], 2), np.inf)
+        return {
+            "p3_average_profit_payout": np.broadcast_to(average_profit, (costs.size, caps.size)),
+            "p3_total_profit_payouts": np.broadcast_to(total_profit, (costs.size, caps.size)),
+            "p3_total_loss_payouts": np.broadcast_to(total_loss[:, None], (costs.size, caps.size)),
+            "p3_profit_factor": profit_factor,
+            "p3_profitability_ratio": np.round((base["p3_payout_winrate"] / 100 * average_profit[None, :]) / costs[:, None] * 10, 2),
+        }
+
+    def _funded_metrics(self, costs, caps) -> dict:
+        # same formulas (and intermediate rounding) as MetricsCalculator._calculate_metrics_funded; every payout
+        # belongs to a passed challenge and every failed challenge costs one fee
+        base = self.metrics["funded"]
+        challenges = base["f_number_challenges"]
+        failed = base["f_number_failed_challenges"]
+        payouts = len(self.funded_payouts)
+
+        total = capped_segment_sums(self.funded_payouts, np.zeros(payouts, dtype=int), 1, caps)[:, 0]
+        average_profit_payout = np.round(total / payouts, 2) if payouts else np.zeros_like(total)
+        average_profit_challenge = np.round((total[None, :] - failed * costs[:, None]) / challenges, 2)
+        profitability = np.round(
+            (base["f_payout_winrate"] / 100) * base["f_average_payouts_challenge"] * average_profit_payout[None, :] / costs[:, None], 2
+        )
+        efficiency = np.round(average_profit_challenge / failed, 2) if failed else np.zeros_like(average_profit_challenge)
+
+        # monthly PnL without the split, as in the m_ metrics: capped payouts minus the fees of that month
+        month_pnl = capped_segment_sums(*self.month_payouts, len(self.month_names), caps)[None, :, :] - costs[:, None, None] * self.month_failed
+
+        return {
+            "f_average_profit_payout": np.broadcast_to(average_profit_payout, (costs.size, caps.size)),
+            "f_average_profit_challenge": average_profit_challenge,
+            "f_profitability_ratio": profitability,
+            "f_challenge_efficiency_ratio": efficiency,
+            **monthly_ratio_metrics(month_pnl, efficiency),
+        }
+
+    def _monthly_table(self, costs, splits, caps):
+        # build_monthly_pnl for every scenario, shape (costs, splits, caps, months)
+        if "funded" not in self.metrics:
+            return None
+        payouts = capped_segment_sums(*self.table_payouts, len(self.table_months), caps)
+        return (
+            splits[None, :, None, None] * payouts[None, None, :, :]
+            + self.table_flat
+            - costs[:, None, None, None] * self.table_failed
+        ).reshape(costs.size * splits.size * caps.size, -1)
+
+def _payout_amounts(df: pd.DataFrame) -> np.ndarray:
+    return (df["Ending Balance"] - df["Start Balance"]).to_numpy()[(df["Outcome"] == "Payout").to_numpy()]
@@ -0,0 +1,79 @@
+import shutil
+from pathlib import Path
+from propfirm_trading_dashboard import cli
+from propfirm_trading_dashboard.cli import find_strategy_folders, main
+from propfirm_trading_dashboard.metrics_store import MetricsStore
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+def test_find_strategy_folders():
+    folders = find_strategy_folders(["*USDJPY*", "HourBreakout_*"], DATA_DIR)
+
+    assert folders == ["HourBreakout_USDJPY_", "MiddleRange_USDJPY_", "HourBreakout_GBPUSD_"]
+
+def test_batch_writes_one_report_per_folder(tmp_path, capsys):
+    exit_code = main(["*", "--data-dir", str(DATA_DIR), "--output-dir", str(tmp_path / "out"), "--jobs", "2", "--no-cache"])
+
+    assert exit_code == 0
+    assert sorted(path.name for path in (tmp_path / "out").iterdir()) == [
+        "HourBreakout_GBPUSD_.html", "HourBreakout_USDJPY_.html", "MiddleRange_USDJPY_.html",
+    ]
+    assert "3 reports written, 0 failed" in capsys.readouterr().out
+
+def test_batch_store_writes_the_workers_metrics(tmp_path, capsys, monkeypatch):
+    def fail(dfs, cache=None):
+        raise AssertionError("metrics recomputed")
+    monkeypatch.setattr("propfirm_trading_dashboard.metrics_store.MetricsCalculator", fail)
+    store_path = tmp_path / "metrics.sqlite"
+
+    exit_code = main(["*", "--data-dir", str(DATA_DIR), "--output-dir", str(tmp_path / "out"), "--jobs", "2", "--no-cache", "--store", str(store_path)])
+
+    assert exit_code == 0
+    assert f"Metrics store {store_path}: 3 of 3 folders updated" in capsys.readouterr().out
+    with MetricsStore(store_path) as store:
+        assert list(store.rank("f_average_profit_challenge")["value"]) == [1255.55, 972.86, 793.32]
+
+def test_batch_reports_failures(tmp_path, capsys):
+    data_dir = tmp_path / "data"
+    shutil.copytree(DATA_DIR / "HourBreakout_GBPUSD_", data_dir / "HourBreakout_GBPUSD_")
+    (data_dir / "Broken_EURUSD_1").mkdir()
+
+    exit_code = main(["*", "--data-dir", str(data_dir), "--output-dir", str(tmp_path / "out"), "--no-cache"])
+
+    out = capsys.readouterr().out
+    assert exit_code == 1
+    assert "1 reports written, 1 failed" in out
+    assert "Broken_EURUSD_1: FileNotFoundError" in out
+
+def test_interactive_mode_uses_data_dir(tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    shutil.copytree(DATA_DIR / "HourBreakout_GBPUSD_", data_dir / "HourBreakout_GBPUSD_")
+    answers = iter(["1", "HourBreakout_GBPUSD_", "2", "q"])
+    calls = []
+    monkeypatch.setattr("builtins.input", lambda prompt: next(answers))
+    monkeypatch.setattr(cli, "run_single_simulation", lambda folder, phases, **options: calls.append((folder, options["base_path"])))
+    monkeypatch.setattr(cli, "run_joined_simulation", lambda base_path, phases, **options: calls.append(("joined", base_path)))
+
+    assert main(["--data-dir", str(data_dir), "--no-cache"]) == 0
+    assert calls == [("HourBreakout_GBPUSD_", str(data_dir)), ("joined", str(data_dir))]
+
+def test_no_matching_folders(tmp_path):
+    assert main(["Nothing_*", "--data-dir", str(DATA_DIR), "--output-dir", str(tmp_path), "--no-cache"]) == 1
+
+def test_resample_prints_intervals_without_reports(tmp_path, capsys):
+    exit_code = main(["HourBreakout_GBPUSD_", "--data-dir", str(DATA_DIR), "--output-dir", str(tmp_path / "out"), "--resample", "200", "--block-size", "--seed", "1", "--no-cache"])
+
+    out = capsys.readouterr().out
+    assert exit_code == 0
+    assert "HourBreakout_GBPUSD_: 200 block paths, 90% intervals" in out
+    assert "f_profitability_ratio" in out
+    assert not (tmp_path / "out").exists()
+
+def test_portfolio_prints_ranked_combinations(tmp_path, capsys):
+    exit_code = main(["*_USDJPY_", "--data-dir", str(DATA_DIR), "--output-dir", str(tmp_path / "out"), "--portfolio", "m_monthly_winrate", "--no-cache"])
+
+    out = capsys.readouterr().out
+    assert exit_code == 0
+    assert "Best of 2 folders by m_monthly_winrate (auto search)" in out
+    assert "HourBreakout_USDJPY_ + MiddleRange_USDJPY_" in out
+    assert not (tmp_path / "out").exists()
@@ -0,0 +1,114 @@
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+import pytest
+from pathlib import Path
+from propfirm_trading_dashboard.csv_parser import load_csv_file
+from propfirm_trading_dashboard.csv_cache import CACHE_DIR, ParsedCsvCache
+
+pytest.importorskip("pyarrow")
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+PHASES = ["phase1", "phase2", "phase3", "challenge", "funded"]
+
+class CountingLoader:
+    def __init__(self, typed=False):
+        self.calls = 0
+        self.typed = typed
+
+    def __call__(self, path):
+        self.calls += 1
+        return load_csv_file(path, typed=self.typed)
+
+def copy_sample(tmp_path, phase="phase1"):
+    target = tmp_path / f"{phase}.csv"
+    shutil.copy(DATA_DIR / "HourBreakout_GBPUSD_" / f"{phase}.csv", target)
+    return target
+
+def test_cache_hit_skips_loader(tmp_path):
+    csv_path = copy_sample(tmp_path)
+    cache = ParsedCsvCache(tmp_path / "cache")
+    loader = CountingLoader()
+
+    first = cache.load(csv_path, loader)
+    second = cache.load(csv_path, loader)
+
+    assert loader.calls == 1
+    pd.testing.assert_frame_equal(first, second)
+
+def test_cache_roundtrip_keeps_typed_schema(tmp_path):
+    csv_path = copy_sample(tmp_path, "funded")
+    cache = ParsedCsvCache(tmp_path / "cache")
+
+    expected = load_csv_file(csv_path, typed=True)
+    load_csv_file(csv_path, typed=True, cache=cache)
+    cached = load_csv_file(csv_path, typed=True, cache=cache)
+
+    pd.testing.assert_frame_equal(cached, expected)
+
+def test_changed_file_is_reparsed(tmp_path):
+    csv_path = copy_sample(tmp_path)
+    cache = ParsedCsvCache(tmp_path / "cache")
+    loader = CountingLoader()
+    cache.load(csv_path, loader)
+
+    lines = csv_path.read_text(encoding="utf-16").splitlines()
+    csv_path.write_text("\n".join(lines[:10]) + "\n", encoding="utf-16")
+    df = cache.load(csv_path, loader)
+
+    assert loader.calls == 2
+    assert len(df) == 9
+
+def test_touched_file_with_same_content_hits(tmp_path):
+    csv_path = copy_sample(tmp_path)
+    cache = ParsedCsvCache(tmp_path / "cache")
+    loader = CountingLoader()
+    cache.load(csv_path, loader)
+
+    stat = csv_path.stat()
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    cache.load(csv_path, loader)
+
+    assert loader.calls == 1
+
+def test_eviction_keeps_cache_under_limit(tmp_path):
+    cache = ParsedCsvCache(tmp_path / "cache", max_bytes=1)
+    loader = CountingLoader()
+
+    for phase in ["phase1", "phase2", "phase3"]:
+        cache.load(copy_sample(tmp_path, phase), loader)
+
+    assert len(list((tmp_path / "cache").glob("*.feather"))) == 1
+
+def test_clear(tmp_path):
+    csv_path = copy_sample(tmp_path)
+    cache = ParsedCsvCache(tmp_path / "cache")
+    loader = CountingLoader()
+    cache.load(csv_path, loader)
+
+    cache.clear()
+    cache.load(csv_path, loader)
+
+    assert loader.calls == 2
+
+def load_in_worker(cache, csv_path):
+    return len(cache.load(csv_path, load_csv_file))
+
+def test_process_pool_workers_share_the_cache(tmp_path):
+    paths = [copy_sample(tmp_path, phase) for phase in PHASES]
+    cache = ParsedCsvCache(tmp_path / "cache")
+
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        list(pool.map(load_in_worker, [cache] * (2 * len(paths)), paths * 2))
+
+    loader = CountingLoader()
+    for path in paths:
+        cache.load(path, loader)
+
+    assert loader.calls == 0
+    assert len(list((tmp_path / "cache").glob("*.feather"))) == len(paths)
+    assert not list((tmp_path / "cache").rglob("*.tmp"))
+
+def test_default_cache_dir_does_not_depend_on_cwd():
+    assert CACHE_DIR.is_absolute()
@@ -0,0 +1,120 @@
+import pandas as pd
+import pytest
+from pathlib import Path
+from propfirm_trading_dashboard.csv_parser import load_csv_file, iter_csv_chunks, validate_columns, validate_values, REQUIRED_COLUMNS
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+def write_mt5_csv(path, rows):
+    lines = ["\t".join(REQUIRED_COLUMNS)] + ["\t".join(row) for row in rows]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-16")
+
+def test_typed_loader_schema():
+    df = load_csv_file(DATA_DIR / "HourBreakout_GBPUSD_" / "funded.csv", typed=True)
+
+    assert df["Challenge Number"].dtype == "int64"
+    assert df["Phase"].dtype == "int64"
+    assert df["Duration"].dtype == "float64"
+    assert df["Ending Balance"].dtype == "float64"
+    assert isinstance(df["Outcome"].dtype, pd.CategoricalDtype)
+    assert isinstance(df["Reason"].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_datetime64_any_dtype(df["Start Phase Date"])
+    assert pd.api.types.is_datetime64_any_dtype(df["End Phase Date"])
+
+def test_typed_loader_matches_inferred_values():
+    path = DATA_DIR / "HourBreakout_USDJPY_" / "challenge.csv"
+    inferred = load_csv_file(path)
+    typed = load_csv_file(path, typed=True)
+
+    assert len(typed) == len(inferred)
+    assert (typed["Outcome"].astype(str) == inferred["Outcome"]).all()
+    assert (typed["Duration"] == inferred["Duration"].astype(float)).all()
+    assert (typed["End Phase Date"] == pd.to_datetime(inferred["End Phase Date"], format="%Y.%m.%d")).all()
+
+def test_typed_loader_missing_date(tmp_path):
+    path = tmp_path / "phase1.csv"
+    write_mt5_csv(path, [
+        ["1", "2013.01.01", "2013.01.15", "1", "Passed", "Profit Target", "14", "10000.00", "10801.24", "9000.00", "10800.00", "54.60"],
+        ["2", "2013.01.15", "", "1", "Failed", "Max Drawdown", "6", "10801.24", "9801.24", "9801.24", "11601.24", "27.84"],
+    ])
+
+    df = load_csv_file(path, typed=True)
+
+    assert df["End Phase Date"].iloc[0] == pd.Timestamp("2013-01-15")
+    assert pd.isna(df["End Phase Date"].iloc[1])
+
+@pytest.mark.parametrize("typed", [False, True])
+def test_csv_chunks_match_full_file(typed):
+    path = DATA_DIR / "HourBreakout_USDJPY_" / "challenge.csv"
+    full = load_csv_file(path, typed=typed)
+    chunks = list(iter_csv_chunks(path, chunksize=50, typed=typed))
+
+    assert len(chunks) > 1
+    assert chunks[1].index[0] == 50
+    combined = pd.concat(chunks)
+    pd.testing.assert_frame_equal(combined[["Challenge Number", "Duration"]], full[["Challenge Number", "Duration"]])
+    assert (combined["End Phase Date"] == full["End Phase Date"]).all()
+
+def test_validate_columns_missing():
+    df = pd.DataFrame({"Challenge Number": [1], "Phase": [1]})
+
+    with pytest.raises(ValueError, match="missing required columns"):
+        validate_columns(df)
+
+@pytest.mark.parametrize("typed", [False, True])
+def test_validate_values_sample_data(typed):
+    for folder in sorted(p for p in DATA_DIR.iterdir() if p.is_dir()):
+        for path in sorted(folder.glob("*.csv")):
+            validate_values(load_csv_file(path, typed=typed))
+
+def test_validate_values_reports_lines(tmp_path):
+    path = tmp_path / "funded.csv"
+    write_mt5_csv(path, [
+        ["1", "2013.01.01", "2013.01.15", "1", "Passed", "Profit Target", "14", "10000.00", "10801.24", "9000.00", "10800.00", "54.60"],
+        ["1", "2013.01.15", "2013-02-01", "2", "Passed", "Profit Target", "abc", "10801.24", "11341.30", "9721.12", "11341.30", "12.10"],
+        ["1", "2013.02.01", "", "4", "Win", "Payout", "9", "11341.30", "-5.00", "10207.17", "11795.00", "8.00"],
+    ])
+    df = load_csv_file(path)
+
+    with pytest.raises(ValueError) as error:
+        validate_values(df, path)
+
+    message = str(error.value)
+    assert message.startswith(f"{path} has invalid values")
+    assert "non-numeric Duration at lines [3]" in message
+    # the empty date on line 4 is allowed
+    assert "unparseable End Phase Date (expected %Y.%m.%d) at lines [3];" in message
+    assert "Outcome not in ['Passed', 'Failed', 'Payout'] at lines [4]" in message
+    assert "Phase not in [1, 2, 3] at lines [4]" in message
+    assert "negative Ending Balance at lines [4]" in message
+
+def test_validate_values_fails_chunks_and_typed_loads(tmp_path):
+    path = tmp_path / "phase1.csv"
+    rows = [["1", "2013.01.01", "2013.01.15", "1", "Passed", "Profit Target", "14", "10000.00", "10801.24", "9000.00", "10800.00", "54.60"]] * 30
+    write_mt5_csv(path, rows + [["31", "2013.01.01", "15/01/2013", "1", "Passed", "Profit Target", "14", "10000.00", "10801.24", "9000.00", "10800.00", "54.60"]])
+
+    with pytest.raises(ValueError, match=r"unparseable End Phase Date .* at lines \[32\]"):
+        list(iter_csv_chunks(path, chunksize=10))
+    with pytest.raises(ValueError, match=r"at lines \[32\]"):
+        load_csv_file(path, typed=True)
+
+@pytest.mark.parametrize("cell", ["abc", ""])
+def test_typed_loads_report_unconvertible_cells(tmp_path, cell):
+    path = tmp_path / "phase1.csv"
+    rows = [["1", "2013.01.01", "2013.01.15", "1", "Passed", "Profit Target", "14", "10000.00", "10801.24", "9000.00", "10800.00", "54.60"]] * 30
+    write_mt5_csv(path, rows + [[cell, "2013.01.01", "2013.01.15", "1", "Passed", "Profit Target", "14", "10000.00", "10801.24", "9000.00", "10800.00", "54.60"]])
+
+    match = r"(non-numeric|missing) Challenge Number at lines \[32\]"
+    with pytest.raises(ValueError, match=match):
+        load_csv_file(path, typed=True)
+    with pytest.raises(ValueError, match=match):
+        list(iter_csv_chunks(path, chunksize=10, typed=True))
+
+def test_validate_values_limits_reported_lines():
+    df = pd.DataFrame({col: [1] * 25 for col in REQUIRED_COLUMNS})
+    df["Outcome"] = "Passed"
+    df["Start Phase Date"] = df["End Phase Date"] = "2013.01.01"
+    df["Start Balance"] = -1.0
+
+    with pytest.raises(ValueError, match=r"negative Start Balance at lines \[2, 3, .*, 11\] and 15 more$"):
+        validate_values(df)
@@ -0,0 +1,74 @@
+import os
+import shutil
+import pandas as pd
+from pathlib import Path
+from propfirm_trading_dashboard import incremental_join
+from propfirm_trading_dashboard.incremental_join import IncrementalMetricsCalculator, load_incremental_phases
+from propfirm_trading_dashboard.csv_cache import CACHE_ROOT
+from propfirm_trading_dashboard.multi_strategy_loader import load_joined_phases
+from propfirm_trading_dashboard.simulation_run import build_monthly_pnl, build_runs_table, pivot_monthly_pnl
+from propfirm_trading_dashboard.metrics import MetricsCalculator
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+PHASES = ["phase1", "phase2", "phase3", "challenge", "funded"]
+
+def copy_data(tmp_path):
+    target = tmp_path / "data"
+    shutil.copytree(DATA_DIR, target)
+    return target
+
+def test_incremental_matches_full_join(tmp_path):
+    data_dir = copy_data(tmp_path)
+    df_dict, monthly_pnl, rebuilt, records = load_incremental_phases(data_dir, PHASES, partials_dir=tmp_path / "partials")
+    full = load_joined_phases(data_dir, PHASES)
+
+    assert len(rebuilt) == 3
+    expected = MetricsCalculator(full)
+    merged = IncrementalMetricsCalculator(df_dict, records)
+    assert merged.calculate_metrics() == expected.calculate_metrics()
+    for phase in ["challenge", "funded"]:
+        pd.testing.assert_frame_equal(merged.summaries[phase]["challenge_df"], expected.summaries[phase]["challenge_df"])
+
+    expected_monthly = build_monthly_pnl(build_runs_table(full)["funded"])
+    pd.testing.assert_frame_equal(pivot_monthly_pnl(monthly_pnl).reset_index(drop=True), expected_monthly.reset_index(drop=True), check_dtype=False)
+
+def test_only_changed_folders_are_rebuilt(tmp_path):
+    data_dir = copy_data(tmp_path)
+    partials_dir = tmp_path / "partials"
+    load_incremental_phases(data_dir, PHASES, partials_dir=partials_dir)
+
+    _, _, rebuilt, _ = load_incremental_phases(data_dir, PHASES, partials_dir=partials_dir)
+    assert rebuilt == []
+
+    changed = data_dir / "MiddleRange_USDJPY_" / "funded.csv"
+    stat = changed.stat()
+    os.utime(changed, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    _, _, rebuilt, _ = load_incremental_phases(data_dir, PHASES, partials_dir=partials_dir)
+    assert rebuilt == ["MiddleRange_USDJPY_"]
+    assert len(list((partials_dir / "MiddleRange_USDJPY_").glob("*.pkl"))) == 1
+
+def test_metrics_merge_the_folder_records(tmp_path, monkeypatch):
+    data_dir = copy_data(tmp_path)
+    df_dict, _, _, records = load_incremental_phases(data_dir, PHASES, partials_dir=tmp_path / "partials")
+    expected = MetricsCalculator(load_joined_phases(data_dir, PHASES)).calculate_metrics(["challenge", "funded"])
+
+    def fail(self, df, index=None):
+        raise AssertionError("challenges rebuilt from the joined rows")
+    monkeypatch.setattr(MetricsCalculator, "_build_challenge_frame", fail)
+    monkeypatch.setattr(MetricsCalculator, "_build_funded_challenge_frame", fail)
+
+    assert IncrementalMetricsCalculator(df_dict, records).calculate_metrics(["challenge", "funded"]) == expected
+
+def test_partials_of_removed_folders_are_pruned(tmp_path):
+    data_dir = copy_data(tmp_path)
+    partials_dir = tmp_path / "partials"
+    load_incremental_phases(data_dir, PHASES, partials_dir=partials_dir)
+
+    shutil.rmtree(data_dir / "HourBreakout_GBPUSD_")
+    load_incremental_phases(data_dir, PHASES, partials_dir=partials_dir)
+
+    assert sorted(path.name for path in partials_dir.iterdir()) == ["HourBreakout_USDJPY_", "MiddleRange_USDJPY_"]
+
+def test_partials_live_in_the_project_cache():
+    assert incremental_join.PARTIALS_DIR == CACHE_ROOT / "partials"
@@ -0,0 +1,93 @@
+import json
+import pytest
+from pathlib import Path
+from propfirm_trading_dashboard.instrumentation import NO_PROFILER, PipelineProfiler
+from propfirm_trading_dashboard.simulation_run import run_joined_simulation, run_single_simulation
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+PHASES = ["phase1", "phase2", "phase3", "challenge", "funded"]
+
+STAGES = [
+    "load", "validate", "normalize",
+    "metrics phase1", "metrics phase2", "metrics phase3", "metrics challenge", "metrics funded",
+    "runs table", "monthly pnl", "render",
+]
+
+def test_stage_records_times_and_rows():
+    profiler = PipelineProfiler()
+
+    with profiler.section("report"):
+        with profiler.stage("load", files=2) as stage:
+            sum(range(100_000))
+            stage["rows"] = 42
+
+    [record] = profiler.stages
+    assert record["name"] == "load"
+    assert record["section"] == "report"
+    assert record["rows"] == 42 and record["files"] == 2
+    assert record["wall"] > 0 and record["cpu"] >= 0
+    assert "report: load" in profiler.summary()
+
+def test_stage_is_recorded_when_it_raises():
+    profiler = PipelineProfiler()
+
+    with pytest.raises(ValueError):
+        with profiler.stage("validate"):
+            raise ValueError("missing columns")
+
+    assert [record["name"] for record in profiler.stages] == ["validate"]
+
+def test_disabled_profiler_records_nothing():
+    with NO_PROFILER.stage("load") as stage:
+        stage["rows"] = 1
+
+    assert NO_PROFILER.stages == []
+
+def test_single_simulation_stages(tmp_path):
+    profiler = PipelineProfiler()
+
+    run_single_simulation("HourBreakout_GBPUSD_", PHASES, base_path=DATA_DIR, output_dir=tmp_path, profiler=profiler)
+
+    assert [record["name"] for record in profiler.stages] == STAGES
+    assert {record["section"] for record in profiler.stages} == {"HourBreakout_GBPUSD_"}
+    assert profiler.stages[0]["rows"] == profiler.stages[1]["rows"] > 0
+
+def test_rolling_metrics_only_run_for_trends(tmp_path):
+    (tmp_path / "trends").mkdir()
+    (tmp_path / "plain").mkdir()
+    profiler = PipelineProfiler()
+
+    run_single_simulation("HourBreakout_GBPUSD_", PHASES, trends=True, base_path=DATA_DIR, output_dir=tmp_path / "trends", profiler=profiler)
+    run_single_simulation("HourBreakout_GBPUSD_", PHASES, base_path=DATA_DIR, output_dir=tmp_path / "plain")
+
+    assert [record["name"] for record in profiler.stages] == STAGES[:8] + ["rolling metrics"] + STAGES[8:]
+    assert "window.ROLLING_METRICS =" in (tmp_path / "trends" / "HourBreakout_GBPUSD_.html").read_text(encoding="utf-8")
+    assert "window.ROLLING_METRICS =" not in (tmp_path / "plain" / "HourBreakout_GBPUSD_.html").read_text(encoding="utf-8")
+
+def test_typed_loads_are_validated_once(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr("propfirm_trading_dashboard.csv_parser.validate_frame", lambda df, source=None: calls.append(source))
+    monkeypatch.setattr("propfirm_trading_dashboard.simulation_run.validate_frame", lambda df, source=None: calls.append(source))
+    profiler = PipelineProfiler()
+
+    run_single_simulation("HourBreakout_GBPUSD_", PHASES, typed=True, base_path=DATA_DIR, output_dir=tmp_path, profiler=profiler)
+
+    assert len(calls) == len(PHASES)
+    assert [record["name"] for record in profiler.stages] == [stage for stage in STAGES if stage != "validate"]
+
+def test_joined_simulation_writes_traces(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "reports").mkdir()
+    profiler = PipelineProfiler()
+
+    run_joined_simulation(DATA_DIR, PHASES, profiler=profiler)
+
+    assert [record["name"] for record in profiler.stages] == ["load", "validate", "merge"] + STAGES[2:]
+
+    stages = json.loads(profiler.write_json(tmp_path / "stages.json").read_text())["stages"]
+    trace = json.loads(profiler.write_chrome_trace(tmp_path / "trace.json").read_text())
+    durations = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+
+    assert len(stages) == len(durations) == len(profiler.stages)
+    assert durations[0]["name"].endswith(": load")
+    assert all(event["dur"] >= 0 and event["ts"] >= 0 for event in durations)
@@ -0,0 +1,99 @@
+import pytest
+from pathlib import Path
+from propfirm_trading_dashboard.csv_parser import load_csv_file
+from propfirm_trading_dashboard import metrics
+from propfirm_trading_dashboard.metrics import MetricsCalculator, PhaseMetricsCache
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+PHASES = ["phase1", "phase2", "phase3", "challenge", "funded"]
+
+def load_folder(folder="HourBreakout_GBPUSD_"):
+    return {phase: load_csv_file(DATA_DIR / folder / f"{phase}.csv") for phase in PHASES}
+
+class CountingCalculator(MetricsCalculator):
+    calls = []
+
+    def _calculate_metrics_funded(self):
+        self.calls.append("funded")
+        return super()._calculate_metrics_funded()
+
+    def _calculate_metrics_phase1_2(self, phasename):
+        self.calls.append(phasename)
+        return super()._calculate_metrics_phase1_2(phasename)
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    CountingCalculator.calls = []
+
+def test_only_requested_phases_run():
+    results = CountingCalculator(load_folder(), cache=None).calculate_metrics(phases=["funded"])
+
+    assert list(results) == ["funded"]
+    assert CountingCalculator.calls == ["funded"]
+
+def test_unknown_phase():
+    with pytest.raises(ValueError, match="Unknown phases"):
+        MetricsCalculator(load_folder(), cache=None).calculate_metrics(phases=["phase4"])
+
+def test_same_content_is_memoized():
+    cache = PhaseMetricsCache()
+    first = CountingCalculator(load_folder(), cache=cache).calculate_metrics(phases=["phase1", "funded"])
+    calculator = CountingCalculator(load_folder(), cache=cache)
+    second = calculator.calculate_metrics(phases=["phase1", "funded"])
+
+    assert CountingCalculator.calls == ["phase1", "funded"]
+    assert second == first
+    assert len(calculator.summaries["funded"]["challenge_df"]) == 39
+
+def test_caching_is_opt_in():
+    CountingCalculator(load_folder()).calculate_metrics(phases=["phase1"])
+    CountingCalculator(load_folder()).calculate_metrics(phases=["phase1"])
+
+    assert CountingCalculator.calls == ["phase1", "phase1"]
+
+def test_cached_summaries_are_copies():
+    cache = PhaseMetricsCache()
+    first = MetricsCalculator(load_folder(), cache=cache)
+    first.calculate_metrics(phases=["funded"])
+    first.summaries["funded"]["challenge_df"].drop(index=0, inplace=True)
+
+    second = MetricsCalculator(load_folder(), cache=cache)
+    second.calculate_metrics(phases=["funded"])
+    second.summaries["funded"]["challenge_df"]["Profit"] = 0.0
+
+    third = MetricsCalculator(load_folder(), cache=cache)
+    third.calculate_metrics(phases=["funded"])
+    assert len(third.summaries["funded"]["challenge_df"]) == 39
+    assert third.summaries["funded"]["challenge_df"]["Profit"].abs().sum() > 0
+
+def test_economics_are_part_of_the_key(monkeypatch):
+    cache = PhaseMetricsCache()
+    expected = CountingCalculator(load_folder(), cache=cache).calculate_metrics(phases=["funded"])
+
+    monkeypatch.setattr(metrics, "FAILED_CHALLENGE_COST", 160)
+    results = CountingCalculator(load_folder(), cache=cache).calculate_metrics(phases=["funded"])
+
+    assert CountingCalculator.calls == ["funded", "funded"]
+    assert results["funded"]["f_profitability_ratio"] == round(expected["funded"]["f_profitability_ratio"] / 2, 2)
+
+def test_changed_content_is_recomputed():
+    cache = PhaseMetricsCache()
+    CountingCalculator(load_folder(), cache=cache).calculate_metrics(phases=["phase1"])
+    CountingCalculator(load_folder("HourBreakout_USDJPY_"), cache=cache).calculate_metrics(phases=["phase1"])
+
+    assert CountingCalculator.calls == ["phase1", "phase1"]
+
+def test_lru_evicts_oldest():
+    cache = PhaseMetricsCache(maxsize=1)
+    MetricsCalculator(load_folder(), cache=cache).calculate_metrics(phases=["phase1", "phase2"])
+
+    CountingCalculator(load_folder(), cache=cache).calculate_metrics(phases=["phase2", "phase1"])
+    assert CountingCalculator.calls == ["phase1"]
+
+def test_disk_tier_survives_new_process_cache(tmp_path):
+    expected = MetricsCalculator(load_folder(), cache=PhaseMetricsCache(disk_dir=tmp_path)).calculate_metrics()
+
+    results = CountingCalculator(load_folder(), cache=PhaseMetricsCache(disk_dir=tmp_path)).calculate_metrics()
+
+    assert CountingCalculator.calls == []
+    assert results == expected
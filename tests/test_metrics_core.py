@@ -1,6 +1,7 @@
+import numpy as np
 import pandas as pd
 import pytest
-from propfirm_trading_dashboard.metrics import MetricsCalculator
+from propfirm_trading_dashboard.metrics import ChallengeIndex, MetricsCalculator, run_length_encode, streak_stats
 
 def test_empty_data():
     empty_df = pd.DataFrame({
@@ -612,4 +613,74 @@ def test_joined_funded_metrics():
     assert f["f_payout_winrate"] == 62.50
     assert f["f_average_payouts_challenge"] == 2.5
     assert f["f_average_profit_payout"] == 359.31
-    assert f["f_profitability_ratio"] == 7.02
\ No newline at end of file
+    assert f["f_profitability_ratio"] == 7.02
+
+def test_funded_payout_averages_round_like_python_floats():
+    # (200.00 + 461.17) / 2 is 330.58500000000004: round() of the python float gives 330.59, numpy rounding 330.58
+    df_funded = pd.DataFrame({
+        "Challenge Number": [1, 1, 1, 1],
+        "Start Phase Date": ["2013.01.01", "2013.01.15", "2013.01.21", "2013.02.04"],
+        "End Phase Date": ["2013.01.15", "2013.01.21", "2013.02.04", "2013.02.19"],
+        "Phase": [1, 2, 3, 3],
+        "Outcome": ["Passed", "Passed", "Payout", "Payout"],
+        "Reason": ["Profit Target", "Profit Target", "Payout", "Payout"],
+        "Duration": [14, 6, 14, 15],
+        "Start Balance": [10000.00, 10800.00, 10000.00, 10000.00],
+        "Ending Balance": [10800.00, 11300.00, 10200.00, 10461.17],
+        "Max Drawdown": [9000.00, 9800.00, 9000.00, 9000.00],
+        "Profit Target": [10800.00, 11300.00, 10200.00, 10200.00],
+        "Daily Drawdown": [0.00, 0.00, 0.00, 0.00]
+    })
+
+    f = MetricsCalculator({"funded": df_funded}, cache=None).calculate_metrics(["funded"])["funded"]
+
+    assert f["f_average_profit_payout"] == 330.59
+    assert type(f["f_average_profit_payout"]) is float
+    assert f["f_average_payouts_challenge"] == 2
+    assert f["f_profitability_ratio"] == 8.26
+
+def test_run_length_encode():
+    values, lengths = run_length_encode(np.array(["Passed", "Passed", "Failed", "Passed", "Failed", "Failed", "Failed"]))
+
+    assert values.tolist() == ["Passed", "Failed", "Passed", "Failed"]
+    assert lengths.tolist() == [2, 1, 1, 3]
+
+    values, lengths = run_length_encode(np.array([]))
+    assert values.size == 0
+    assert lengths.size == 0
+
+def test_streak_stats_per_group():
+    outcomes = np.array(["Passed", "Passed", "Failed", "Passed", "Failed", "Failed"])
+    group_ids = np.array([0, 0, 0, 1, 1, 1])
+
+    overall = streak_stats(outcomes, ["Passed", "Failed"])
+    assert overall.loc["Passed"].tolist() == [2, 1.5, 2]
+    assert overall.loc["Failed"].tolist() == [2, 1.5, 2]
+
+    per_group = streak_stats(outcomes, ["Passed", "Failed"], group_ids)
+    assert per_group.loc[(0, "Passed")].tolist() == [2, 2, 1]
+    assert per_group.loc[(1, "Passed")].tolist() == [1, 1, 1]
+    assert per_group.loc[(1, "Failed")].tolist() == [2, 2, 1]
+
+    missing = streak_stats(np.array(["Failed"]), ["Passed"])
+    assert missing.loc["Passed"].tolist() == [0, 0, 0]
+
+def test_challenge_index_groups_rows_by_challenge_and_phase():
+    df = pd.DataFrame({
+        "Strategy_Pair": ["B", "A", "A", "B", "A", None],
+        "Challenge Number": [1, 2, 1, 1, 1, 1],
+        "Phase": [1, 1, 2, 2, 1, 1],
+        "Duration": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+        "End Phase Date": pd.to_datetime(["2013-01-05", None, "2013-01-09", "2013-01-02", "2013-01-03", "2013-01-01"]),
+    })
+
+    index = ChallengeIndex(df)
+
+    assert index.keys.tolist() == [("A", 1), ("A", 2), ("B", 1)]
+    assert index.phase_keys.tolist() == [("A", 1, 1), ("A", 1, 2), ("A", 2, 1), ("B", 1, 1), ("B", 1, 2)]
+    assert index.order.tolist() == [4, 2, 1, 0, 3, 5]
+    assert index.group_reduce(np.add, df["Duration"]).tolist() == [8.0, 2.0, 5.0]
+    assert index.phase_reduce(np.add, df["Duration"]).tolist() == [5.0, 3.0, 2.0, 1.0, 4.0]
+    assert index.per_phase(index.phase_reduce(np.add, df["Duration"]), 2, 0.0).tolist() == [3.0, 0.0, 4.0]
+    pd.testing.assert_index_equal(pd.DatetimeIndex(index.group_max_dates(df["End Phase Date"])), pd.to_datetime(["2013-01-09", None, "2013-01-05"]))
+    assert index.first_rows(df["Phase"] == 2).tolist() == [2, 3]
@@ -0,0 +1,186 @@
+import pandas as pd
+import pytest
+from pathlib import Path
+from propfirm_trading_dashboard.csv_parser import load_csv_file
+from propfirm_trading_dashboard.metrics import MetricsCalculator
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+FOLDERS = ["HourBreakout_GBPUSD_", "HourBreakout_USDJPY_", "MiddleRange_USDJPY_"]
+PHASES = ["phase1", "phase2", "phase3", "challenge", "funded"]
+
+def load_single(folder):
+    return {phase: load_csv_file(DATA_DIR / folder / f"{phase}.csv") for phase in PHASES}
+
+def load_joined():
+    # mirrors multi_strategy_loader.merge_group_phase
+    df_dict = {}
+    for phase in PHASES:
+        dfs = []
+        for folder in FOLDERS:
+            df = load_csv_file(DATA_DIR / folder / f"{phase}.csv")
+            df["Strategy_Pair"] = "_".join(folder.split("_")[:2])
+            df["Run"] = folder.rsplit("_", 1)[-1]
+            dfs.append(df)
+
+        merged = pd.concat(dfs, ignore_index=True)
+        merged["End Phase Date"] = pd.to_datetime(merged["End Phase Date"], format="%Y.%m.%d")
+        merged.sort_values("End Phase Date", inplace=True)
+        cols = merged.columns.tolist()
+        cols.insert(0, cols.pop(cols.index("Strategy_Pair")))
+        df_dict[phase] = merged[cols]
+    return df_dict
+
+def legacy_challenge_frame(df):
+    # original nested-loop implementation, kept as the reference output
+    challenge_records = []
+    for strategy, strategy_df in df.groupby("Strategy_Pair"):
+        for challenge_num, group in strategy_df.groupby("Challenge Number"):
+            p1 = group[group["Phase"] == 1]
+            p2 = group[group["Phase"] == 2]
+            total_duration = group["Duration"].sum()
+
+            if not p2.empty:
+                completion_row = p2["_row_index"].min()
+            else:
+                completion_row = p1["_row_index"].min() if not p1.empty else group["_row_index"].min()
+
+            if not p1.empty and not p2.empty and p1["Outcome"].iloc[0] == "Passed" and p2["Outcome"].iloc[0] == "Passed":
+                outcome = "Passed"
+            else:
+                outcome = "Failed"
+
+            challenge_records.append({
+                "Strategy_Pair": strategy,
+                "Challenge Number": challenge_num,
+                "Outcome": outcome,
+                "Duration": total_duration,
+                "completion_row": completion_row
+            })
+
+    return pd.DataFrame(challenge_records).sort_values("completion_row").reset_index(drop=True)
+
+def prepared_challenge_df(df):
+    df = df.reset_index(drop=False).rename(columns={"index": "_row_index"})
+    df["Outcome"] = df["Outcome"].astype(str).str.strip()
+    df["Phase"] = pd.to_numeric(df["Phase"], errors="coerce").fillna(0).astype(int)
+    df["Duration"] = pd.to_numeric(df["Duration"], errors="coerce").fillna(0)
+    if "Strategy_Pair" not in df.columns:
+        df["Strategy_Pair"] = "Single_Run"
+    return df
+
+EXPECTED_CHALLENGE = {
+    "HourBreakout_GBPUSD_": {
+        "c_number_challenges": 152, "c_number_passed_challenges": 77, "c_number_failed_challenges": 75,
+        "c_challenge_winrate": 50.66, "c_average_challenge_duration": 30.66,
+        "c_average_challenge_passed_duration": 29.03, "c_average_challenge_failed_duration": 32.35,
+        "c_max_cons_challenge_passed": 6, "c_max_cons_challenge_failed": 4,
+        "c_average_cons_challenge_passed": 1.92, "c_average_cons_challenge_failed": 1.88,
+        "c_failed_p1_percentage": 56.0, "c_failed_p2_percentage": 44.0, "c_efficiency_ratio": 1.65,
+    },
+    "HourBreakout_USDJPY_": {
+        "c_number_challenges": 208, "c_number_passed_challenges": 106, "c_number_failed_challenges": 102,
+        "c_challenge_winrate": 50.96, "c_average_challenge_duration": 22.23,
+        "c_average_challenge_passed_duration": 24.61, "c_average_challenge_failed_duration": 19.75,
+        "c_max_cons_challenge_passed": 6, "c_max_cons_challenge_failed": 6,
+        "c_average_cons_challenge_passed": 1.93, "c_average_cons_challenge_failed": 1.85,
+        "c_failed_p1_percentage": 72.55, "c_failed_p2_percentage": 27.45, "c_efficiency_ratio": 2.29,
+    },
+    "MiddleRange_USDJPY_": {
+        "c_number_challenges": 261, "c_number_passed_challenges": 126, "c_number_failed_challenges": 135,
+        "c_challenge_winrate": 48.28, "c_average_challenge_duration": 17.58,
+        "c_average_challenge_passed_duration": 17.99, "c_average_challenge_failed_duration": 17.2,
+        "c_max_cons_challenge_passed": 5, "c_max_cons_challenge_failed": 7,
+        "c_average_cons_challenge_passed": 1.77, "c_average_cons_challenge_failed": 1.88,
+        "c_failed_p1_percentage": 65.19, "c_failed_p2_percentage": 34.81, "c_efficiency_ratio": 2.75,
+    },
+    "joined": {
+        "c_number_challenges": 621, "c_number_passed_challenges": 309, "c_number_failed_challenges": 312,
+        "c_challenge_winrate": 49.76, "c_average_challenge_duration": 22.34,
+        "c_average_challenge_passed_duration": 23.01, "c_average_challenge_failed_duration": 21.68,
+        "c_max_cons_challenge_passed": 6, "c_max_cons_challenge_failed": 7,
+        "c_average_cons_challenge_passed": 1.86, "c_average_cons_challenge_failed": 1.88,
+        "c_failed_p1_percentage": 50.96, "c_failed_p2_percentage": 30.13, "c_efficiency_ratio": 2.23,
+    },
+}
+
+EXPECTED_FUNDED = {
+    "HourBreakout_GBPUSD_": {
+        "f_number_challenges": 39, "f_number_passed_challenges": 21, "f_number_failed_challenges": 18,
+        "f_challenge_winrate": 53.85, "f_payout_winrate": 86.26, "f_average_challenge_duration": 43.1,
+        "f_average_challenge_passed_duration": 52.71, "f_average_challenge_failed_duration": 31.89, "f_max_cons_challenge_passed": 5,
+        "f_max_cons_challenge_failed": 3, "f_average_cons_challenge_passed": 1.91, "f_average_cons_challenge_failed": 1.64,
+        "f_average_payouts_challenge": 5.38, "f_average_profit_payout": 286.54, "f_average_profit_challenge": 793.32,
+        "m_winning_months": 78, "m_losing_months": 34, "m_monthly_winrate": 69.64,
+        "m_average_monthly_profit": 414.1, "m_average_monthly_loss": -87.06, "m_monthly_wl_ratio": 2.29,
+        "f_challenge_efficiency_ratio": 44.07, "m_overall_risk_adjusted_returns": 145.87, "f_profitability_ratio": 16.62,
+        "m_monthly_stability_return_ratio": 3.31,
+    },
+    "HourBreakout_USDJPY_": {
+        "f_number_challenges": 47, "f_number_passed_challenges": 24, "f_number_failed_challenges": 23,
+        "f_challenge_winrate": 51.06, "f_payout_winrate": 88.5, "f_average_challenge_duration": 34.89,
+        "f_average_challenge_passed_duration": 39.33, "f_average_challenge_failed_duration": 30.26, "f_max_cons_challenge_passed": 5,
+        "f_max_cons_challenge_failed": 4, "f_average_cons_challenge_passed": 2.0, "f_average_cons_challenge_failed": 1.92,
+        "f_average_payouts_challenge": 7.38, "f_average_profit_payout": 343.79, "f_average_profit_challenge": 1255.55,
+        "m_winning_months": 106, "m_losing_months": 35, "m_monthly_winrate": 75.18,
+        "m_average_monthly_profit": 568.78, "m_average_monthly_loss": -89.14, "m_monthly_wl_ratio": 3.03,
+        "f_challenge_efficiency_ratio": 54.59, "m_overall_risk_adjusted_returns": 262.03, "f_profitability_ratio": 28.07,
+        "m_monthly_stability_return_ratio": 4.8,
+    },
+    "MiddleRange_USDJPY_": {
+        "f_number_challenges": 61, "f_number_passed_challenges": 30, "f_number_failed_challenges": 31,
+        "f_challenge_winrate": 49.18, "f_payout_winrate": 85.24, "f_average_challenge_duration": 26.7,
+        "f_average_challenge_passed_duration": 31.47, "f_average_challenge_failed_duration": 22.1, "f_max_cons_challenge_passed": 6,
+        "f_max_cons_challenge_failed": 5, "f_average_cons_challenge_passed": 2.14, "f_average_cons_challenge_failed": 2.07,
+        "f_average_payouts_challenge": 5.97, "f_average_profit_payout": 345.39, "f_average_profit_challenge": 972.86,
+        "m_winning_months": 111, "m_losing_months": 33, "m_monthly_winrate": 77.08,
+        "m_average_monthly_profit": 544.01, "m_average_monthly_loss": -101.82, "m_monthly_wl_ratio": 3.36,
+        "f_challenge_efficiency_ratio": 31.38, "m_overall_risk_adjusted_returns": 129.29, "f_profitability_ratio": 21.97,
+        "m_monthly_stability_return_ratio": 4.12,
+    },
+    "joined": {
+        "f_number_challenges": 147, "f_number_passed_challenges": 75, "f_number_failed_challenges": 72,
+        "f_challenge_winrate": 51.02, "f_payout_winrate": 86.69, "f_average_challenge_duration": 33.67,
+        "f_average_challenge_passed_duration": 39.93, "f_average_challenge_failed_duration": 27.15, "f_max_cons_challenge_passed": 7,
+        "f_max_cons_challenge_failed": 6, "f_average_cons_challenge_passed": 1.92, "f_average_cons_challenge_failed": 1.8,
+        "f_average_payouts_challenge": 6.25, "f_average_profit_payout": 330.61, "f_average_profit_challenge": 1015.61,
+        "m_winning_months": 148, "m_losing_months": 10, "m_monthly_winrate": 93.67,
+        "m_average_monthly_profit": 981.53, "m_average_monthly_loss": -173.09, "m_monthly_wl_ratio": 14.8,
+        "f_challenge_efficiency_ratio": 14.11, "m_overall_risk_adjusted_returns": 74.92, "f_profitability_ratio": 22.39,
+        "m_monthly_stability_return_ratio": 5.31,
+    },
+}
+
+def sample_inputs():
+    inputs = [(folder, load_single(folder)) for folder in FOLDERS]
+    inputs.append(("joined", load_joined()))
+    return inputs
+
+@pytest.mark.parametrize("name, df_dict", sample_inputs())
+def test_challenge_frame_matches_legacy(name, df_dict):
+    df = prepared_challenge_df(df_dict["challenge"])
+    calculator = MetricsCalculator(df_dict)
+
+    pd.testing.assert_frame_equal(calculator._build_challenge_frame(df), legacy_challenge_frame(df))
+
+@pytest.mark.parametrize("name, df_dict", sample_inputs())
+def test_challenge_metrics_sample_data(name, df_dict):
+    calculator = MetricsCalculator(df_dict)
+    c = calculator.calculate_metrics()["challenge"]
+
+    assert c == EXPECTED_CHALLENGE[name]
+
+@pytest.mark.parametrize("name, df_dict", sample_inputs())
+def test_funded_metrics_sample_data(name, df_dict):
+    calculator = MetricsCalculator(df_dict)
+    f = calculator.calculate_metrics()["funded"]
+
+    assert f == EXPECTED_FUNDED[name]
+
+@pytest.mark.parametrize("name, df_dict", sample_inputs())
+def test_calculate_metrics_leaves_input_frames_untouched(name, df_dict):
+    before = {phase: df.copy() for phase, df in df_dict.items()}
+
+    MetricsCalculator(df_dict, cache=None).calculate_metrics()
+
+    for phase, df in df_dict.items():
+        pd.testing.assert_frame_equal(df, before[phase])
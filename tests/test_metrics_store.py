@@ -0,0 +1,103 @@
+import os
+import shutil
+import pytest
+from pathlib import Path
+from propfirm_trading_dashboard.csv_parser import load_csv_file
+from propfirm_trading_dashboard.metrics import MetricsCalculator
+from propfirm_trading_dashboard import metrics_store
+from propfirm_trading_dashboard.metrics_store import MetricsStore
+from propfirm_trading_dashboard.simulation_run import run_single_simulation
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+FOLDERS = ["HourBreakout_GBPUSD_", "HourBreakout_USDJPY_", "MiddleRange_USDJPY_"]
+PHASES = ["phase1", "phase2", "phase3", "challenge", "funded"]
+
+@pytest.fixture
+def store(tmp_path):
+    with MetricsStore(tmp_path / "metrics.sqlite") as store:
+        yield store
+
+def copy_data(tmp_path):
+    target = tmp_path / "data"
+    shutil.copytree(DATA_DIR, target)
+    return target
+
+def test_stored_metrics_match_calculator(store):
+    assert store.sync(DATA_DIR, PHASES) == FOLDERS
+
+    for folder in FOLDERS:
+        expected = MetricsCalculator({phase: load_csv_file(DATA_DIR / folder / f"{phase}.csv") for phase in PHASES}).calculate_metrics()
+        assert store.metrics(folder) == expected
+
+def test_challenge_records_and_monthly_pnl(store):
+    store.sync(DATA_DIR, PHASES, ["HourBreakout_GBPUSD_"])
+
+    challenges = store.challenges("HourBreakout_GBPUSD_")
+    funded = store.challenges("HourBreakout_GBPUSD_", "funded")
+    monthly = store.monthly_pnl("HourBreakout_GBPUSD_")
+
+    assert len(challenges) == 152
+    assert len(funded) == 39
+    assert (funded["outcome"] == "Passed").sum() == 21
+    assert funded["resolution_date"].is_monotonic_increasing
+    assert list(monthly.columns) == ["Year", "Month", "PnL"]
+    assert (monthly["PnL"] > 0).sum() == 78
+
+def test_recompute_only_on_content_change(tmp_path, store):
+    data_dir = copy_data(tmp_path)
+    store.sync(data_dir, PHASES)
+
+    touched = data_dir / "HourBreakout_GBPUSD_" / "phase1.csv"
+    stat = touched.stat()
+    os.utime(touched, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert store.sync(data_dir, PHASES) == []
+
+    lines = touched.read_text(encoding="utf-16").splitlines()
+    touched.write_text("\n".join(lines[:11]) + "\n", encoding="utf-16")
+    assert store.sync(data_dir, PHASES) == ["HourBreakout_GBPUSD_"]
+    assert store.metrics("HourBreakout_GBPUSD_")["phase1"]["p1_number_challenges"] == 10
+
+def test_computed_records_are_written_without_recomputing(tmp_path, store, monkeypatch):
+    data_dir = copy_data(tmp_path)
+    (tmp_path / "out").mkdir()
+    computed = {folder: run_single_simulation(folder, PHASES, base_path=data_dir, output_dir=tmp_path / "out") for folder in FOLDERS}
+
+    def fail(dfs, cache=None):
+        raise AssertionError("metrics recomputed")
+    monkeypatch.setattr(metrics_store, "MetricsCalculator", fail)
+    assert store.sync(data_dir, PHASES, computed=computed) == FOLDERS
+
+    for folder in FOLDERS:
+        assert store.metrics(folder) == computed[folder]["metrics"]
+    assert len(store.challenges("HourBreakout_GBPUSD_", "funded")) == 39
+
+    # a record of files that changed after it was computed is not used
+    touched = data_dir / "HourBreakout_GBPUSD_" / "phase1.csv"
+    lines = touched.read_text(encoding="utf-16").splitlines()
+    touched.write_text("\n".join(lines[:11]) + "\n", encoding="utf-16")
+    with pytest.raises(AssertionError, match="metrics recomputed"):
+        store.sync(data_dir, PHASES, ["HourBreakout_GBPUSD_"], computed=computed)
+
+def test_unknown_folders_and_missing_phases(tmp_path, store):
+    data_dir = copy_data(tmp_path)
+    (data_dir / "HourBreakout_GBPUSD_" / "phase3.csv").unlink()
+
+    with pytest.raises(ValueError, match="No strategy folder 'Nothing_EURUSD_1'"):
+        store.sync(data_dir, PHASES, ["Nothing_EURUSD_1"])
+    with pytest.raises(ValueError, match=r"'HourBreakout_GBPUSD_' has no csv file for phases \['phase3'\]"):
+        store.sync(data_dir, PHASES, ["HourBreakout_GBPUSD_"])
+
+def test_rank_and_filter(store):
+    store.sync(DATA_DIR, PHASES)
+
+    ranking = store.rank("f_average_profit_challenge")
+    assert list(ranking["folder"]) == ["HourBreakout_USDJPY_", "MiddleRange_USDJPY_", "HourBreakout_GBPUSD_"]
+    assert list(ranking["value"]) == [1255.55, 972.86, 793.32]
+
+    filtered = store.rank("c_challenge_winrate", ascending=True, where=[("m_monthly_winrate", ">", 70)], limit=1)
+    assert list(filtered["folder"]) == ["MiddleRange_USDJPY_"]
+
+    assert list(store.rank("c_challenge_winrate", pair="GBPUSD")["folder"]) == ["HourBreakout_GBPUSD_"]
+
+    with pytest.raises(ValueError, match="Unsupported comparison"):
+        store.rank("c_challenge_winrate", where=[("m_monthly_winrate", "; DROP TABLE runs", 0)])
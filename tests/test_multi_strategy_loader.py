@@ -0,0 +1,35 @@
+import pandas as pd
+from pathlib import Path
+from propfirm_trading_dashboard.multi_strategy_loader import scan_strategy_folders, discover_strategy_groups, load_joined_phases, merge_frames
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+PHASES = ["phase1", "phase2", "phase3", "challenge", "funded"]
+
+def test_scan_strategy_folders_skips_unparseable_names(tmp_path):
+    (tmp_path / "HourBreakout_GBPUSD_1").mkdir()
+    (tmp_path / "HourBreakout_GBPUSD_1" / "phase1.csv").write_text("")
+    (tmp_path / "HourBreakout_GBPUSD_1" / "notes.txt").write_text("")
+    (tmp_path / "scratch").mkdir()
+
+    manifest = scan_strategy_folders(tmp_path)
+
+    assert list(manifest) == ["HourBreakout_GBPUSD_1"]
+    assert list(manifest["HourBreakout_GBPUSD_1"]) == ["phase1"]
+
+def test_discover_strategy_groups():
+    groups = discover_strategy_groups(DATA_DIR)
+
+    assert sorted(groups) == ["HourBreakout", "MiddleRange"]
+    assert sorted(groups["HourBreakout"]) == ["HourBreakout_GBPUSD_", "HourBreakout_USDJPY_"]
+
+def test_parallel_load_matches_serial():
+    serial = load_joined_phases(DATA_DIR, PHASES)
+    threaded = load_joined_phases(DATA_DIR, PHASES, workers=3)
+
+    for phase in PHASES:
+        pd.testing.assert_frame_equal(threaded[phase], serial[phase])
+        assert serial[phase].columns[0] == "Strategy_Pair"
+        assert serial[phase]["End Phase Date"].is_monotonic_increasing
+
+def test_merge_frames_without_frames():
+    assert merge_frames([]).empty
@@ -0,0 +1,54 @@
+import math
+import pandas as pd
+from propfirm_trading_dashboard.phase_frames import normalize_phase_frame
+from propfirm_trading_dashboard.metrics import MetricsCalculator
+
+def raw_funded():
+    return pd.DataFrame({
+        "Challenge Number": [1, 1, 2],
+        "Start Phase Date": ["2013.01.01", "2013.01.09", "2013.01.02"],
+        "End Phase Date": ["2013.01.09", "2013.02.01", "2013.01.20"],
+        "Phase": ["1", "3", "1"],
+        "Outcome": [" Passed", "Payout ", "Failed"],
+        "Duration": [8, 23, 18],
+        "Start Balance": [10000, 10800, 10000],
+        "Ending Balance": [10800, 11200, 9000],
+    })
+
+def test_normalize_types_columns_and_adds_pnl():
+    df = normalize_phase_frame(raw_funded(), "funded")
+
+    assert df["Outcome"].tolist() == ["Passed", "Payout", "Failed"]
+    assert df["Phase"].tolist() == [1, 3, 1]
+    assert df["Duration"].dtype == float
+    assert df["End Phase Date"].tolist() == list(pd.to_datetime(["2013-01-09", "2013-02-01", "2013-01-20"]))
+    assert df["PnL"].tolist() == [0, 400, -80]
+
+def test_normalize_returns_new_frame_once():
+    raw = raw_funded()
+    df = normalize_phase_frame(raw, "funded")
+
+    pd.testing.assert_frame_equal(raw, raw_funded())
+    assert normalize_phase_frame(df, "funded") is df
+    assert "PnL" not in normalize_phase_frame(raw, "phase1")
+
+def test_normalize_infers_non_mt5_dates():
+    raw = raw_funded().assign(**{"End Phase Date": ["2013-01-09", "2013-02-01", None]})
+
+    dates = normalize_phase_frame(raw, "funded")["End Phase Date"]
+
+    assert dates.iloc[0] == pd.Timestamp("2013-01-09")
+    assert pd.isna(dates.iloc[2])
+
+def test_blank_phase_durations_are_left_out_of_the_averages():
+    raw = raw_funded().assign(Phase=["1", "1", "1"], Outcome=["Passed", "Passed", "Failed"], Duration=["10", "20", ""])
+    phase3 = raw.assign(Phase=["3", "3", "3"], Outcome=["Payout", "Payout", "Failed"])
+
+    metrics = MetricsCalculator({"phase1": raw, "phase3": phase3}).calculate_metrics(["phase1", "phase3"])
+
+    assert metrics["phase1"]["p1_average_challenge_duration"] == 15.0
+    assert math.isnan(metrics["phase1"]["p1_average_challenge_failed_duration"])
+    assert metrics["phase1"]["p1_efficiency_ratio"] == 4.44
+    assert metrics["phase3"]["p3_average_challenge_duration"] == 15.0
+    assert math.isnan(metrics["phase3"]["p3_average_challenge_failed_duration"])
+    assert normalize_phase_frame(raw, "challenge")["Duration"].tolist() == [10, 20, 0]
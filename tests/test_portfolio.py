@@ -0,0 +1,92 @@
+import itertools
+import pytest
+from pathlib import Path
+from propfirm_trading_dashboard.metrics import MetricsCalculator
+from propfirm_trading_dashboard.multi_strategy_loader import merge_group_phases
+from propfirm_trading_dashboard.phase_frames import normalize_phase_frames
+from propfirm_trading_dashboard import portfolio
+from propfirm_trading_dashboard.portfolio import SCORE_COLUMNS, PortfolioSearch
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+FOLDERS = ["HourBreakout_GBPUSD_", "HourBreakout_USDJPY_", "MiddleRange_USDJPY_"]
+
+@pytest.fixture(scope="module")
+def funded_frames():
+    return {folder: merge_group_phases(DATA_DIR, [folder], ["funded"])["funded"] for folder in FOLDERS}
+
+def synthetic_frames(funded_frames, copies=9):
+    # distinct strategies built from samples of the real folders
+    frames = {}
+    for i in range(copies):
+        df = funded_frames[FOLDERS[i % len(FOLDERS)]]
+        frames[f"Strategy{i}_EURUSD_"] = df.assign(Strategy_Pair=f"Strategy{i}_EURUSD").sample(frac=0.7, random_state=i)
+    return frames
+
+def test_scores_match_joined_metrics(funded_frames):
+    combinations = [list(combination) for size in range(1, 4) for combination in itertools.combinations(FOLDERS, size)]
+    scores = PortfolioSearch(funded_frames).score(combinations)
+
+    for combination, row in zip(combinations, scores.to_dict("records")):
+        dfs = normalize_phase_frames(merge_group_phases(DATA_DIR, combination, ["funded"]))
+        expected = MetricsCalculator(dfs, cache=None).calculate_metrics(["funded"])["funded"]
+        assert row["folders"] == tuple(combination)
+        assert {name: row[name] for name in SCORE_COLUMNS} == {name: expected[name] for name in SCORE_COLUMNS}
+
+def test_exhaustive_search_ranks_every_combination(funded_frames):
+    search = PortfolioSearch(funded_frames)
+    ranking = search.search("m_monthly_winrate", method="exhaustive", top=10)
+
+    assert len(ranking) == 7
+    assert ranking["m_monthly_winrate"].is_monotonic_decreasing
+    assert ranking.loc[1, "folders"] == tuple(FOLDERS)
+    assert search.search("m_monthly_winrate", min_size=2, max_size=2)["size"].tolist() == [2, 2, 2]
+
+def test_beam_search_finds_the_exhaustive_best(funded_frames):
+    search = PortfolioSearch(synthetic_frames(funded_frames))
+    exhaustive = search.search("m_monthly_winrate", method="exhaustive", top=5)
+    beam = search.search("m_monthly_winrate", method="beam", beam_width=16, top=5)
+    greedy = search.search("m_monthly_winrate", method="greedy", top=5)
+
+    assert beam.loc[1, "m_monthly_winrate"] == exhaustive.loc[1, "m_monthly_winrate"]
+    assert greedy.loc[1, "m_monthly_winrate"] <= exhaustive.loc[1, "m_monthly_winrate"]
+    assert set(beam.columns) == set(exhaustive.columns)
+
+def test_parallel_search_matches_serial(funded_frames):
+    search = PortfolioSearch(synthetic_frames(funded_frames))
+    serial = search.search(method="exhaustive", top=10, batch_size=50)
+    parallel = search.search(method="exhaustive", top=10, batch_size=50, workers=2)
+
+    assert serial.equals(parallel)
+
+def test_exhaustive_search_streams_its_batches(funded_frames, monkeypatch):
+    search = PortfolioSearch(synthetic_frames(funded_frames))
+    expected = search.search(method="exhaustive", top=5, batch_size=1000)
+    built, built_at_merge = [], []
+    index_members = search._index_members
+    merge_batches = portfolio._merge_batches
+    monkeypatch.setattr(search, "_index_members", lambda combinations: built.append(len(combinations)) or index_members(combinations))
+    monkeypatch.setattr(portfolio, "_merge_batches", lambda batches: built_at_merge.append(len(built)) or merge_batches(batches))
+
+    ranking = search.search(method="exhaustive", top=5, batch_size=16, workers=2)
+
+    assert ranking.equals(expected)
+    assert sum(built) == 2 ** 9 - 1
+    # two workers score four batches at a time, the 32 batches are never all built at once
+    assert built_at_merge[0] == 4
+
+def test_unknown_folders_and_shared_pairs_are_rejected(funded_frames):
+    with pytest.raises(ValueError, match="Unknown folders \\['Nothing_EURUSD_'\\]"):
+        PortfolioSearch(funded_frames).score([["HourBreakout_GBPUSD_", "Nothing_EURUSD_"]])
+
+    frames = {"HourBreakout_GBPUSD_1": funded_frames["HourBreakout_GBPUSD_"], "HourBreakout_GBPUSD_2": funded_frames["HourBreakout_GBPUSD_"]}
+    with pytest.raises(ValueError, match="share Strategy_Pair 'HourBreakout_GBPUSD'"):
+        PortfolioSearch(frames)
+
+def test_search_rejects_unknown_options(funded_frames):
+    search = PortfolioSearch(funded_frames)
+    with pytest.raises(ValueError, match="Unknown objective"):
+        search.search("p1_challenge_winrate")
+    with pytest.raises(ValueError, match="Unsupported search method"):
+        search.search(method="annealing")
+    with pytest.raises(ValueError, match="min_size"):
+        search.search(min_size=4)
@@ -0,0 +1,149 @@
+import json
+import numpy as np
+import pandas as pd
+from propfirm_trading_dashboard import report
+from propfirm_trading_dashboard.report import format_cells, format_pnl_cells, load_template, render_report, render_reports, table_html
+
+METRICS = {
+    "phase1": {"p1_number_challenges": 12, "p1_challenge_winrate": 41.67},
+    "funded": {"f_number_challenges": 3},
+}
+
+def test_template_is_compiled_once(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    assert load_template("report_html.html") is load_template("report_html.html")
+    assert report.BYTECODE_CACHE_DIR.is_dir()
+    assert not (tmp_path / ".cache").exists()
+
+def test_render_reports_reuses_template(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    calls = []
+    get_template = report.environment.get_template
+    monkeypatch.setattr(report.environment, "get_template", lambda name: calls.append(name) or get_template(name))
+
+    paths = render_reports(
+        [{"metrics": METRICS, "filename": f"Strategy_{i}"} for i in range(3)],
+        "report_html.html",
+        output_dir=tmp_path,
+    )
+
+    assert calls == ["report_html.html"]
+    assert [path.name for path in paths] == ["Strategy_0.html", "Strategy_1.html", "Strategy_2.html"]
+    assert "Strategy_2" in paths[2].read_text(encoding="utf-8")
+
+def test_batch_output_matches_single_render(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monthly = pd.DataFrame({"Year": [2024], "Jan": [120.5], "Feb": [-80.0], "Yearly Total": [40.5]})
+
+    (tmp_path / "batch").mkdir()
+
+    render_report(METRICS, "report_html.html", "single", monthly_pnl_table=monthly, output_dir=tmp_path)
+    [batch_path] = render_reports(
+        [{"metrics": METRICS, "filename": "single", "monthly_pnl_table": monthly}],
+        "report_html.html",
+        output_dir=tmp_path / "batch",
+    )
+
+    assert batch_path.read_text(encoding="utf-8") == (tmp_path / "single.html").read_text(encoding="utf-8")
+
+def test_paginated_runs_go_to_sidecar(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    runs = pd.DataFrame({
+        "Run #": [1, 2, 3],
+        "End Date": pd.to_datetime(["2013-01-09", "2013-01-16", None]),
+        "Outcome": ["Passed", "Failed", "Passed"],
+        "Duration": [8.0, 5.0, float("nan")],
+    })
+
+    render_report(METRICS, "report_html.html", "paged", runs_table={"phase1": runs}, output_dir=tmp_path, paginate_runs=True)
+
+    html = (tmp_path / "paged.html").read_text(encoding="utf-8")
+    sidecar = (tmp_path / "paged_runs.js").read_text(encoding="utf-8")
+    payload = json.loads(sidecar.removeprefix("window.RUNS_TABLES=").rstrip().removesuffix(";"))
+
+    assert '<script src="paged_runs.js"></script>' in html
+    assert "2013.01.16" not in html
+    assert payload["phase1"]["columns"] == ["Run #", "End Date", "Outcome", "Duration"]
+    assert payload["phase1"]["rows"] == [[1, "2013.01.09", "Passed", 8.0], [2, "2013.01.16", "Failed", 5.0], [3, None, "Passed", None]]
+
+def test_runs_tables_keep_the_export_format(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    runs = pd.DataFrame({
+        "Run #": [1, 2],
+        "Start Date": pd.to_datetime(["2013-01-01", "2013-01-09"]),
+        "Outcome": ["Passed", "Failed"],
+        "Duration": [8.0, 14.0],
+        "PnL": [0.0, -80.0],
+    })
+
+    render_report(METRICS, "report_html.html", "runs", runs_table={"phase1": runs}, output_dir=tmp_path)
+    html = (tmp_path / "runs.html").read_text(encoding="utf-8")
+
+    assert "<td>2013.01.09</td>" in html
+    assert "<td>14</td>" in html
+    assert "<td>-80.0</td>" in html
+    assert "2013-01-09" not in html
+
+def test_format_pnl_cells():
+    values = np.array([1234567.891, -80.0, 0.0, -0.001, 999.995, np.nan])
+
+    assert format_pnl_cells(values).tolist() == [
+        '<span class="pos">1,234,567.89</span>',
+        '<span class="neg">-80.00</span>',
+        "0.00",
+        '<span class="neg">-0.00</span>',
+        '<span class="pos">1,000.00</span>',
+        "nan",
+    ]
+
+def test_table_html_matches_to_html():
+    df = pd.DataFrame({
+        "Run #": [1, 2],
+        "End Date": pd.to_datetime(["2013-01-09", None]),
+        "Outcome": ["Passed", "a<b&c"],
+        "Duration": [8.0, np.nan],
+        "PnL": [123.456, -80.0],
+    })
+
+    cells = {col: format_cells(df[col]) for col in df.columns}
+
+    assert table_html(cells, "runs_table") == df.to_html(index=False, classes="runs_table", border=0)
+
+def test_format_cells_escapes_markup():
+    df = pd.DataFrame({"Outcome": ["a<b", "&", "x>y", "<&>"]})
+
+    assert format_cells(df["Outcome"]).tolist() == ["a&lt;b", "&amp;", "x&gt;y", "&lt;&amp;&gt;"]
+    assert table_html({"Outcome": format_cells(df["Outcome"])}, "runs_table") == df.to_html(index=False, classes="runs_table", border=0)
+
+def test_format_cells_tiny_and_large_floats_match_to_html():
+    df = pd.DataFrame({
+        "Tiny": [1e-7, 1.0, np.nan],
+        "Large": [1.5e9, 2.25, -80.0],
+        "Wide": [123456789.123, 0.5, 1.0],
+    })
+
+    cells = {col: format_cells(df[col]) for col in df.columns}
+
+    assert cells["Tiny"][0] != "0.0"
+    assert table_html(cells, "runs_table") == df.to_html(index=False, classes="runs_table", border=0)
+
+def test_rolling_metrics_are_charted(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    rolling = pd.DataFrame(
+        {"p1_challenge_winrate_6m": [50.0, np.nan], "p1_challenge_winrate_expanding": [50.0, 62.5]},
+        index=pd.period_range("2024-01", periods=2, freq="M", name="Month"),
+    )
+
+    render_report(METRICS, "report_html.html", "trends", rolling_metrics=rolling, output_dir=tmp_path)
+    html = (tmp_path / "trends.html").read_text(encoding="utf-8")
+    payload = html.split("window.ROLLING_METRICS = ", 1)[1].split(";\n", 1)[0]
+
+    assert 'href="#trends"' in html
+    assert json.loads(payload) == {
+        "months": ["2024-01", "2024-02"],
+        "charts": {"p1_challenge_winrate": {"6m": [50.0, None], "expanding": [50.0, 62.5]}},
+    }
+
+    render_report(METRICS, "report_html.html", "no_trends", output_dir=tmp_path)
+    assert "ROLLING_METRICS" not in (tmp_path / "no_trends.html").read_text(encoding="utf-8")
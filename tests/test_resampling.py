@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+from pathlib import Path
+from propfirm_trading_dashboard.csv_parser import load_csv_file
+from propfirm_trading_dashboard.metrics import MetricsCalculator, streak_stats
+from propfirm_trading_dashboard.resampling import (
+    max_streaks, observed_statistics, resample_indices, resample_metrics, resampling_records, simulate_paths,
+)
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+def sample_calculator():
+    path = DATA_DIR / "HourBreakout_USDJPY_"
+    return MetricsCalculator({phase: load_csv_file(path / f"{phase}.csv") for phase in ["challenge", "funded"]}, cache=None)
+
+def test_max_streaks_match_streak_stats():
+    rng = np.random.default_rng(0)
+    flags = rng.random((20, 50)) < 0.4
+
+    expected = [streak_stats(np.where(row, "Failed", "Passed"), ["Failed"]).loc["Failed", "max"] for row in flags]
+    assert max_streaks(flags).tolist() == expected
+    assert max_streaks(np.zeros((3, 0), dtype=bool)).tolist() == [0, 0, 0]
+
+def test_observed_statistics_match_metrics():
+    calculator = sample_calculator()
+    metrics = calculator.calculate_metrics(["challenge", "funded"])
+    observed = observed_statistics(resampling_records(calculator))
+
+    assert observed["c_challenge_winrate"] == pytest.approx(metrics["challenge"]["c_challenge_winrate"], abs=0.005)
+    assert observed["c_max_cons_challenge_failed"] == metrics["challenge"]["c_max_cons_challenge_failed"]
+    assert observed["f_challenge_winrate"] == pytest.approx(metrics["funded"]["f_challenge_winrate"], abs=0.005)
+    assert observed["f_max_cons_challenge_failed"] == metrics["funded"]["f_max_cons_challenge_failed"]
+    assert observed["f_profitability_ratio"] == metrics["funded"]["f_profitability_ratio"]
+    assert observed["m_average_monthly_pnl"] == pytest.approx(calculator.summaries["funded"]["monthly_pnl"].mean())
+
+def test_block_indices_are_consecutive_runs():
+    positions = resample_indices(np.random.default_rng(0), 10, 4, "block", block_size=3)
+
+    assert positions.shape == (4, 10)
+    assert positions.min() >= 0 and positions.max() <= 9
+    blocks = positions[:, :9].reshape(4, 3, 3)
+    assert (np.diff(blocks, axis=2) == 1).all()
+
+@pytest.mark.parametrize("method", ["bootstrap", "block"])
+def test_seeded_paths_do_not_depend_on_workers(method):
+    records = resampling_records(sample_calculator())
+
+    serial = simulate_paths(records, 300, method, seed=7, batch_size=64)
+    pooled = simulate_paths(records, 300, method, seed=7, workers=2, batch_size=64)
+    other_seed = simulate_paths(records, 300, method, seed=8, batch_size=64)
+
+    assert sorted(serial) == ["c_challenge_winrate", "c_max_cons_challenge_failed", "f_challenge_winrate", "f_max_cons_challenge_failed", "f_profitability_ratio", "m_average_monthly_pnl", "m_monthly_pnl_p5"]
+    for name, values in serial.items():
+        assert len(values) == 300
+        np.testing.assert_array_equal(values, pooled[name])
+    assert not np.array_equal(serial["f_profitability_ratio"], other_seed["f_profitability_ratio"])
+
+def test_intervals_contain_the_observed_values():
+    result = resample_metrics(sample_calculator(), paths=2000, seed=0)
+    intervals = result["intervals"]
+
+    assert (intervals["lower"] <= intervals["median"]).all() and (intervals["median"] <= intervals["upper"]).all()
+    for name in ["c_challenge_winrate", "f_challenge_winrate", "f_profitability_ratio", "m_average_monthly_pnl"]:
+        assert intervals.loc[name, "lower"] <= intervals.loc[name, "observed"] <= intervals.loc[name, "upper"]
+
+def test_unknown_method():
+    with pytest.raises(ValueError, match="Unsupported resampling method"):
+        simulate_paths({"monthly": {"pnl": np.ones(3)}}, 10, "jackknife")
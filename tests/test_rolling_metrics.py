@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pathlib import Path
+from propfirm_trading_dashboard.csv_parser import load_csv_file
+from propfirm_trading_dashboard.metrics import PHASES, MetricsCalculator
+from propfirm_trading_dashboard.rolling_metrics import rolling_metrics, window_sums
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+@pytest.fixture(scope="module")
+def sample_calculator():
+    path = DATA_DIR / "HourBreakout_USDJPY_"
+    return MetricsCalculator({phase: load_csv_file(path / f"{phase}.csv") for phase in PHASES}, cache=None)
+
+def test_window_sums_match_pandas_rolling():
+    values = np.random.default_rng(0).integers(0, 5, 40).astype(float)
+
+    np.testing.assert_array_equal(window_sums(values, 6), pd.Series(values).rolling(6, min_periods=1).sum())
+    np.testing.assert_array_equal(window_sums(values, None), values.cumsum())
+
+def test_expanding_window_ends_at_the_whole_history_metrics(sample_calculator):
+    rolling = rolling_metrics(sample_calculator)
+    metrics = {name: value for phase in sample_calculator.calculate_metrics().values() for name, value in phase.items()}
+
+    expanding = rolling.iloc[-1].filter(like="_expanding")
+    assert len(expanding) == 12
+    for column, value in expanding.items():
+        assert value == metrics[column.removesuffix("_expanding")], column
+
+def test_rolling_windows_match_recomputed_windows(sample_calculator):
+    rolling = rolling_metrics(sample_calculator, windows=[6])
+    dates = {phase: sample_calculator.dfs[phase]["End Phase Date"].dt.to_period("M") for phase in ["phase1", "phase3"]}
+
+    for month in rolling.index[::7]:
+        in_window = {phase: (dates[phase] > month - 6) & (dates[phase] <= month) for phase in dates}
+        if not all(mask.any() for mask in in_window.values()):
+            continue
+        window = MetricsCalculator({phase: sample_calculator.dfs[phase][mask] for phase, mask in in_window.items()}, cache=None)
+        expected = {name: value for phase in window.calculate_metrics(["phase1", "phase3"]).values() for name, value in phase.items()}
+
+        row = rolling.loc[month]
+        for name in ["p1_challenge_winrate", "p1_efficiency_ratio", "p3_payout_winrate", "p3_average_profit_payout"]:
+            assert row[f"{name}_6m"] == expected[name], (month, name)
+
+def test_monthly_winrate_over_trailing_months(sample_calculator):
+    rolling = rolling_metrics(sample_calculator, windows=[12])
+    monthly = sample_calculator.summaries["funded"]["monthly_pnl"]
+    monthly.index = pd.PeriodIndex(monthly.index, freq="M")
+
+    for month in rolling.index[-24:]:
+        window = monthly[(monthly.index > month - 12) & (monthly.index <= month)]
+        decided = (window != 0).sum()
+        expected = round((window > 0).sum() / decided * 100, 2) if decided else 0
+        assert rolling.loc[month, "m_monthly_winrate_12m"] == expected
+
+def test_months_without_events_are_gaps():
+    funded = pd.DataFrame({
+        "Challenge Number": [1, 2],
+        "Start Phase Date": ["2020.01.01", "2020.04.01"],
+        "End Phase Date": ["2020.01.05", "2020.04.09"],
+        "Phase": [1, 1],
+        "Outcome": ["Failed", "Failed"],
+        "Reason": ["", ""],
+        "Duration": [4, 8],
+        "Start Balance": [10000.0, 10000.0],
+        "Ending Balance": [9500.0, 9500.0],
+    })
+
+    rolling = rolling_metrics(MetricsCalculator({"funded": funded}, cache=None), windows=[1, None])
+
+    assert rolling.index.astype(str).tolist() == ["2020-01", "2020-02", "2020-03", "2020-04"]
+    assert rolling["f_challenge_winrate_1m"].isna().tolist() == [False, True, True, False]
+    assert rolling["f_challenge_winrate_expanding"].tolist() == [0, 0, 0, 0]
+    assert rolling_metrics(MetricsCalculator({"funded": funded.iloc[:0]}, cache=None)).empty
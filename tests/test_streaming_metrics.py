@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from pathlib import Path
+from propfirm_trading_dashboard.csv_parser import load_csv_file
+from propfirm_trading_dashboard.metrics import MetricsCalculator, streak_stats
+from propfirm_trading_dashboard.streaming_metrics import StreakAccumulator, StreamingMetricsCalculator
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+PHASES = ["phase1", "phase2", "phase3", "challenge", "funded"]
+
+def test_streak_accumulator_carries_runs_across_chunks():
+    values = np.array(["Passed", "Passed", "Failed", "Passed", "Passed", "Passed", "Failed", "Failed"], dtype=object)
+    accumulator = StreakAccumulator(["Passed", "Failed"])
+
+    for chunk in np.array_split(values, [1, 3, 4, 7]):
+        accumulator.update(chunk)
+
+    expected = streak_stats(values, ["Passed", "Failed"])
+    assert accumulator.stats().to_dict() == expected.to_dict()
+
+@pytest.mark.parametrize("chunksize", [7, 100, 100_000])
+@pytest.mark.parametrize("typed", [False, True])
+def test_streaming_matches_in_memory(chunksize, typed):
+    folder = DATA_DIR / "HourBreakout_USDJPY_"
+    paths = {phase: str(folder / f"{phase}.csv") for phase in PHASES}
+
+    expected = MetricsCalculator({phase: load_csv_file(path) for phase, path in paths.items()}).calculate_metrics()
+    streamed = StreamingMetricsCalculator(paths, chunksize=chunksize, typed=typed).calculate_metrics()
+
+    assert streamed == expected
+
+def test_streaming_missing_phase_file(tmp_path):
+    metrics = StreamingMetricsCalculator({phase: str(tmp_path / f"{phase}.csv") for phase in PHASES}).calculate_metrics()
+
+    assert metrics["phase1"]["p1_number_challenges"] == 0
+    assert metrics["funded"]["f_number_challenges"] == 0
+
+@pytest.mark.parametrize("chunksize", [1, 3, 100])
+def test_streamed_payout_averages_add_up_like_in_memory(tmp_path, chunksize):
+    # challenge order sums to an average of 495.92499999999995, the reversed file order to 495.92500000000007
+    header = ["Challenge Number", "Start Phase Date", "End Phase Date", "Phase", "Outcome", "Reason", "Duration", "Start Balance", "Ending Balance", "Max Drawdown", "Profit Target", "Daily Drawdown"]
+    lines = ["\t".join(header)]
+    for challenge, profit in reversed(list(enumerate(["335.11", "715.03", "798.21", "135.35"], start=1))):
+        lines.append(f"{challenge}\t2013.01.01\t2013.01.15\t1\tPassed\tProfit Target\t14\t10000.00\t10800.00\t9000.00\t10800.00\t0.00")
+        lines.append(f"{challenge}\t2013.01.15\t2013.01.21\t2\tPassed\tProfit Target\t6\t10800.00\t11300.00\t9800.00\t11300.00\t0.00")
+        lines.append(f"{challenge}\t2013.01.21\t2013.02.04\t3\tPayout\tPayout\t14\t0.00\t{profit}\t9000.00\t10200.00\t0.00")
+    path = tmp_path / "funded.csv"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-16")
+
+    expected = MetricsCalculator({"funded": load_csv_file(str(path))}).calculate_metrics(["funded"])
+    streamed = StreamingMetricsCalculator({"funded": str(path)}, chunksize=chunksize).calculate_metrics(["funded"])
+
+    assert expected["funded"]["f_average_profit_payout"] == 495.92
+    assert streamed == expected
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pathlib import Path
+from propfirm_trading_dashboard import metrics, phase_frames, simulation_run
+from propfirm_trading_dashboard.csv_parser import load_csv_file
+from propfirm_trading_dashboard.metrics import MetricsCalculator
+from propfirm_trading_dashboard.simulation_run import build_monthly_pnl, build_runs_table, pivot_monthly_pnl
+from propfirm_trading_dashboard.sweep import EconomicsSweep, capped_segment_sums
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+PHASES = ["phase1", "phase2", "phase3", "challenge", "funded"]
+
+def load_folder(folder="HourBreakout_GBPUSD_"):
+    return {phase: load_csv_file(DATA_DIR / folder / f"{phase}.csv") for phase in PHASES}
+
+def expected_scenario(dfs, cost, split, cap, monkeypatch):
+    # the whole pipeline with the economics patched in and the payouts capped in the data
+    monkeypatch.setattr(phase_frames, "FAILED_CHALLENGE_COST", cost)
+    monkeypatch.setattr(metrics, "FAILED_CHALLENGE_COST", cost)
+    monkeypatch.setattr(simulation_run, "PROFIT_SPLIT", split)
+
+    capped = {}
+    for phase, df in dfs.items():
+        payout = df["Outcome"] == "Payout"
+        capped[phase] = df.assign(**{"Ending Balance": df["Ending Balance"].where(~payout, df["Start Balance"] + (df["Ending Balance"] - df["Start Balance"]).clip(upper=cap))})
+
+    calculated = MetricsCalculator(capped, cache=None).calculate_metrics(["phase3", "funded"])
+    normalized = phase_frames.normalize_phase_frames(capped)
+    return {**calculated["phase3"], **calculated["funded"]}, build_monthly_pnl(build_runs_table(normalized)["funded"])
+
+def test_capped_segment_sums_match_brute_force():
+    rng = np.random.default_rng(0)
+    amounts = rng.uniform(-20, 900, 300).round(2)
+    segments = rng.integers(0, 12, 300)
+    caps = np.array([np.inf, 1000, 450, amounts[0], 3, 0.01])
+
+    expected = [[np.minimum(amounts[segments == segment], cap).sum() for segment in range(13)] for cap in caps]
+    np.testing.assert_allclose(capped_segment_sums(amounts, segments, 13, caps), expected)
+    assert capped_segment_sums([], [], 2, caps).shape == (6, 2)
+
+def test_default_scenario_matches_metrics():
+    dfs = load_folder()
+    result = EconomicsSweep(dfs).evaluate()
+    calculated = MetricsCalculator(dfs, cache=None).calculate_metrics(["phase3", "funded"])
+
+    row = result["metrics"].iloc[0]
+    for name, value in {**calculated["phase3"], **calculated["funded"]}.items():
+        if name in row:
+            assert row[name] == pytest.approx(value), name
+
+    table = build_monthly_pnl(build_runs_table(phase_frames.normalize_phase_frames(dfs))["funded"])
+    pd.testing.assert_frame_equal(pivot_monthly_pnl(result["monthly"][["Year", "Month", "PnL"]]), table, check_dtype=False)
+
+@pytest.mark.parametrize("cost, split, cap", [(100, 0.8, 300), (45, 0.5, np.inf), (80, 0.67, 150)])
+def test_scenarios_match_patched_pipeline(cost, split, cap, monkeypatch):
+    dfs = load_folder("MiddleRange_USDJPY_")
+    result = EconomicsSweep(dfs).evaluate(costs=[60, cost], splits=[split, 0.9], payout_caps=[cap, None])
+
+    metrics_row = result["metrics"].query("cost == @cost and split == @split and payout_cap == @cap").iloc[0]
+    monthly = result["monthly"].query("cost == @cost and split == @split and payout_cap == @cap")
+    expected_metrics, expected_table = expected_scenario(dfs, cost, split, cap, monkeypatch)
+
+    for name, value in expected_metrics.items():
+        if name in metrics_row:
+            assert metrics_row[name] == pytest.approx(value), name
+    pd.testing.assert_frame_equal(pivot_monthly_pnl(monthly[["Year", "Month", "PnL"]]), expected_table, check_dtype=False)
+    assert metrics_row["m_total_net_pnl"] == pytest.approx(expected_table["Yearly Total"].sum())
+
+def test_grid_shape():
+    result = EconomicsSweep(load_folder()).evaluate(costs=[60, 80, 100], splits=[0.67, 0.8], payout_caps=[None, 500, 1000, 2000])
+    metrics_frame, monthly = result["metrics"], result["monthly"]
+
+    assert len(metrics_frame) == 24
+    assert metrics_frame[["cost", "split", "payout_cap"]].drop_duplicates().shape[0] == 24
+    assert len(monthly) == 24 * monthly.groupby(["Year", "Month"]).ngroups
+    # a higher fee never helps
+    by_cost = metrics_frame.groupby(["split", "payout_cap"])["f_profitability_ratio"].apply(lambda values: values.is_monotonic_decreasing)
+    assert by_cost.all()
+
+def test_invalid_scenarios():
+    with pytest.raises(ValueError, match="must be positive"):
+        EconomicsSweep(load_folder()).evaluate(costs=[0])
@@ -0,0 +1,47 @@
+import numpy as np
+from benchmarks.bench_pipeline import run_pipeline
+from benchmarks.synthetic_data import PHASES, write_synthetic_dataset
+from propfirm_trading_dashboard.csv_parser import load_csv_file, validate_frame
+from propfirm_trading_dashboard.multi_strategy_loader import discover_strategy_groups
+
+def test_synthetic_dataset_layout(tmp_path):
+    folders = write_synthetic_dataset(tmp_path, strategies=2, runs=2, years=2)
+
+    assert folders == ["Synthetic0_EURUSD_1", "Synthetic0_EURUSD_2", "Synthetic1_GBPUSD_1", "Synthetic1_GBPUSD_2"]
+    assert sorted(discover_strategy_groups(tmp_path)) == ["Synthetic0", "Synthetic1"]
+    assert (tmp_path / folders[0] / "funded.csv").read_bytes()[:2] == b"\xff\xfe"
+
+    for folder in folders:
+        for phase in PHASES:
+            df = load_csv_file(tmp_path / folder / f"{phase}.csv", typed=True)
+            validate_frame(df)
+            assert df["End Phase Date"].max().year <= 2015
+            assert (df["Start Phase Date"].iloc[1:].to_numpy() == df["End Phase Date"].iloc[:-1].to_numpy()).all()
+
+def test_synthetic_challenges_follow_the_phases(tmp_path):
+    write_synthetic_dataset(tmp_path, strategies=1, years=5, seed=3)
+    df = load_csv_file(tmp_path / "Synthetic0_EURUSD_1" / "funded.csv")
+
+    for _, challenge in df.groupby("Challenge Number"):
+        phases = challenge["Phase"].tolist()
+        outcomes = challenge["Outcome"].tolist()
+        assert phases[:2] == [1, 2][:len(phases[:2])]
+        assert all(phase == 3 for phase in phases[2:])
+        # only the last phase of a challenge can fail, and only passed phases lead on
+        assert "Failed" not in outcomes[:-1]
+        assert set(outcomes[2:-1]) <= {"Payout"}
+
+    assert set(df.loc[df["Phase"] == 3, "Outcome"]) == {"Payout", "Failed"}
+    assert np.allclose(df["Start Balance"].iloc[1:].to_numpy(), df["Ending Balance"].iloc[:-1].to_numpy())
+
+def test_pipeline_benchmark_times_every_stage(tmp_path):
+    write_synthetic_dataset(tmp_path / "data", strategies=2, years=1)
+
+    timings = run_pipeline(tmp_path / "data", tmp_path)
+
+    assert list(timings) == [
+        "load", "validate", "merge", "normalize",
+        "metrics.phase1", "metrics.phase2", "metrics.phase3", "metrics.challenge", "metrics.funded",
+        "build_runs_table", "build_monthly_pnl", "render_report", "total",
+    ]
+    assert (tmp_path / "benchmark.html").exists()